@@ -11,15 +11,35 @@
 """
 Module for importing spectra from ground truth measurements
 """
+import importlib
 import os
-from . import sig
-from . import ascii_format
-from . import usgs
-from . import dart
-from . import envi
-from . import ocean_optics
-
-def extract_spectra_from_file(inputfile, input_format='', **kwargs):
+
+# Modules are only imported when first used, so importing PySpectra is fast
+# and workers which only need one format don't load the others.
+SUBMODULES = ("ascii_format", "batch", "cache", "dart", "envi", "fetch",
+              "ocean_optics", "sensor_operator", "sig", "spectra_collection",
+              "spectra_reader", "srf", "usgs")
+
+# Functions available from PySpectra, and the module they are defined in.
+LAZY_FUNCTIONS = {"extract_spectra_from_files": "batch",
+                  "iter_spectra": "batch"}
+
+
+def __getattr__(name):
+    if name in SUBMODULES:
+        return importlib.import_module("." + name, __name__)
+    elif name in LAZY_FUNCTIONS:
+        module = importlib.import_module("." + LAZY_FUNCTIONS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__,
+                                                                   name))
+
+
+def __dir__():
+    return sorted(list(globals()) + list(SUBMODULES) + list(LAZY_FUNCTIONS))
+
+
+def extract_spectra_from_file(inputfile, input_format='', cache=None, **kwargs):
     """
     Extract spectra from file. Designed to handle a range of input
     formats.
@@ -28,38 +48,55 @@ def extract_spectra_from_file(inputfile, input_format='', **kwargs):
 
     * inputfile - Path to input spectra file
     * input_format - Input format of file (optional)
+    * cache - cache to store extracted spectra in (optional), e.g.,
+              cache.DiskCache. If the file hasn't changed since it was added
+              to the cache, spectra are returned from the cache.
 
     Returns:
 
     * Spectra object containing wavelengths and values.
 
     """
+    if cache is not None:
+        extracted_spectra = cache.get(inputfile, input_format, kwargs)
+        if extracted_spectra is None:
+            extracted_spectra = extract_spectra_from_file(inputfile, input_format,
+                                                          **kwargs)
+            cache.put(inputfile, input_format, kwargs, extracted_spectra)
+        return extracted_spectra
 
     # Extract spectra using format specific function.
     # Try to guess based on extension format isn't provided
     if input_format.lower() == 'sig' or (os.path.splitext(inputfile)[-1].lower() == '.sig'):
+        from . import sig
         sig_obj = sig.SigFormat()
-        extracted_spectra = sig_obj.get_spectra(inputfile)
+        extracted_spectra = sig_obj.get_spectra(inputfile, **kwargs)
     # CSV format, with a single header row.
     elif input_format.lower() == 'envi' or (os.path.splitext(inputfile)[-1].lower() == '.sli'):
+        from . import envi
         envi_obj = envi.ENVIFormat()
         extracted_spectra = envi_obj.get_spectra(inputfile, **kwargs)
     elif input_format.lower() == 'usgs':
+        from . import usgs
         usgs_obj = usgs.USGSFormat()
-        extracted_spectra = usgs_obj.get_spectra(inputfile)
+        extracted_spectra = usgs_obj.get_spectra(inputfile, **kwargs)
     elif input_format.lower() == 'dart':
+        from . import dart
         dart_obj = dart.DARTFormat()
         extracted_spectra = dart_obj.get_spectra(inputfile)
     # Ocean optics STS spectrometer format
     elif input_format.lower() == 'oceanoptics':
+        from . import ocean_optics
         ocean_optics_obj = ocean_optics.OceanOpticsSTSFormat()
         extracted_spectra = ocean_optics_obj.get_spectra(inputfile, **kwargs)
     # Text format, need to specify delimiter and number of header lines manually.
     elif input_format.lower() == 'txt' or (os.path.splitext(inputfile)[-1].lower() == '.txt'):
+        from . import ascii_format
         ascii_obj = ascii_format.ASCIIFormat()
         extracted_spectra = ascii_obj.get_spectra(inputfile, **kwargs)
     # CSV, assume delimiter is ',' and there is a single header line.
     elif input_format.lower() == 'csv' or (os.path.splitext(inputfile)[-1].lower() == '.csv'):
+        from . import ascii_format
         ascii_obj = ascii_format.ASCIIFormat()
         extracted_spectra = ascii_obj.get_spectra(inputfile, delimiter=',',
                                                   skip_header=1, **kwargs)
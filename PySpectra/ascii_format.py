@@ -11,8 +11,52 @@
 
 import numpy
 
+from . import spectra_collection
 from . import spectra_reader
 
+# Keyword arguments for numpy.genfromtxt which can be passed to the faster
+# numpy.loadtxt, and the name loadtxt uses.
+LOADTXT_KWARGS = {"skip_header": "skiprows",
+                  "skiprows": "skiprows",
+                  "delimiter": "delimiter",
+                  "comments": "comments",
+                  "usecols": "usecols",
+                  "max_rows": "max_rows",
+                  "dtype": "dtype",
+                  "encoding": "encoding"}
+
+
+def read_text_data(filename, **kwargs):
+    """
+    Read a table of numbers from a text file into a 2D numpy array.
+
+    Uses numpy.loadtxt, which is much faster than numpy.genfromtxt, and only
+    falls back to numpy.genfromtxt if it fails (e.g., missing values) or
+    keyword arguments are used which only genfromtxt supports (e.g.,
+    missing_values, skip_footer).
+
+    Requires:
+
+    * filename - text file
+    * kwargs - keyword arguments for numpy.genfromtxt (e.g., delimiter,
+               skip_header).
+
+    Returns:
+
+    * 2D numpy array (rows x columns)
+
+    """
+    if all(name in LOADTXT_KWARGS for name in kwargs):
+        loadtxt_kwargs = dict((LOADTXT_KWARGS[name], value)
+                              for name, value in kwargs.items())
+        try:
+            return numpy.loadtxt(filename, ndmin=2, **loadtxt_kwargs)
+        except ValueError:
+            # Missing or non numeric values, genfromtxt will set to NaN.
+            pass
+
+    return numpy.genfromtxt(filename, **kwargs)
+
 
 class ASCIIFormat(spectra_reader.SpectraReader):
     """
@@ -33,6 +77,8 @@ class ASCIIFormat(spectra_reader.SpectraReader):
         Requires:
 
         * filename - text file
+        * kwargs - keyword arguments for numpy.genfromtxt (e.g., delimiter,
+                   skip_header). Parsed using 'read_text_data'.
 
         Returns:
 
@@ -40,22 +86,112 @@ class ASCIIFormat(spectra_reader.SpectraReader):
 
         """
 
-        data = numpy.genfromtxt(filename, **kwargs)
+        spectra = spectra_reader.Spectra()
+
+        data = read_text_data(filename, **kwargs)
         wavelengths = data[:, wavelengths_col]
         reflectance = data[:, reflectance_col]
 
         # Scale reflectance values between 0 - 1.
         reflectance = reflectance / reflectance_scale
 
-        self.spectra.file_name = filename
-        self.spectra.wavelengths = wavelengths
-        self.spectra.values = reflectance
-        self.spectra.pixel = None
-        self.spectra.line = None
-        self.spectra.latitude = None
-        self.spectra.longitude = None
-        self.spectra.wavelength_units = wavelength_units
-        self.spectra.value_units = "reflectance"
-        self.spectra.value_scaling = 1
-
-        return self.spectra
+        spectra.file_name = filename
+        spectra.wavelengths = wavelengths
+        spectra.values = reflectance
+        spectra.pixel = None
+        spectra.line = None
+        spectra.latitude = None
+        spectra.longitude = None
+        spectra.wavelength_units = wavelength_units
+        spectra.value_units = "reflectance"
+        spectra.value_scaling = 1
+
+        return spectra
+
+    def read_column_names(self, filename, skip_header=0, delimiter=None):
+        """
+        Get column names from the last header line of an ASCII file.
+
+        Returns list of names, or None if there is no header.
+        """
+        if skip_header < 1:
+            return None
+
+        with open(filename, "r") as f:
+            for _ in range(skip_header):
+                header_line = f.readline()
+
+        return [name.strip().strip('"').strip("'")
+                for name in header_line.strip().split(delimiter)]
+
+    def get_all_spectra(self, filename,
+                        wavelengths_col=0,
+                        columns=None,
+                        wavelength_units="nm",
+                        reflectance_scale=1,
+                        **kwargs):
+        """
+        Extract many spectra from an ASCII file with a column of wavelengths
+        and a column for each spectrum (e.g., wide CSV). The file is only
+        parsed once.
+
+        If there is a header (skip_header is set) the last line of it is
+        used for the names of the spectra.
+
+        Requires:
+
+        * filename - text file
+        * wavelengths_col - column containing wavelengths
+        * columns - list of column numbers or names to extract (optional).
+                    If not provided all columns except wavelengths are used.
+        * kwargs - keyword arguments for numpy.genfromtxt (e.g., delimiter,
+                   skip_header). Parsed using 'read_text_data'.
+
+        Returns:
+
+        * SpectraCollection with a row for each column.
+
+        """
+        column_names = self.read_column_names(filename,
+                                              kwargs.get("skip_header", 0),
+                                              kwargs.get("delimiter"))
+        # If columns have already been selected names won't match.
+        if "usecols" in kwargs:
+            column_names = None
+
+        if columns is not None:
+            column_numbers = []
+            for column in columns:
+                if isinstance(column, str):
+                    if column_names is None or column not in column_names:
+                        raise KeyError("Column '{}' not found in "
+                                       "{}".format(column, filename))
+                    column = column_names.index(column)
+                column_numbers.append(column)
+            if "usecols" not in kwargs:
+                # Only parse the columns needed
+                kwargs["usecols"] = [wavelengths_col] + column_numbers
+                wavelengths_col = 0
+                data = read_text_data(filename, **kwargs)
+                data_columns = list(range(1, len(column_numbers) + 1))
+            else:
+                data = read_text_data(filename, **kwargs)
+                data_columns = column_numbers
+        else:
+            data = read_text_data(filename, **kwargs)
+            wavelengths_col = wavelengths_col % data.shape[1]
+            column_numbers = [i for i in range(data.shape[1])
+                              if i != wavelengths_col]
+            data_columns = column_numbers
+
+        names = [None] * len(column_numbers)
+        if column_names is not None and len(column_names) >= data.shape[1]:
+            names = [column_names[i] for i in column_numbers]
+
+        # Scale reflectance values between 0 - 1.
+        values = data[:, data_columns].T / reflectance_scale
+
+        return spectra_collection.SpectraCollection(
+            data[:, wavelengths_col], values,
+            wavelength_units=wavelength_units, value_units="reflectance",
+            file_name=[filename] * len(column_numbers), name=names)
@@ -0,0 +1,216 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file has been created by Plymouth Marine Laboratory and
+# is licensed under the MIT Licence. A copy of this
+# licence is available to download with this file.
+#
+# Created: 2026-10-18
+
+"""
+Functions for extracting spectra from many files at once.
+
+Files are parsed using the same format dispatch as
+'extract_spectra_from_file', on a pool of processes or threads.
+"""
+import collections
+import concurrent.futures
+import glob
+import os
+
+# Extensions recognised by 'extract_spectra_from_file' when no format is given.
+KNOWN_EXTENSIONS = (".sig", ".sli", ".txt", ".csv")
+
+# Extensions of files which accompany data files and should never be read
+# as spectra themselves when expanding a directory.
+SIDECAR_EXTENSIONS = (".hdr",)
+
+
+def expand_paths(paths, input_format=''):
+    """
+    Expand a list of paths, a glob pattern or a directory into a list of
+    files to read.
+
+    Requires:
+
+    * paths - list of paths, glob pattern (e.g., '/data/*.sig') or directory.
+    * input_format - input format of files (optional). If not provided only
+                     files with an extension recognised by
+                     'extract_spectra_from_file' are taken from a directory.
+
+    Returns:
+
+    * List of paths, sorted if found using a glob pattern or directory.
+
+    """
+    if not isinstance(paths, str):
+        return list(paths)
+
+    if os.path.isdir(paths):
+        file_list = []
+        for filename in sorted(os.listdir(paths)):
+            full_path = os.path.join(paths, filename)
+            extension = os.path.splitext(filename)[-1].lower()
+            if not os.path.isfile(full_path) or extension in SIDECAR_EXTENSIONS:
+                continue
+            if input_format != '' or extension in KNOWN_EXTENSIONS:
+                file_list.append(full_path)
+        return file_list
+    elif glob.has_magic(paths):
+        return sorted(glob.glob(paths))
+    else:
+        return [paths]
+
+
+def _extract_one(inputfile, input_format, kwargs, raise_errors=False):
+    """
+    Extract spectra from a single file. If 'raise_errors' is False any
+    exception raised is returned in place of the spectra.
+
+    Defined at module level so it can be sent to a process pool.
+    """
+    from . import extract_spectra_from_file
+
+    try:
+        return extract_spectra_from_file(inputfile, input_format, **kwargs)
+    except Exception as err:
+        if raise_errors:
+            raise
+        return err
+
+
+def _get_executor(pool, n_workers):
+    """
+    Set up a process or thread pool with 'n_workers' workers.
+    """
+    if pool == "process":
+        return concurrent.futures.ProcessPoolExecutor(max_workers=n_workers)
+    elif pool == "thread":
+        return concurrent.futures.ThreadPoolExecutor(max_workers=n_workers)
+    else:
+        raise ValueError("Pool type '{}' not recognised, "
+                         "must be 'process' or 'thread'".format(pool))
+
+
+def extract_spectra_from_files(paths, input_format='', n_workers=None,
+                               pool="process", raise_errors=False,
+                               chunksize=None, **kwargs):
+    """
+    Extract spectra from many files in parallel.
+
+    Each file is read using 'extract_spectra_from_file', any additional
+    keyword arguments are passed to it.
+
+    Requires:
+
+    * paths - list of paths, glob pattern (e.g., '/data/*.sig') or directory.
+    * input_format - Input format of files (optional)
+    * n_workers - number of workers to use. Defaults to the number of CPUs.
+                  If set to 1 files are read in the current process.
+    * pool - type of pool to use, 'process' (default) or 'thread'.
+    * raise_errors - if True the first error raised reading a file is raised.
+                     If False (default) the exception is returned in place of
+                     the Spectra object for that file and the others are
+                     still read.
+    * chunksize - number of files to send to each process at once.
+
+    Returns:
+
+    * List of Spectra objects (or exceptions) in the same order as the input
+      paths.
+
+    """
+    file_list = expand_paths(paths, input_format)
+
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    n_workers = max(1, min(n_workers, len(file_list)))
+
+    if n_workers == 1:
+        return [_extract_one(inputfile, input_format, kwargs, raise_errors)
+                for inputfile in file_list]
+
+    # Sending files to processes one at a time is dominated by the
+    # communication overhead so split into a few chunks per worker.
+    if chunksize is None:
+        chunksize = 1 if pool == "thread" else max(1, len(file_list) // (n_workers * 4))
+
+    n_files = len(file_list)
+    with _get_executor(pool, n_workers) as executor:
+        results = executor.map(_extract_one, file_list,
+                               [input_format] * n_files,
+                               [kwargs] * n_files,
+                               [raise_errors] * n_files,
+                               chunksize=chunksize)
+        return list(results)
+
+
+def iter_spectra(paths, input_format='', n_workers=0, read_ahead=None,
+                 pool="thread", raise_errors=False, **kwargs):
+    """
+    Generator which extracts spectra from many files, one at a time.
+
+    Only a fixed number of files are read before they are requested so
+    memory use doesn't depend on the number of files. Any additional keyword
+    arguments are passed to 'extract_spectra_from_file'.
+
+    Requires:
+
+    * paths - list of paths, glob pattern (e.g., '/data/*.sig') or directory.
+    * input_format - Input format of files (optional)
+    * n_workers - number of workers to read files ahead on. If 0 (default)
+                  each file is read when it is requested.
+    * read_ahead - maximum number of files read but not yet yielded.
+                   Defaults to twice the number of workers.
+    * pool - type of pool to use, 'thread' (default) or 'process'.
+    * raise_errors - if True errors reading a file are raised. If False
+                     (default) the exception is yielded in place of the
+                     Spectra object for that file.
+
+    Returns:
+
+    * Generator yielding Spectra objects (or exceptions) in the same order
+      as the input paths.
+
+    Example:
+
+    for s in iter_spectra("/data/campaign/*.sig", n_workers=4):
+        print(s.values.max())
+
+    """
+    file_list = expand_paths(paths, input_format)
+
+    if n_workers == 0:
+        for inputfile in file_list:
+            yield _extract_one(inputfile, input_format, kwargs, raise_errors)
+        return
+
+    if read_ahead is None:
+        read_ahead = 2 * n_workers
+    read_ahead = max(1, read_ahead)
+
+    pending = collections.deque()
+    file_iter = iter(file_list)
+
+    with _get_executor(pool, n_workers) as executor:
+
+        def submit_next():
+            inputfile = next(file_iter, None)
+            if inputfile is not None:
+                pending.append(executor.submit(_extract_one, inputfile,
+                                               input_format, kwargs,
+                                               raise_errors))
+
+        try:
+            # Keep up to 'read_ahead' files queued, submitting a new one
+            # each time a result is yielded.
+            for _ in range(read_ahead):
+                submit_next()
+            while pending:
+                result = pending.popleft().result()
+                submit_next()
+                yield result
+        finally:
+            # If the generator is closed early don't read remaining files.
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,379 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file has been created by Plymouth Marine Laboratory and
+# is licensed under the MIT Licence. A copy of this
+# licence is available to download with this file.
+#
+# Created: 2026-10-18
+
+"""
+Caches for spectra extracted from files, so files which haven't changed
+don't need to be parsed again.
+
+To use pass a cache to 'extract_spectra_from_file', e.g.,
+
+cache = DiskCache("/tmp/pyspectra_cache")
+s = extract_spectra_from_file("spectra.sig", cache=cache)
+
+or to keep spectra in memory
+
+cache = MemoryCache()
+
+"""
+import collections
+import copy
+import datetime
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+import numpy
+
+from . import spectra_reader
+
+# Attributes of Spectra objects not stored with other metadata
+ARRAY_ATTRIBUTES = ("wavelengths", "values", "additional_metadata", "time")
+
+
+def get_file_fingerprint(inputfile):
+    """
+    Get a tuple identifying the current version of a file, from its path,
+    size and modification time. Any ENVI header file alongside the file is
+    also included.
+
+    Returns None if 'inputfile' is not a local file (e.g., a URL).
+    """
+    if not os.path.isfile(inputfile):
+        return None
+
+    fingerprint = []
+    for path in (inputfile,
+                 os.path.splitext(inputfile)[0] + ".hdr",
+                 inputfile + ".hdr"):
+        if path == inputfile or os.path.isfile(path):
+            file_stat = os.stat(path)
+            fingerprint.append((os.path.abspath(path), file_stat.st_size,
+                                file_stat.st_mtime_ns))
+    return tuple(fingerprint)
+
+
+def get_cache_key(inputfile, input_format='', kwargs=None):
+    """
+    Get a key for the spectra extracted from a file with a given format
+    and reader keyword arguments.
+
+    Returns None if 'inputfile' is not a local file.
+    """
+    fingerprint = get_file_fingerprint(inputfile)
+    if fingerprint is None:
+        return None
+    if kwargs is None:
+        kwargs = {}
+    return repr((fingerprint, input_format.lower(), sorted(kwargs.items())))
+
+
+def _json_default(value):
+    """
+    Convert numpy types so they can be written to JSON.
+    """
+    if isinstance(value, numpy.generic):
+        return value.item()
+    raise TypeError("{!r} can't be written to JSON".format(value))
+
+
+class DiskCache(object):
+    """
+    Persistent cache of spectra stored as compressed .npz files in a
+    directory. Least recently used files are removed when the total size
+    is larger than 'max_size'.
+
+    * directory - directory to store cache in, created if it doesn't exist.
+    * max_size - maximum size of cache in bytes (default 1 GB).
+    * hits - number of times spectra were found in the cache
+    * misses - number of times spectra were not found in the cache
+
+    """
+    def __init__(self, directory, max_size=1024**3):
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Allow cache to be sent to other processes (e.g., when using
+        # 'extract_spectra_from_files').
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _get_cache_file(self, key):
+        return os.path.join(self.directory,
+                            hashlib.sha1(key.encode("utf-8")).hexdigest() + ".npz")
+
+    def get(self, inputfile, input_format='', kwargs=None):
+        """
+        Get spectra for a file from the cache.
+
+        Returns None if spectra are not in the cache or the file has changed.
+        """
+        key = get_cache_key(inputfile, input_format, kwargs)
+        if key is None:
+            return None
+
+        cache_file = self._get_cache_file(key)
+        try:
+            with numpy.load(cache_file, allow_pickle=False) as cached:
+                metadata = json.loads(str(cached["metadata"]))
+                # Check key in case of hash collision
+                if metadata.pop("key") != key:
+                    raise KeyError(key)
+                spectra = spectra_reader.Spectra(cached["wavelengths"],
+                                                 cached["values"])
+                for name in cached.files:
+                    if name.startswith("additional_metadata/"):
+                        spectra.additional_metadata[name.split("/", 1)[1]] = cached[name]
+            # Update modification time so file is counted as recently used.
+            os.utime(cache_file)
+        except (IOError, OSError, KeyError, ValueError):
+            self.misses += 1
+            return None
+
+        time = metadata.pop("time")
+        if time is not None:
+            spectra.time = datetime.datetime.fromisoformat(time)
+        spectra.additional_metadata.update(metadata.pop("additional_metadata"))
+        for name, value in metadata.items():
+            setattr(spectra, name, value)
+
+        self.hits += 1
+        return spectra
+
+    def put(self, inputfile, input_format, kwargs, spectra):
+        """
+        Add spectra extracted from a file to the cache. Spectra with
+        additional metadata which can't be stored are skipped.
+        """
+        key = get_cache_key(inputfile, input_format, kwargs)
+        if key is None:
+            return
+
+        metadata = {"key": key, "additional_metadata": {}}
+        arrays = {"wavelengths": numpy.asarray(spectra.wavelengths),
+                  "values": numpy.asarray(spectra.values)}
+
+        for name, value in vars(spectra).items():
+            if name not in ARRAY_ATTRIBUTES:
+                metadata[name] = value
+        if spectra.time is not None:
+            metadata["time"] = spectra.time.isoformat()
+        else:
+            metadata["time"] = None
+        for name, value in spectra.additional_metadata.items():
+            if isinstance(value, numpy.ndarray):
+                arrays["additional_metadata/" + name] = value
+            else:
+                metadata["additional_metadata"][name] = value
+
+        try:
+            metadata_json = json.dumps(metadata, default=_json_default)
+        except TypeError:
+            return
+
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+
+        # Write to a temporary file and then move so other processes
+        # never see partially written files.
+        cache_file = self._get_cache_file(key)
+        temp_handle, temp_file = tempfile.mkstemp(dir=self.directory,
+                                                  suffix=".tmp")
+        with os.fdopen(temp_handle, "wb") as f:
+            numpy.savez_compressed(f, metadata=numpy.array(metadata_json),
+                                   **arrays)
+        os.replace(temp_file, cache_file)
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._get_total_size()
+            else:
+                self._size += os.path.getsize(cache_file)
+            if self._size > self.max_size:
+                self._evict()
+
+    def _list_files(self):
+        """
+        Get list of (modification time, size, path) for files in the cache.
+        """
+        cache_files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".npz"):
+                try:
+                    file_stat = entry.stat()
+                except OSError:
+                    continue
+                cache_files.append((file_stat.st_mtime, file_stat.st_size,
+                                    entry.path))
+        return cache_files
+
+    def _get_total_size(self):
+        return sum(size for _, size, _ in self._list_files())
+
+    def _evict(self):
+        """
+        Remove least recently used files until the cache is smaller than
+        'max_size'.
+        """
+        cache_files = sorted(self._list_files())
+        self._size = sum(size for _, size, _ in cache_files)
+        for _, size, path in cache_files:
+            if self._size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self._size -= size
+
+    def clear(self):
+        """
+        Remove all spectra from the cache.
+        """
+        with self._lock:
+            if os.path.isdir(self.directory):
+                for _, _, path in self._list_files():
+                    os.remove(path)
+            self._size = 0
+
+
+def _read_only(value):
+    """
+    Get read only copy of a numpy array.
+    """
+    value = numpy.array(value)
+    value.flags.writeable = False
+    return value
+
+
+class MemoryCache(object):
+    """
+    In memory cache of spectra, keeping the most recently used spectra up
+    to a total size of 'max_size' bytes. Spectra are removed when the
+    file they were extracted from changes.
+
+    Spectra returned from the cache are new objects but their arrays are
+    shared and read only, so can't be modified by accident. To change values
+    make a copy first (e.g., s.values = s.values.copy()).
+
+    Can be shared between threads. When sent to another process (e.g.,
+    'extract_spectra_from_files' with a process pool) each process gets
+    its own empty cache, as memory can't be shared between processes.
+
+    * max_size - maximum size of arrays to keep in bytes (default 256 MB).
+    * hits - number of times spectra were found in the cache
+    * misses - number of times spectra were not found in the cache
+
+    """
+    def __init__(self, max_size=256 * 1024**2):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.size = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Only the settings are sent to other processes, not the cached
+        # spectra (or the lock, which can't be pickled).
+        return {"max_size": self.max_size}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get_key(self, inputfile, input_format, kwargs):
+        if kwargs is None:
+            kwargs = {}
+        return repr((os.path.abspath(inputfile), input_format.lower(),
+                     sorted(kwargs.items())))
+
+    def get(self, inputfile, input_format='', kwargs=None):
+        """
+        Get spectra for a file from the cache.
+
+        Returns None if spectra are not in the cache or the file has changed.
+        """
+        fingerprint = get_file_fingerprint(inputfile)
+        if fingerprint is None:
+            return None
+        key = self._get_key(inputfile, input_format, kwargs)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] != fingerprint:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            cached = entry[1]
+
+        spectra = copy.copy(cached)
+        spectra.additional_metadata = dict(cached.additional_metadata)
+        return spectra
+
+    def put(self, inputfile, input_format, kwargs, spectra):
+        """
+        Add spectra extracted from a file to the cache.
+        """
+        fingerprint = get_file_fingerprint(inputfile)
+        if fingerprint is None:
+            return
+        key = self._get_key(inputfile, input_format, kwargs)
+
+        # Store a copy with read only arrays so the spectra passed in can
+        # still be modified.
+        cached = copy.copy(spectra)
+        cached.wavelengths = _read_only(spectra.wavelengths)
+        cached.values = _read_only(spectra.values)
+        cached.additional_metadata = {}
+        nbytes = cached.wavelengths.nbytes + cached.values.nbytes
+        for name, value in spectra.additional_metadata.items():
+            if isinstance(value, numpy.ndarray):
+                value = _read_only(value)
+                nbytes += value.nbytes
+            cached.additional_metadata[name] = value
+
+        if nbytes > self.max_size:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (fingerprint, cached, nbytes)
+            self.size += nbytes
+            while self.size > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        self.size -= self._entries.pop(key)[2]
+
+    def clear(self):
+        """
+        Remove all spectra from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
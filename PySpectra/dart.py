@@ -7,32 +7,79 @@
 #
 # Author: Robin Wilson
 # Created: 2015-11-16
-import sys
-
 import numpy as np
-import pandas as pd
-
-# Python 2/3 imports
-try:
-    from StringIO import StringIO
-except ImportError:
-    if sys.version_info[0] >= 3:
-        from io import StringIO
-    else:
-        raise
 
 from . import spectra_reader
 
+# Columns of DART optical property files
+DART_COLUMNS = ("wavelength", "reflectance", "refractive_index", "A", "Alpha",
+                "wHapke", "AHapkeSpec", "AlphaHapkeSpec", "TDirect",
+                "TDiffuse")
+
 
 class DARTFormat(spectra_reader.SpectraReader):
     """
     Class to read spectra from DART format files
     """
 
+    def read_data_lines(self, dart_file):
+        """
+        Read lines of data from an open DART file, skipping comment blocks.
+
+        Comments start and end with a line containing '*'.
+
+        Returns list of lines.
+        """
+        data_lines = []
+        within_comment = False
+        for line in dart_file:
+            if "*" in line and within_comment:
+                within_comment = False
+                continue
+            elif "*" in line and not within_comment:
+                within_comment = True
+
+            if not within_comment and not line.isspace():
+                data_lines.append(line)
+
+        return data_lines
+
+    def parse_data(self, data_lines):
+        """
+        Parse lines of data from a DART file into a numpy array with a column
+        for each of DART_COLUMNS. Columns not in the file are set to NaN.
+
+        Data are parsed using 'spectra_reader.parse_text_data' when every row
+        has the same number of columns as the first. Otherwise (e.g., rows
+        with missing values) each line is parsed separately.
+        """
+        n_columns = len(DART_COLUMNS)
+        data = np.full((len(data_lines), n_columns), np.nan)
+        if len(data_lines) == 0:
+            return data
+
+        data_text = "".join(data_lines)
+        n_file_columns = min(len(data_lines[0].split()), n_columns)
+        values = spectra_reader.parse_text_data(data_text, n_file_columns)
+        if values is not None:
+            data[:, :n_file_columns] = values
+        else:
+            # Rows have different numbers of columns, parse each line so
+            # missing columns are left as NaN.
+            for i, line in enumerate(data_lines):
+                row = [float(value) for value in line.split()[:n_columns]]
+                data[i, :len(row)] = row
+
+        return data
+
     def get_spectra(self, filename):
         """
         Extract spectra from a DART format file
 
+        Reflectance is stored as values, the other columns (e.g., refractive
+        index, Hapke parameters, TDirect and TDiffuse) are stored as numpy
+        arrays in additional_metadata using the names in DART_COLUMNS.
+
         Requires:
 
         * filename - the filename to the DART format file to read
@@ -43,45 +90,26 @@ class DARTFormat(spectra_reader.SpectraReader):
 
         """
 
-        f = open(filename, 'r')
+        spectra = spectra_reader.Spectra()
 
-        s = StringIO()
+        with open(filename, 'r') as f:
+            data = self.parse_data(self.read_data_lines(f))
 
-        within_comment = False
-        while True:
-            try:
-                line = f.next()
-            except:
-                break
-            if "*" in line and within_comment:
-                within_comment = False
-                continue
-            elif "*" in line and not within_comment:
-                within_comment = True
+        wavelengths = data[:, 0]
+        reflectance = data[:, 1] / 100
 
-            if not within_comment and not line.isspace():
-                s.write(line)
-
-        s.seek(0)
-        df = pd.read_table(s, header=None, names=["wavelength", "reflectance",
-                                                  "refractive_index", "A", "Alpha",
-                                                  "wHapke", "AHapkeSpec",
-                                                  "AlphaHapkeSpec", "TDirect",
-                                                  "TDiffuse"])
-        df.reflectance = df.reflectance / 100
-
-        wavelengths = np.array(df.wavelength)
-        reflectance = np.array(df.reflectance)
-
-        self.spectra.file_name = filename
-        self.spectra.wavelengths = wavelengths
-        self.spectra.values = reflectance
-        self.spectra.pixel = None
-        self.spectra.line = None
-        self.spectra.latitude = None
-        self.spectra.longitude = None
-        self.spectra.wavelength_units = "nm"
-        self.spectra.value_units = "reflectance"
-        self.spectra.value_scaling = 1
-
-        return self.spectra
+        for i, name in enumerate(DART_COLUMNS[2:], 2):
+            spectra.additional_metadata[name] = data[:, i]
+
+        spectra.file_name = filename
+        spectra.wavelengths = wavelengths
+        spectra.values = reflectance
+        spectra.pixel = None
+        spectra.line = None
+        spectra.latitude = None
+        spectra.longitude = None
+        spectra.wavelength_units = "nm"
+        spectra.value_units = "reflectance"
+        spectra.value_scaling = 1
+
+        return spectra
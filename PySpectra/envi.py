@@ -10,9 +10,10 @@
 #
 import collections
 import os
-import re
+import threading
 import numpy
 
+from . import spectra_collection
 from . import spectra_reader
 
 ENVI_TO_NUMPY_DTYPE = {'1':  numpy.uint8,
@@ -27,18 +28,56 @@ ENVI_TO_NUMPY_DTYPE = {'1':  numpy.uint8,
                        '14': numpy.int64,
                        '15': numpy.uint64}
 
+# Maximum number of parsed headers kept in memory by 'ENVIFormat.load_header'
+MAX_CACHED_HEADERS = 128
+
+# Parsed header, wavelengths as a numpy array, list of spectra names
+# and dictionary of spectra name to row.
+ENVIHeader = collections.namedtuple("ENVIHeader", ["header", "wavelengths",
+                                                   "spectra_names", "name_index"])
+
+_header_cache = collections.OrderedDict()
+_header_cache_lock = threading.Lock()
+
+
+def clear_header_cache():
+    """
+    Remove all parsed headers from the cache.
+    """
+    with _header_cache_lock:
+        _header_cache.clear()
+
+
+def get_numpy_dtype(in_header):
+    """
+    Get numpy data type, including byte order, for data described by an
+    ENVI header.
+
+    Requires:
+
+    * in_header - dictionary of header values from 'read_hdr_file'
+
+    Returns:
+
+    * numpy.dtype
+
+    """
+    dtype = numpy.dtype(ENVI_TO_NUMPY_DTYPE[in_header['data type']])
+    if int(in_header.get('byte order', 0)) == 1:
+        return dtype.newbyteorder('>')
+    return dtype.newbyteorder('<')
 
 
 class ENVIFormat(spectra_reader.SpectraReader):
     """
-    Reader for ENVI spectral library.
+    Reader for ENVI spectral library and for extracting spectra from
+    ENVI images.
     """
 
-    def read_hdr_file(self, rawfilename):
+    def find_hdr_file(self, rawfilename):
         """
-        Read information from ENVI header file to a dictionary.
+        Get the path of the ENVI header file for a data file.
         """
-
         # Get the filename without path or extension
         filename = os.path.basename(rawfilename)
         filesplit = os.path.splitext(filename)
@@ -53,114 +92,400 @@ class ENVIFormat(spectra_reader.SpectraReader):
         else:
             raise IOError('Could not find coresponding header file')
 
-        hdrfile = open(hdrfilename, 'r')
+        return hdrfilename
+
+    def parse_hdr_file(self, hdrfilename):
+        """
+        Parse ENVI header file to a dictionary.
+        """
         output = collections.OrderedDict()
         inblock = False
 
-        # Read line, split it on equals, strip whitespace from resulting strings
-        # and add key/value pair to output
-        for currentline in hdrfile:
-            # ENVI headers accept blocks bracketed by curly braces - check for these
-            if not inblock:
-                # Split line on first equals sign
-                if re.search('=', currentline) is not None:
-                    linesplit = re.split('=', currentline, 1)
-                    # Convert all values to lower case
-                    key = linesplit[0].strip().lower()
-                    value = linesplit[1].strip()
-
-                    # If value starts with an open brace, it's the start of a block
-                    # - strip the brace off and read the rest of the block
-                    if re.match('{', value) is not None:
-                        inblock = True
-                        value = re.sub('^{', '', value, 1)
-
-                        # If value ends with a close brace it's the end
-                        # of the block as well - strip the brace off
-                        if re.search('}$', value):
-                            inblock = False
-                            value = re.sub('}$', '', value, 1)
-                    value = value.strip()
-                    output[key] = value
-            else:
-                # If we're in a block, just read the line, strip whitespace
-                # (and any closing brace ending the block) and add the whole thing
-                value = currentline.strip()
-                if re.search('}$', value):
-                    inblock = False
-                    value = re.sub('}$', '', value, 1)
-                    value = value.strip()
-                output[key] = output[key] + value
-
-        hdrfile.close()
+        with open(hdrfilename, 'r') as hdrfile:
+            # Read line, split it on equals, strip whitespace from resulting strings
+            # and add key/value pair to output
+            for currentline in hdrfile:
+                # ENVI headers accept blocks bracketed by curly braces - check for these
+                if not inblock:
+                    # Split line on first equals sign
+                    if '=' in currentline:
+                        linesplit = currentline.split('=', 1)
+                        # Convert all values to lower case
+                        key = linesplit[0].strip().lower()
+                        value = linesplit[1].strip()
+
+                        # If value starts with an open brace, it's the start of a block
+                        # - strip the brace off and read the rest of the block
+                        if value.startswith('{'):
+                            inblock = True
+                            value = value[1:]
+
+                            # If value ends with a close brace it's the end
+                            # of the block as well - strip the brace off
+                            if value.endswith('}'):
+                                inblock = False
+                                value = value[:-1]
+                        value = value.strip()
+                        output[key] = value
+                else:
+                    # If we're in a block, just read the line, strip whitespace
+                    # (and any closing brace ending the block) and add the whole thing
+                    value = currentline.strip()
+                    if value.endswith('}'):
+                        inblock = False
+                        value = value[:-1].strip()
+                    output[key] = output[key] + value
 
         return output
 
-    def get_spectra(self, filename, spectra_number=1):
+    def load_header(self, rawfilename):
         """
-        Extracts spectra from ENVI file. To get a list of all spectra within
-        a file use 'print_spectra_names'.
+        Get parsed header, wavelengths and an index of spectra names for
+        an ENVI file.
+
+        Parsed headers are cached, keyed on the path, modification time and
+        size of the header file so they are only parsed again if it changes.
 
         Requires:
 
-        * filename
-        * spectra_number - multiple spectra are often present in the same file. Use to specify required spectra.
+        * rawfilename - ENVI file (or header file)
 
         Returns:
 
-        * Spectra object with values, radiance, pixel and line
+        * ENVIHeader named tuple. These are shared between calls so
+          should not be modified.
 
         """
-        in_header = self.read_hdr_file(filename)
+        hdrfilename = self.find_hdr_file(rawfilename)
+        hdr_stat = os.stat(hdrfilename)
+        key = (os.path.abspath(hdrfilename), hdr_stat.st_mtime_ns,
+               hdr_stat.st_size)
+
+        with _header_cache_lock:
+            if key in _header_cache:
+                _header_cache.move_to_end(key)
+                return _header_cache[key]
 
-        # Get samples lines and data type
+        in_header = self.parse_hdr_file(hdrfilename)
+
+        wavelengths = None
+        if 'wavelength' in in_header:
+            wavelengths = self.get_wavelengths(in_header)
+            wavelengths.flags.writeable = False
+
+        spectra_names = self.parse_spectra_names(in_header)
+        name_index = {}
+        for i, name in enumerate(spectra_names):
+            name_index.setdefault(name, i)
+
+        header_entry = ENVIHeader(in_header, wavelengths, spectra_names,
+                                  name_index)
+
+        with _header_cache_lock:
+            _header_cache[key] = header_entry
+            if len(_header_cache) > MAX_CACHED_HEADERS:
+                _header_cache.popitem(last=False)
+
+        return header_entry
+
+    def read_hdr_file(self, rawfilename):
+        """
+        Read information from ENVI header file to a dictionary.
+        """
+        return collections.OrderedDict(self.load_header(rawfilename).header)
+
+    def get_spectra_number(self, filename, name):
+        """
+        Get the number of a spectrum, as used by 'get_spectra', from its name.
+        """
+        try:
+            return self.load_header(filename).name_index[name] + 1
+        except KeyError:
+            raise KeyError("Spectra '{}' not found in {}".format(name, filename))
+
+    def read_data(self, filename, in_header, use_memmap=True):
+        """
+        Get data from an ENVI spectral library as a 2D array (spectra x samples).
+
+        Requires:
+
+        * filename - ENVI file
+        * in_header - dictionary of header values from 'read_hdr_file'
+        * use_memmap - if True (default) return a read only memory map so data
+                       are only read from disk when accessed.
+
+        Returns:
+
+        * numpy array or numpy.memmap, in the byte order of the file.
+
+        """
         lines = int(in_header['lines'])
         samples = int(in_header['samples'])
-        data_type = in_header['data type']
-        byte_order = int(in_header['byte order'])
+        header_offset = int(in_header.get('header offset', 0))
+        dtype = get_numpy_dtype(in_header)
+
+        if use_memmap:
+            data = numpy.memmap(filename, dtype=dtype, mode='r',
+                                offset=header_offset, shape=(lines, samples))
+        else:
+            data = numpy.fromfile(filename, dtype=dtype, offset=header_offset)
+            data = data.reshape((lines, samples))
+
+        return data
 
-        # Get wavelengths as NumPy array.
+    def get_wavelengths(self, in_header):
+        """
+        Get wavelengths from ENVI header as a numpy array.
+        """
         wavelengths = in_header['wavelength'].split(',')
         wavelengths = [float(w) for w in wavelengths]
-        wavelengths = numpy.array(wavelengths)
+        return numpy.array(wavelengths)
 
-        # Read to numpy array
-        data = numpy.fromfile(filename,
-                              dtype=ENVI_TO_NUMPY_DTYPE[data_type])
-        if byte_order == 0:
-            data = data.reshape((lines, samples))
-        else:
-            data = data.byteswap()
-            data = data.reshape((lines, samples))
+    def parse_spectra_names(self, in_header):
+        """
+        Get the names of spectra from the 'spectra names' field of an
+        ENVI header as a list. Returns an empty list if the field isn't present.
+        """
+        try:
+            spectra_names = in_header['spectra names']
+        except KeyError:
+            return []
+
+        return [name.strip() for name in spectra_names.split(',')]
 
-        reflectance = data[spectra_number-1,:]
+    def get_spectra_names(self, filename):
+        """
+        Get the names of spectra within a spectral library as a list.
+        """
+        return list(self.load_header(filename).spectra_names)
 
-        self.spectra.file_name = filename
-        self.spectra.wavelengths = wavelengths
-        self.spectra.values = reflectance
-        if in_header['wavelength units'].lower() == 'micrometers':
-            self.spectra.wavelength_units = 'um'
+    def _set_attributes(self, spectra, in_header):
+        """
+        Set wavelength units, value units and scaling from header for
+        Spectra or SpectraCollection object.
+        """
+        if in_header.get('wavelength units', '').lower() == 'micrometers':
+            spectra.wavelength_units = 'um'
         else:
-            self.spectra.wavelength_units = 'nm'
-        self.spectra.value_units = 'reflectance'
+            spectra.wavelength_units = 'nm'
+        spectra.value_units = 'reflectance'
         try:
             scale_factor = float(in_header['reflectance scale factor'])
-            self.spectra.value_scaling = scale_factor
+            spectra.value_scaling = scale_factor
         except KeyError:
-            self.spectra.value_scaling = 1
+            spectra.value_scaling = 1
+
+    def get_spectra(self, filename, spectra_number=1, use_memmap=True):
+        """
+        Extracts spectra from ENVI file. To get a list of all spectra within
+        a file use 'print_spectra_names'.
 
-        return self.spectra
+        Requires:
+
+        * filename
+        * spectra_number - multiple spectra are often present in the same file. Use to specify required spectra.
+                           Can also be the name of the spectra.
+        * use_memmap - if True (default) memory map the file so only the
+                       required spectrum is read. If False the whole file is read.
+
+        Returns:
+
+        * Spectra object with values, radiance, pixel and line
 
-    def print_spectra_names(self, filename):
         """
-        Prints the names of spectra within a spectral library and the
-        coresponding number, which can be used in 'get_spectra'
+        spectra = spectra_reader.Spectra()
+
+        header_entry = self.load_header(filename)
+        in_header = header_entry.header
+
+        if isinstance(spectra_number, str):
+            spectra_number = self.get_spectra_number(filename, spectra_number)
+
+        wavelengths = header_entry.wavelengths.copy()
+
+        # Read to numpy array, byte order is set in dtype so it is converted
+        # to native byte order when copied.
+        data = self.read_data(filename, in_header, use_memmap)
+        reflectance = numpy.array(data[spectra_number-1,:],
+                                  dtype=data.dtype.newbyteorder('='))
+
+        spectra_names = header_entry.spectra_names
+
+        spectra.file_name = filename
+        if len(spectra_names) == data.shape[0]:
+            spectra.name = spectra_names[spectra_number-1]
+        spectra.wavelengths = wavelengths
+        spectra.values = reflectance
+        self._set_attributes(spectra, in_header)
+
+        return spectra
+
+    def get_all_spectra(self, filename, spectra=None, use_memmap=True):
+        """
+        Extracts all spectra, or a subset, from ENVI file in one call.
+
+        Requires:
+
+        * filename
+        * spectra - spectra to extract (optional). Can be a list of
+                    spectra numbers (starting at 1, as used for 'get_spectra'),
+                    a list of spectra names or a slice of the spectra in the
+                    order they are stored (e.g., slice(0, 10) for the first ten).
+                    If not provided all spectra are extracted.
+        * use_memmap - if True (default) memory map the file so only the
+                       required spectra are read. If False the whole file is read.
+
+        Returns:
+
+        * SpectraCollection object with a row for each spectrum
+
         """
-        in_header = self.read_hdr_file(filename)
+        header_entry = self.load_header(filename)
+        in_header = header_entry.header
 
-        spectra_names = in_header['spectra names']
+        wavelengths = header_entry.wavelengths.copy()
+        spectra_names = numpy.array(header_entry.spectra_names, dtype=object)
+        data = self.read_data(filename, in_header, use_memmap)
 
-        for i, name in enumerate(spectra_names.split(',')):
-            print("{:0>3}: {}".format(i+1, name.strip()))
+        if spectra is None:
+            rows = numpy.arange(data.shape[0])
+        elif isinstance(spectra, slice):
+            rows = numpy.arange(data.shape[0])[spectra]
+        else:
+            rows = []
+            for spectra_id in spectra:
+                if isinstance(spectra_id, str):
+                    spectra_id = self.get_spectra_number(filename, spectra_id)
+                rows.append(spectra_id - 1)
+            rows = numpy.array(rows, dtype=numpy.intp)
 
+        values = numpy.array(data[rows], dtype=data.dtype.newbyteorder('='))
+
+        if spectra_names.size != data.shape[0]:
+            spectra_names = None
+        else:
+            spectra_names = spectra_names[rows]
+
+        collection = spectra_collection.SpectraCollection(
+            wavelengths, values,
+            file_name=numpy.full(rows.size, filename, dtype=object),
+            name=spectra_names)
+        self._set_attributes(collection, in_header)
+
+        return collection
+
+    def read_image_data(self, filename, in_header):
+        """
+        Memory map an ENVI image as a 3D array, with dimensions ordered as
+        they are stored in the file:
 
+        * bsq - bands x lines x samples
+        * bil - lines x bands x samples
+        * bip - lines x samples x bands
+
+        Requires:
+
+        * filename - ENVI image file
+        * in_header - dictionary of header values from 'read_hdr_file'
+
+        Returns:
+
+        * numpy.memmap, in the byte order of the file.
+
+        """
+        lines = int(in_header['lines'])
+        samples = int(in_header['samples'])
+        bands = int(in_header['bands'])
+        header_offset = int(in_header.get('header offset', 0))
+        interleave = in_header.get('interleave', 'bsq').lower()
+
+        if interleave == 'bsq':
+            shape = (bands, lines, samples)
+        elif interleave == 'bil':
+            shape = (lines, bands, samples)
+        elif interleave == 'bip':
+            shape = (lines, samples, bands)
+        else:
+            raise ValueError("Interleave '{}' not recognised".format(interleave))
+
+        return numpy.memmap(filename, dtype=get_numpy_dtype(in_header), mode='r',
+                            offset=header_offset, shape=shape)
+
+    def get_image_spectra(self, filename, pixels, lines):
+        """
+        Extracts spectra from an ENVI image at a number of locations.
+
+        All locations are extracted in one operation from a memory map of the
+        image, so only the data needed are read. BSQ, BIL and BIP interleaves
+        are supported.
+
+        Requires:
+
+        * filename - ENVI image file
+        * pixels - list or numpy array of pixels (columns), starting at 0.
+        * lines - list or numpy array of lines (rows), starting at 0.
+
+        Returns:
+
+        * SpectraCollection object with a row for each location and pixel and
+          line set (empty if no locations are given). If the header has no
+          wavelengths band numbers are used.
+
+        Example:
+
+        spectra = ENVIFormat().get_image_spectra("flightline.bil",
+                                                 pixels=[10, 200],
+                                                 lines=[4000, 5231])
+
+        """
+        header_entry = self.load_header(filename)
+        in_header = header_entry.header
+
+        pixels = numpy.atleast_1d(numpy.asarray(pixels, dtype=numpy.intp))
+        lines = numpy.atleast_1d(numpy.asarray(lines, dtype=numpy.intp))
+        if pixels.shape != lines.shape:
+            raise ValueError("Need the same number of pixels and lines")
+
+        data = self.read_image_data(filename, in_header)
+        interleave = in_header.get('interleave', 'bsq').lower()
+        n_lines = int(in_header['lines'])
+        n_samples = int(in_header['samples'])
+
+        # No locations (e.g., no points within image) gives an empty collection.
+        if pixels.size > 0 and (pixels.min() < 0 or pixels.max() >= n_samples or
+                                lines.min() < 0 or lines.max() >= n_lines):
+            raise IndexError("Pixel or line outside image "
+                             "({} samples x {} lines)".format(n_samples, n_lines))
+
+        native_dtype = data.dtype.newbyteorder('=')
+        if interleave == 'bsq':
+            values = numpy.array(data[:, lines, pixels].T, dtype=native_dtype)
+        elif interleave == 'bil':
+            values = numpy.array(data[lines, :, pixels], dtype=native_dtype)
+        else:
+            values = numpy.array(data[lines, pixels, :], dtype=native_dtype)
+
+        if header_entry.wavelengths is not None:
+            wavelengths = header_entry.wavelengths.copy()
+        else:
+            wavelengths = numpy.arange(1, values.shape[1] + 1, dtype=numpy.float64)
+
+        collection = spectra_collection.SpectraCollection(
+            wavelengths, values,
+            file_name=numpy.full(pixels.size, filename, dtype=object),
+            pixel=pixels, line=lines)
+        self._set_attributes(collection, in_header)
+        if 'reflectance scale factor' not in in_header:
+            collection.value_units = ''
+        if header_entry.wavelengths is None:
+            collection.wavelength_units = 'band'
+
+        return collection
+
+    def print_spectra_names(self, filename):
+        """
+        Prints the names of spectra within a spectral library and the
+        coresponding number, which can be used in 'get_spectra'
+        """
+        for i, name in enumerate(self.get_spectra_names(filename)):
+            print("{:0>3}: {}".format(i+1, name))
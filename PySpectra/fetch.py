@@ -0,0 +1,350 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file has been created by Plymouth Marine Laboratory and
+# is licensed under the MIT Licence. A copy of this
+# licence is available to download with this file.
+#
+# Created: 2026-10-18
+
+"""
+Functions for fetching files (e.g., USGS Spectral Library records) over
+HTTP and HTTPS.
+
+Connections are kept open in a ConnectionPool and reused for each host,
+many URLs can be fetched at once using 'fetch_many' and responses can be
+stored in an HTTPCache, so files which haven't changed on the server
+(checked using ETag / Last-Modified) aren't downloaded again.
+
+Example:
+
+cache = HTTPCache("/tmp/pyspectra_http_cache")
+data = fetch_many(urls, cache=cache, n_workers=8)
+
+# Reuse connections between batches
+with ConnectionPool() as pool:
+    first = fetch_many(first_urls, pool=pool)
+    second = fetch_many(second_urls, pool=pool)
+
+"""
+import concurrent.futures
+import hashlib
+import http.client
+import json
+import os
+import tempfile
+import threading
+import urllib.parse
+
+# Default number of URLs fetched at once by 'fetch_many'
+DEFAULT_N_WORKERS = 8
+
+# Maximum number of redirects to follow
+MAX_REDIRECTS = 5
+
+# Timeout for connections in seconds
+DEFAULT_TIMEOUT = 60
+
+REDIRECT_STATUS = (301, 302, 303, 307, 308)
+
+# Errors raised when reusing a connection the server has closed
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected,
+                            http.client.CannotSendRequest,
+                            http.client.BadStatusLine,
+                            ConnectionResetError,
+                            BrokenPipeError)
+
+
+def is_url(path):
+    """
+    Check if a path is an HTTP or HTTPS URL.
+    """
+    return path.startswith(("http://", "https://"))
+
+
+class ConnectionPool(object):
+    """
+    Pool of open connections, kept for each host so they can be reused.
+    Connections are taken from the pool while in use, so a pool can be
+    shared between threads.
+
+    Call 'close' (or use as a context manager) to close all connections
+    when finished.
+
+    * timeout - timeout for connections in seconds
+
+    """
+    def __init__(self, timeout=DEFAULT_TIMEOUT):
+        self.timeout = timeout
+        self._idle = {}
+        self._connections = set()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def get(self, scheme, netloc):
+        """
+        Get a connection to a host, reusing an idle connection if there
+        is one. Return it with 'put' when finished.
+        """
+        key = (scheme, netloc)
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop()
+
+        if scheme == "https":
+            connection = http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        elif scheme == "http":
+            connection = http.client.HTTPConnection(netloc, timeout=self.timeout)
+        else:
+            raise ValueError("Can't fetch '{}' URLs, only http and https "
+                             "are supported".format(scheme))
+        with self._lock:
+            self._connections.add(connection)
+        return connection
+
+    def put(self, scheme, netloc, connection):
+        """
+        Return a connection to the pool so it can be reused.
+        """
+        with self._lock:
+            self._idle.setdefault((scheme, netloc), []).append(connection)
+
+    def discard(self, connection):
+        """
+        Close a connection which can't be reused.
+        """
+        connection.close()
+        with self._lock:
+            self._connections.discard(connection)
+
+    def close(self):
+        """
+        Close all connections.
+        """
+        with self._lock:
+            connections = list(self._connections)
+            self._connections.clear()
+            self._idle.clear()
+        for connection in connections:
+            connection.close()
+
+
+class HTTPCache(object):
+    """
+    Persistent cache of files fetched over HTTP, stored in a directory.
+
+    Each URL is stored as the response body and a JSON file with the
+    ETag and Last-Modified headers, used to check if the file has changed
+    on the server.
+
+    * directory - directory to store cache in, created if it doesn't exist.
+
+    """
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _get_cache_file(self, url):
+        return os.path.join(self.directory,
+                            hashlib.sha1(url.encode("utf-8")).hexdigest())
+
+    def get(self, url):
+        """
+        Get a cached response for a URL.
+
+        Returns:
+
+        * dictionary of validators ('etag' and 'last_modified', None if not
+          available) and body, or None if the URL is not in the cache.
+
+        """
+        cache_file = self._get_cache_file(url)
+        try:
+            with open(cache_file + ".json", "r") as f:
+                entry = json.load(f)
+            if entry.get("url") != url:
+                return None
+            with open(cache_file + ".body", "rb") as f:
+                entry["body"] = f.read()
+        except (IOError, OSError, ValueError):
+            return None
+        return entry
+
+    def put(self, url, etag, last_modified, body):
+        """
+        Add a response to the cache. Responses without an ETag or
+        Last-Modified header can't be checked so are not stored.
+        """
+        if etag is None and last_modified is None:
+            return
+
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory, exist_ok=True)
+
+        cache_file = self._get_cache_file(url)
+        entry = {"url": url, "etag": etag, "last_modified": last_modified}
+
+        # Write to temporary files and then move so other threads or
+        # processes never see partially written files. Body is written
+        # first so a metadata file always has a complete body.
+        for extension, data in ((".body", body),
+                                (".json", json.dumps(entry).encode("utf-8"))):
+            temp_handle, temp_file = tempfile.mkstemp(dir=self.directory,
+                                                      suffix=".tmp")
+            with os.fdopen(temp_handle, "wb") as f:
+                f.write(data)
+            os.replace(temp_file, cache_file + extension)
+
+    def clear(self):
+        """
+        Remove all files from the cache.
+        """
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith((".body", ".json")):
+                    os.remove(os.path.join(self.directory, name))
+
+
+def _request(url, headers, pool):
+    """
+    Make a GET request on a connection from 'pool', retrying once on a new
+    connection if the server has closed the existing one.
+
+    Returns http.client.HTTPResponse with the body read into 'body'.
+    """
+    parts = urllib.parse.urlsplit(url)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+
+    for attempt in range(2):
+        connection = pool.get(parts.scheme, parts.netloc)
+        try:
+            connection.request("GET", path, headers=headers)
+            response = connection.getresponse()
+            response.body = response.read()
+        except _STALE_CONNECTION_ERRORS:
+            pool.discard(connection)
+            if attempt > 0:
+                raise
+            continue
+        except Exception:
+            pool.discard(connection)
+            raise
+        if response.will_close:
+            pool.discard(connection)
+        else:
+            pool.put(parts.scheme, parts.netloc, connection)
+        return response
+
+
+def fetch(url, cache=None, timeout=DEFAULT_TIMEOUT, pool=None):
+    """
+    Fetch a file from an HTTP or HTTPS URL.
+
+    Requires:
+
+    * url - URL to fetch
+    * cache - HTTPCache to store responses in (optional). If the URL is in
+              the cache the server is asked if it has changed and the cached
+              copy used if not.
+    * timeout - timeout for connections in seconds (if 'pool' isn't provided)
+    * pool - ConnectionPool to reuse connections from (optional). If not
+             provided a connection is opened and closed for this URL.
+
+    Returns:
+
+    * Contents of the file as bytes
+
+    """
+    if pool is None:
+        with ConnectionPool(timeout) as pool:
+            return fetch(url, cache=cache, pool=pool)
+
+    for _ in range(MAX_REDIRECTS + 1):
+        cached = None
+        headers = {"Accept-Encoding": "identity"}
+        if cache is not None:
+            cached = cache.get(url)
+            if cached is not None:
+                if cached["etag"] is not None:
+                    headers["If-None-Match"] = cached["etag"]
+                if cached["last_modified"] is not None:
+                    headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = _request(url, headers, pool)
+
+        if response.status == 304 and cached is not None:
+            return cached["body"]
+        elif response.status in REDIRECT_STATUS:
+            url = urllib.parse.urljoin(url, response.getheader("Location"))
+        elif response.status == 200:
+            if cache is not None:
+                cache.put(url, response.getheader("ETag"),
+                          response.getheader("Last-Modified"), response.body)
+            return response.body
+        else:
+            raise IOError("Failed to fetch {}: {} {}".format(url, response.status,
+                                                             response.reason))
+
+    raise IOError("Failed to fetch {}: too many redirects".format(url))
+
+
+def _fetch_one(url, cache, pool, raise_errors):
+    """
+    Fetch a single URL. If 'raise_errors' is False any exception raised is
+    returned in place of the data.
+    """
+    try:
+        return fetch(url, cache=cache, pool=pool)
+    except Exception as err:
+        if raise_errors:
+            raise
+        return err
+
+
+def fetch_many(urls, cache=None, n_workers=DEFAULT_N_WORKERS,
+               timeout=DEFAULT_TIMEOUT, raise_errors=False, pool=None):
+    """
+    Fetch many URLs at once using a pool of threads, sharing a pool of
+    open connections.
+
+    Requires:
+
+    * urls - list of URLs
+    * cache - HTTPCache to store responses in (optional)
+    * n_workers - maximum number of URLs to fetch at once
+    * timeout - timeout for connections in seconds (if 'pool' isn't provided)
+    * raise_errors - if True the first error fetching a URL is raised. If False
+                     the exception is returned in place of the data for that URL.
+    * pool - ConnectionPool to use (optional), to reuse connections between
+             batches. If not provided connections are closed when all URLs
+             have been fetched.
+
+    Returns:
+
+    * List with contents of each URL as bytes, in the same order as 'urls'.
+
+    """
+    urls = list(urls)
+    n_urls = len(urls)
+    if n_urls == 0:
+        return []
+
+    own_pool = pool is None
+    if own_pool:
+        pool = ConnectionPool(timeout)
+
+    try:
+        n_workers = max(min(n_workers, n_urls), 1)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=n_workers) as executor:
+            return list(executor.map(_fetch_one, urls, [cache] * n_urls,
+                                     [pool] * n_urls, [raise_errors] * n_urls))
+    finally:
+        if own_pool:
+            pool.close()
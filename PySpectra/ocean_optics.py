@@ -8,14 +8,135 @@
 # Author: Dan Clewley / Aser Mata (original code)
 # Created: 2019-02-11
 
+import io
 import os
 import datetime
 import numpy
 
+from . import spectra_collection
 from . import spectra_reader
 
 OCEAN_OPTICS_SATURATION_VALUE = 16383
 
+
+def get_time_seconds(times):
+    """
+    Convert array of datetime objects to seconds since 1970-01-01 as a
+    numpy array. Times without a time zone are assumed to be UTC.
+    """
+    seconds = numpy.empty(len(times))
+    for i, time in enumerate(times):
+        if time.tzinfo is None:
+            time = time.replace(tzinfo=datetime.timezone.utc)
+        seconds[i] = time.timestamp()
+    return seconds
+
+
+def match_nearest_time(times, reference_times):
+    """
+    Find the index of the nearest time in 'reference_times' for each time
+    in 'times'.
+
+    Requires:
+
+    * times - array of datetime objects
+    * reference_times - array of datetime objects to match to
+
+    Returns:
+
+    * numpy array of indices into reference_times
+
+    """
+    if len(reference_times) == 0:
+        raise ValueError("No reference times to match to (e.g., empty dark "
+                         "or reference collection)")
+
+    seconds = get_time_seconds(times)
+    reference_seconds = get_time_seconds(reference_times)
+
+    order = numpy.argsort(reference_seconds, kind="stable")
+    sorted_seconds = reference_seconds[order]
+
+    if sorted_seconds.size == 1:
+        return numpy.zeros(seconds.size, dtype=numpy.intp)
+
+    upper = numpy.clip(numpy.searchsorted(sorted_seconds, seconds), 1,
+                       sorted_seconds.size - 1)
+    lower = upper - 1
+    use_upper = (numpy.abs(sorted_seconds[upper] - seconds) <
+                 numpy.abs(seconds - sorted_seconds[lower]))
+    return order[numpy.where(use_upper, upper, lower)]
+
+
+def normalise_integration_time(collection):
+    """
+    Divide values by integration time of each spectrum, so spectra
+    acquired using different integration times can be compared.
+
+    Requires:
+
+    * collection - SpectraCollection with integration_time set
+
+    Returns:
+
+    * New SpectraCollection with values in DN per second.
+
+    """
+    if numpy.isnan(collection.integration_time).any():
+        raise ValueError("Integration time is not available for all spectra")
+
+    normalised = collection.copy()
+    normalised.values = collection.values / collection.integration_time[:, numpy.newaxis]
+    normalised.value_units = "{}/s".format(collection.value_units)
+    return normalised
+
+
+def subtract_dark(collection, dark):
+    """
+    Subtract dark spectra, using the dark spectrum nearest in time to
+    each spectrum.
+
+    Dark spectra should have the same integration time, or both should have
+    been normalised using 'normalise_integration_time' first.
+
+    Requires:
+
+    * collection - SpectraCollection
+    * dark - SpectraCollection of dark spectra with the same wavelengths
+
+    Returns:
+
+    * New SpectraCollection with dark subtracted.
+
+    """
+    nearest = match_nearest_time(collection.time, dark.time)
+    corrected = collection.copy()
+    corrected.values = collection.values - dark.values[nearest]
+    return corrected
+
+
+def divide_by_reference(collection, reference):
+    """
+    Calculate reflectance by dividing by reference panel spectra, using the
+    reference spectrum nearest in time to each spectrum.
+
+    Requires:
+
+    * collection - SpectraCollection of target spectra
+    * reference - SpectraCollection of reference panel spectra with the
+                  same wavelengths (and same corrections applied).
+
+    Returns:
+
+    * New SpectraCollection with values as reflectance.
+
+    """
+    nearest = match_nearest_time(collection.time, reference.time)
+    reflectance = collection.copy()
+    reflectance.values = collection.values / reference.values[nearest]
+    reflectance.value_units = "reflectance"
+    return reflectance
+
 class OceanOpticsSTSFormat(spectra_reader.SpectraReader):
     """
     Class to read spectra from ASCII format data saved using SDK
@@ -47,60 +168,205 @@ class OceanOpticsSTSFormat(spectra_reader.SpectraReader):
                                  "expected. If the timezone is a code (e.g., BST) "
                                  "try changing to an offset from UTC (e.g., +0100)."
                                  "\n{}".format(time_str, err))
-            return out_time
+        return out_time
 
-    def read_metadata(self, filename):
+    def parse_metadata_line(self, line, spectra):
         """
-        Function to read metadata from ocean optics sensor.
+        Parse a single (stripped) line of metadata from an ocean optics
+        file and add to 'spectra'.
 
-        Should work with data from both SDK and OceanView software
+        Returns True if the line was metadata, False otherwise.
+        """
+        if line.startswith("Date"):
+            spectra.time = self.parse_time_string(line)
+        elif line.startswith("Integration time: "):
+            # Read in integration time. Stored in file as ms need to convert to
+            # seconds
+            spectra.integration_time = float(line.split(":")[1]) / 1E6
+        elif line.startswith("Integration Time (sec): "):
+            # OceanView stores integration time in seconds
+            spectra.integration_time = float(line.split(": ")[1])
+        elif line.startswith("Scans to average: "):
+            spectra.n_scans_average = int(line.split("Scans to average: ")[1])
+        elif line.startswith("Boxcar smoothing: "):
+            spectra.additional_metadata["Boxcar smoothing"] = int(line.split("Boxcar smoothing: ")[1])
+        elif line.count(":") == 1:
+            elements = line.split(":")
+            spectra.additional_metadata[elements[0]] = elements[1]
+        else:
+            return False
+        return True
+
+    def parse_metadata_lines(self, spectra_file, spectra):
+        """
+        Read metadata from an open ocean optics file, stopping at the first
+        line of data.
 
         Requires:
 
-        * filename - path to spectral file
+        * spectra_file - file object, data are read from the current position
+        * spectra - Spectra object to add metadata to
 
-        """
+        Returns:
 
-        spectra_file = open(filename, "r")
+        * Number of lines read before data (None if no data were found)
+        * First line of data (empty string if no data were found)
 
+        """
         for i, line in enumerate(spectra_file):
             line = line.strip()
-            if line.startswith("Date"):
-                self.spectra.time = self.parse_time_string(line)
-            elif line.startswith("Integration time: "):
-                # Read in integration time. Stored in file as ms need to convert to
-                # seconds
-                self.spectra.integration_time = float(line.split(":")[1]) / 1E6
-            elif line.startswith("Scans to average: "):
-                self.spectra.n_scans_average = int(line.split("Scans to average: ")[1])
-            elif line.startswith("Boxcar smoothing: "):
-                self.spectra.additional_metadata["Boxcar smoothing"] = int(line.split("Boxcar smoothing: ")[1])
-                # Once start getting to data have read all metadata so return.
-            elif line.count(":") == 1:
-                elements = line.split(":")
-                self.spectra.additional_metadata[elements[0]] = elements[1]
+            if self.parse_metadata_line(line, spectra):
+                continue
             elif "\t" in line:
                 line_split = line.split("\t")
                 if len(line_split) == 2 and line != "Wavelengths\tIntensities":
                     try:
                         # Try to convert values to floats, if this fails
                         # assume haven't reached data yet
-                        wv_0 = float(line_split[0])
-                        dn_0 = float(line_split[1])
-                        if self.spectra.skip_header is None:
-                            self.spectra.skip_header = i
-                        # Have now got to data, all metadata is read so close
-                        # file and return.
-                        spectra_file.close()
-                        return
+                        float(line_split[0])
+                        float(line_split[1])
+                        # Have now got to data, all metadata is read so return.
+                        return i, line + "\n"
                     except ValueError:
                         #most likely we have not reached the point and we have something like 'Wavelengths\tIntensities'
                         pass
 
+        return None, ""
+
+    def is_data_line(self, line):
+        """
+        Check if a (stripped) line from an ocean optics file is a row of
+        tab separated data, with a wavelength and one or more values.
+        """
+        line_split = line.split("\t")
+        if len(line_split) < 2:
+            return False
+        try:
+            float(line_split[0])
+            float(line_split[-1])
+        except ValueError:
+            return False
+        return True
+
+    def parse_column_times(self, column_names):
+        """
+        Get the time for each column of values from the column names
+        (e.g., OceanView files with a spectrum for each column).
+
+        Returns list of datetime objects or None if the names aren't
+        all times.
+        """
+        times = []
+        for name in column_names:
+            try:
+                times.append(datetime.datetime.fromisoformat(name.strip()))
+            except ValueError:
+                try:
+                    times.append(self.parse_time_string(name.strip()))
+                except ValueError:
+                    return None
+        return times
+
+    def iter_spectra_blocks(self, spectra_file):
+        """
+        Read blocks of data from an open ocean optics file, which may
+        contain many spectra either as additional columns or as sequential
+        blocks, each with their own metadata.
+
+        The file is read line by line so only a single block is held in
+        memory at a time.
+
+        Requires:
+
+        * spectra_file - file object
+
+        Returns:
+
+        * Generator of (Spectra object with metadata, list of column names
+          or None, numpy array of data (rows x columns)) for each block.
+
+        """
+        spectra = spectra_reader.Spectra()
+        column_names = None
+        data_lines = []
+
+        for line in spectra_file:
+            line = line.strip()
+            if self.is_data_line(line):
+                data_lines.append(line)
+                continue
+
+            # End of a block of data, metadata which follow are for the
+            # next block.
+            if len(data_lines) > 0:
+                yield spectra, column_names, self.parse_data("\n".join(data_lines))
+                spectra = spectra_reader.Spectra()
+                column_names = None
+                data_lines = []
+
+            if not self.parse_metadata_line(line, spectra) and "\t" in line:
+                column_names = line.split("\t")
+
+        if len(data_lines) > 0:
+            yield spectra, column_names, self.parse_data("\n".join(data_lines))
+
+    def read_metadata(self, filename, spectra=None):
+        """
+        Function to read metadata from ocean optics sensor.
+
+        Should work with data from both SDK and OceanView software
+
+        Requires:
+
+        * filename - path to spectral file
+        * spectra - Spectra object to add metadata to (optional). If not
+                    provided a new object is created.
+
+        Returns:
+
+        * Spectra object with metadata and skip_header set to the line
+          data starts on.
+
+        """
+        if spectra is None:
+            spectra = spectra_reader.Spectra()
+
+        with open(filename, "r") as spectra_file:
+            skip_header, _ = self.parse_metadata_lines(spectra_file, spectra)
+
+        if spectra.skip_header is None:
+            spectra.skip_header = skip_header
+
+        return spectra
+
+    def parse_data(self, data_text):
+        """
+        Parse block of tab separated data from an ocean optics file
+        into a numpy array (rows x columns).
+
+        Data are parsed using 'spectra_reader.parse_text_data'. If this
+        isn't possible (e.g., missing values) numpy.genfromtxt is used.
+        """
+        # Data saved by OceanView ends with a line '>>>>>End Spectral Data<<<<<'
+        data_text = data_text.split(">>>>>", 1)[0]
+        n_columns = len(data_text.split("\n", 1)[0].split())
+        if n_columns == 0:
+            return numpy.empty((0, 2))
+
+        data = spectra_reader.parse_text_data(data_text, n_columns)
+        if data is not None:
+            return data
+
+        return numpy.genfromtxt(io.StringIO(data_text), delimiter="\t",
+                                ndmin=2)
+
     def get_spectra(self, filename, date_from_timestamp=False, **kwargs):
         """
         Extract spectra from Ocean Optics STS
 
+        The file is read in a single pass, metadata are read line by line
+        and the data which follow are parsed in one go.
+
         Requires:
 
         * filename - path to input file containing spectra
@@ -112,35 +378,156 @@ class OceanOpticsSTSFormat(spectra_reader.SpectraReader):
         * Spectra object.
 
         """
-        # Get metadata
-        self.read_metadata(filename)
+        spectra = spectra_reader.Spectra()
+
+        with open(filename, "r") as spectra_file:
+            # Get metadata
+            skip_header, first_data_line = self.parse_metadata_lines(spectra_file,
+                                                                     spectra)
+            if skip_header is None:
+                raise ValueError("No data found in {}".format(filename))
+            spectra.skip_header = skip_header
+
+            # Read in data
+            data = self.parse_data(first_data_line + spectra_file.read())
 
         # Get creation time from file creation date. When using SDK this is the
         # only way to get this information.
         # Use whichever is first ctime or mtime.
         # Assume timestamp is always UTC
-        if self.spectra.time is None or date_from_timestamp:
-            self.spectra.time = datetime.datetime.fromtimestamp(
-                                    int(numpy.min([os.stat(filename).st_ctime,
-                                        os.stat(filename).st_mtime])),
-                                        datetime.timezone.utc)
-
-        # Read in data
-        data = numpy.genfromtxt(filename, skip_header=self.spectra.skip_header)
+        if spectra.time is None or date_from_timestamp:
+            file_stat = os.stat(filename)
+            spectra.time = datetime.datetime.fromtimestamp(
+                                    int(min(file_stat.st_ctime, file_stat.st_mtime)),
+                                    datetime.timezone.utc)
+
         wavelengths = data[:, 0]
         dn = data[:, 1]
         # Set saturation values to NaN
         dn[dn >= OCEAN_OPTICS_SATURATION_VALUE] = numpy.nan
 
-        self.spectra.file_name = filename
-        self.spectra.wavelengths = wavelengths
-        self.spectra.values = dn
-        self.spectra.pixel = None
-        self.spectra.line = None
-        self.spectra.latitude = None
-        self.spectra.longitude = None
-        self.spectra.wavelength_units = "nm"
-        self.spectra.value_units = "DN"
-        self.spectra.value_scaling = 1
-
-        return self.spectra
+        spectra.file_name = filename
+        spectra.wavelengths = wavelengths
+        spectra.values = dn
+        spectra.pixel = None
+        spectra.line = None
+        spectra.latitude = None
+        spectra.longitude = None
+        spectra.wavelength_units = "nm"
+        spectra.value_units = "DN"
+        spectra.value_scaling = 1
+
+        return spectra
+
+    def get_all_spectra(self, filename, date_from_timestamp=False):
+        """
+        Extract all spectra from an Ocean Optics file containing one or
+        more spectra, saved as additional columns and / or sequential blocks
+        with their own metadata (e.g., time series saved by OceanView).
+
+        The file is read in a single pass.
+
+        If columns have times as names these are used for the time of each
+        spectrum, otherwise the time of the block is used.
+
+        Requires:
+
+        * filename - path to input file containing spectra
+        * date_from_timestamp - If set to True will ignore any date information
+                                in the file and use the file creation date instead.
+
+        Returns:
+
+        * SpectraCollection with a row for each spectrum.
+
+        """
+        wavelengths = None
+        values = []
+        columns = dict((name, []) for name in ("name", "time", "integration_time",
+                                               "n_scans_average"))
+        file_time = None
+
+        with open(filename, "r") as spectra_file:
+            for spectra, column_names, data in self.iter_spectra_blocks(spectra_file):
+                if wavelengths is None:
+                    wavelengths = data[:, 0]
+                elif not numpy.array_equal(data[:, 0], wavelengths):
+                    raise ValueError("Spectra in {} have different "
+                                     "wavelengths".format(filename))
+
+                block_values = data[:, 1:].T
+                n_spectra = block_values.shape[0]
+                values.append(block_values)
+
+                names = [None] * n_spectra
+                times = None
+                if column_names is not None and len(column_names) == n_spectra + 1:
+                    if column_names[1:] != ["Intensities"]:
+                        names = column_names[1:]
+                    times = self.parse_column_times(column_names[1:])
+
+                if times is None or date_from_timestamp:
+                    if spectra.time is None or date_from_timestamp:
+                        if file_time is None:
+                            file_stat = os.stat(filename)
+                            file_time = datetime.datetime.fromtimestamp(
+                                int(min(file_stat.st_ctime, file_stat.st_mtime)),
+                                datetime.timezone.utc)
+                        spectra.time = file_time
+                    times = [spectra.time] * n_spectra
+
+                columns["name"].extend(names)
+                columns["time"].extend(times)
+                columns["integration_time"].extend(
+                    [numpy.nan if spectra.integration_time is None
+                     else spectra.integration_time] * n_spectra)
+                columns["n_scans_average"].extend(
+                    [0 if spectra.n_scans_average is None
+                     else spectra.n_scans_average] * n_spectra)
+
+        if wavelengths is None:
+            raise ValueError("No data found in {}".format(filename))
+
+        values = numpy.vstack(values)
+        # Set saturation values to NaN
+        values[values >= OCEAN_OPTICS_SATURATION_VALUE] = numpy.nan
+
+        return spectra_collection.SpectraCollection(
+            wavelengths, values, wavelength_units="nm", value_units="DN",
+            file_name=[filename] * values.shape[0], **columns)
+
+    def get_time_series(self, filenames, date_from_timestamp=False):
+        """
+        Extract spectra from many Ocean Optics files (e.g., a deployment) into
+        a time series, sorted by time. All files must have the same wavelengths.
+
+        Dark subtraction, integration time normalisation and division by a
+        reference panel can then be applied to the whole time series using
+        'subtract_dark', 'normalise_integration_time' and 'divide_by_reference'.
+
+        Requires:
+
+        * filenames - list of files, each containing one or more spectra
+        * date_from_timestamp - If set to True will ignore any date information
+                                in the files and use the file creation date instead.
+
+        Returns:
+
+        * SpectraCollection with a row for each spectrum, with time,
+          integration_time and n_scans_average set.
+
+        Example:
+
+        reader = OceanOpticsSTSFormat()
+        target = reader.get_time_series(glob.glob("target/*.txt"))
+        dark = reader.get_time_series(glob.glob("dark/*.txt"))
+        target = subtract_dark(normalise_integration_time(target),
+                               normalise_integration_time(dark))
+
+        """
+        collection = spectra_collection.SpectraCollection.concatenate(
+            [self.get_all_spectra(filename, date_from_timestamp=date_from_timestamp)
+             for filename in filenames])
+
+        order = numpy.argsort(get_time_seconds(collection.time), kind="stable")
+        return collection[order]
@@ -0,0 +1,387 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file has been created by Plymouth Marine Laboratory and
+# is licensed under the MIT Licence. A copy of this
+# licence is available to download with this file.
+#
+# Created: 2026-10-18
+
+"""
+Precompiled sensor response operators.
+
+Convolving a spectrum with a Spectral Response Function (SRF) is linear
+in the spectrum values, so for a given set of SRFs and wavelengths it can
+be written as a matrix of weights (n_bands x n_wavelengths). The matrix is
+computed once per wavelength grid and convolving one spectrum, or many,
+is then a single matrix product.
+"""
+import collections
+import threading
+
+import numpy
+
+# Maximum number of wavelength grids to keep weights for, per operator
+MAX_CACHED_GRIDS = 16
+
+# Maximum number of operators kept by 'get_sensor_operator'
+MAX_CACHED_OPERATORS = 32
+
+# Shapes of bands supported by SyntheticSensorOperator
+BAND_SHAPES = ("gaussian", "trapezoid")
+
+
+def trapz_weights(x):
+    """
+    Get weights which give the trapezoidal integral of y over x as
+
+    numpy.sum(weights * y)
+
+    Requires:
+
+    * x - numpy array of sample positions
+
+    Returns:
+
+    * weights - numpy array, same size as x
+
+    """
+    x = numpy.asarray(x, dtype=numpy.float64)
+    weights = numpy.zeros(x.shape)
+    if x.size < 2:
+        return weights
+    dx = numpy.diff(x)
+    weights[:-1] += dx / 2.0
+    weights[1:] += dx / 2.0
+    return weights
+
+
+class SensorOperator(object):
+    """
+    Class to convolve spectra with a set of Spectral Response Functions
+    using precomputed weights.
+
+    * srf - list of Spectra objects with value_units set to "response"
+    * n_bands - number of bands of the sensor
+
+    Example:
+
+    from PySpectra.srf import LANDSAT_OLI
+    operator = SensorOperator(LANDSAT_OLI)
+
+    # Convolve one spectrum
+    band_values = operator.apply(s.wavelengths, s.values)
+
+    # Convolve many spectra (n_spectra x n_wavelengths) on the same wavelengths
+    band_values = operator.apply(wavelengths, values)
+
+    """
+    def __init__(self, srf):
+        if not isinstance(srf, (list, tuple)):
+            srf = [srf]
+        for band in srf:
+            if band.value_units != "response":
+                raise ValueError('SRF must be a Spectra instance with value_units set to "response"')
+        self.srf = list(srf)
+        self.n_bands = len(self.srf)
+        self._cache = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def _build_weights(self, wavelengths):
+        """
+        Build weights and support for increasing 'wavelengths'.
+
+        Returns:
+
+        * weights - n_bands x n_wavelengths array, each row sums to 1.
+        * support - n_bands x n_wavelengths boolean array, True for each
+                    wavelength used for the band (including with a weight of 0).
+
+        """
+        n_wavelengths = wavelengths.size
+        weights = numpy.zeros((self.n_bands, n_wavelengths))
+        support = numpy.zeros((self.n_bands, n_wavelengths), dtype=bool)
+
+        for i, band in enumerate(self.srf):
+            band_wavelengths = numpy.asarray(band.wavelengths, dtype=numpy.float64)
+            if band_wavelengths.min() < wavelengths[0]:
+                raise ValueError("A value in x_new is below the interpolation range.")
+            if band_wavelengths.max() > wavelengths[-1]:
+                raise ValueError("A value in x_new is above the interpolation range.")
+
+            # Linear interpolation of the spectrum to the SRF wavelengths
+            # as a lower index and weight given to the value above.
+            upper = numpy.searchsorted(wavelengths, band_wavelengths, side="left")
+            upper = numpy.clip(upper, 1, n_wavelengths - 1)
+            lower = upper - 1
+            upper_weight = ((band_wavelengths - wavelengths[lower]) /
+                            (wavelengths[upper] - wavelengths[lower]))
+
+            # Combine with trapezoidal integration of response * values,
+            # normalised by the integral of the response.
+            response = (trapz_weights(band_wavelengths) *
+                        numpy.asarray(band.values, dtype=numpy.float64))
+            response = response / response.sum()
+
+            weights[i] = (numpy.bincount(lower, response * (1 - upper_weight),
+                                         minlength=n_wavelengths) +
+                          numpy.bincount(upper, response * upper_weight,
+                                         minlength=n_wavelengths))
+            support[i, lower] = True
+            support[i, upper] = True
+
+        return weights, support
+
+    def get_weights(self, wavelengths):
+        """
+        Get weights to convolve spectra with 'wavelengths'. These are
+        cached so only calculated the first time each set of wavelengths is used.
+
+        Requires:
+
+        * wavelengths - numpy array of wavelengths of spectra
+
+        Returns:
+
+        * weights - n_bands x n_wavelengths numpy array
+        * support - n_bands x n_wavelengths boolean numpy array of wavelengths
+                    used by each band
+
+        """
+        wavelengths = numpy.asarray(wavelengths, dtype=numpy.float64)
+        key = wavelengths.tobytes()
+
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        # Wavelengths don't need to be increasing (e.g., overlapping detectors)
+        # so sort and then put columns back in the original order.
+        order = numpy.argsort(wavelengths, kind="stable")
+        sorted_weights, sorted_support = self._build_weights(wavelengths[order])
+        weights = numpy.empty_like(sorted_weights)
+        support = numpy.empty_like(sorted_support)
+        weights[:, order] = sorted_weights
+        support[:, order] = sorted_support
+        weights.flags.writeable = False
+        support.flags.writeable = False
+
+        with self._lock:
+            self._cache[key] = (weights, support)
+            if len(self._cache) > MAX_CACHED_GRIDS:
+                self._cache.popitem(last=False)
+
+        return weights, support
+
+    def apply(self, wavelengths, values):
+        """
+        Convolve values with the SRFs.
+
+        Requires:
+
+        * wavelengths - numpy array of wavelengths (n_wavelengths)
+        * values - numpy array of values for a single spectrum (n_wavelengths)
+                   or many spectra (n_spectra x n_wavelengths)
+
+        Returns:
+
+        * numpy array of values for each band (n_bands) or for each spectrum
+          (n_spectra x n_bands)
+
+        """
+        weights, support = self.get_weights(wavelengths)
+        values = numpy.asarray(values)
+
+        nan_values = numpy.isnan(values)
+        if not nan_values.any():
+            return values.dot(weights.T)
+
+        # A NaN would otherwise be propagated to every band so set to 0
+        # and mask only bands which use them.
+        result = numpy.where(nan_values, 0, values).dot(weights.T)
+        result[nan_values.dot(support.T)] = numpy.nan
+        return result
+
+
+class SyntheticSensorOperator(SensorOperator):
+    """
+    SensorOperator for a sensor with Gaussian or trapezoidal SRFs described
+    by the centre and Full Width at Half Maximum (FWHM) of each band (e.g.,
+    hyperspectral sensors with hundreds of bands).
+
+    The response of every band is calculated at the wavelengths of the
+    spectra in a single operation, so no sampled SRFs are needed.
+
+    * centres - numpy array of band centres (same units as spectra wavelengths)
+    * fwhm - numpy array of FWHM of each band
+    * shape - 'gaussian' or 'trapezoid'
+    * edge_width - width of the sloping sides of trapezoidal bands
+                   (default half the FWHM)
+    * n_sigma - Gaussian bands are truncated at this many standard deviations
+                from the centre.
+    * n_bands - number of bands of the sensor
+
+    Example:
+
+    operator = SyntheticSensorOperator(centres, fwhm)
+    band_values = s.convolve(operator)
+
+    """
+    def __init__(self, centres, fwhm, shape="gaussian", edge_width=None,
+                 n_sigma=3.0):
+        if shape not in BAND_SHAPES:
+            raise ValueError("shape must be one of: {}".format(", ".join(BAND_SHAPES)))
+
+        self.centres = numpy.atleast_1d(numpy.asarray(centres, dtype=numpy.float64))
+        self.fwhm = numpy.broadcast_to(numpy.asarray(fwhm, dtype=numpy.float64),
+                                       self.centres.shape).copy()
+        if (self.fwhm <= 0).any():
+            raise ValueError("FWHM must be greater than 0")
+
+        if edge_width is None:
+            edge_width = self.fwhm / 2.0
+        self.edge_width = numpy.broadcast_to(numpy.asarray(edge_width,
+                                                           dtype=numpy.float64),
+                                             self.centres.shape).copy()
+        if shape == "trapezoid" and ((self.edge_width <= 0).any() or
+                                     (self.edge_width > self.fwhm).any()):
+            raise ValueError("edge_width must be greater than 0 and no larger "
+                             "than the FWHM")
+
+        self.shape = shape
+        self.n_sigma = n_sigma
+        self.srf = None
+        self.n_bands = self.centres.size
+        self._cache = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_half_widths(self):
+        """
+        Get distance from the centre of each band to where its response is 0.
+        """
+        if self.shape == "gaussian":
+            sigma = self.fwhm / (2 * numpy.sqrt(2 * numpy.log(2)))
+            return self.n_sigma * sigma
+        else:
+            return (self.fwhm + self.edge_width) / 2.0
+
+    def get_response(self, wavelengths):
+        """
+        Get the response of every band at 'wavelengths'.
+
+        Returns:
+
+        * n_bands x n_wavelengths numpy array, with a peak of 1 for each band
+
+        """
+        wavelengths = numpy.asarray(wavelengths, dtype=numpy.float64)
+        distance = numpy.abs(wavelengths[numpy.newaxis, :] -
+                             self.centres[:, numpy.newaxis])
+
+        if self.shape == "gaussian":
+            sigma = self.fwhm / (2 * numpy.sqrt(2 * numpy.log(2)))
+            response = numpy.exp(-0.5 * (distance / sigma[:, numpy.newaxis])**2)
+            response[distance > self.get_half_widths()[:, numpy.newaxis]] = 0
+        else:
+            response = numpy.clip((self.get_half_widths()[:, numpy.newaxis] - distance) /
+                                  self.edge_width[:, numpy.newaxis], 0, 1)
+        return response
+
+    def to_spectra(self, wavelengths, wavelength_units="um"):
+        """
+        Get the SRF of each band sampled at 'wavelengths' as Spectra objects
+        (e.g., to plot or save).
+        """
+        from .spectra_reader import Spectra
+
+        wavelengths = numpy.asarray(wavelengths, dtype=numpy.float64)
+        return [Spectra(wavelengths=wavelengths, values=response,
+                        wavelength_units=wavelength_units,
+                        value_units="response")
+                for response in self.get_response(wavelengths)]
+
+    def _build_weights(self, wavelengths):
+        """
+        Build weights and support for increasing 'wavelengths' from the
+        response of each band at the wavelengths.
+        """
+        half_widths = self.get_half_widths()
+        if (self.centres - half_widths).min() < wavelengths[0]:
+            raise ValueError("A value in x_new is below the interpolation range.")
+        if (self.centres + half_widths).max() > wavelengths[-1]:
+            raise ValueError("A value in x_new is above the interpolation range.")
+
+        response = self.get_response(wavelengths)
+        support = response > 0
+        weights = response * trapz_weights(wavelengths)
+        total = weights.sum(axis=1)
+
+        # Bands narrower than the spacing of wavelengths may not have
+        # any response at them, use the value interpolated to the centre.
+        narrow = numpy.flatnonzero(total <= 0)
+        if narrow.size > 0:
+            upper = numpy.searchsorted(wavelengths, self.centres[narrow], side="left")
+            upper = numpy.clip(upper, 1, wavelengths.size - 1)
+            lower = upper - 1
+            upper_weight = ((self.centres[narrow] - wavelengths[lower]) /
+                            (wavelengths[upper] - wavelengths[lower]))
+            weights[narrow] = 0
+            weights[narrow, lower] = 1 - upper_weight
+            weights[narrow, upper] += upper_weight
+            support[narrow, lower] = True
+            support[narrow, upper] = True
+            total[narrow] = 1
+
+        weights /= total[:, numpy.newaxis]
+        return weights, support
+
+
+def _srf_key(srf):
+    """
+    Get key for a list of SRFs based on their contents.
+    """
+    if not isinstance(srf, (list, tuple)):
+        srf = [srf]
+    return tuple((numpy.asarray(band.wavelengths).tobytes(),
+                  numpy.asarray(band.values).tobytes(),
+                  band.value_units) for band in srf)
+
+
+_operator_cache = collections.OrderedDict()
+_operator_cache_lock = threading.Lock()
+
+
+def get_sensor_operator(srf):
+    """
+    Get a SensorOperator for a single SRF or list of SRFs, reusing a
+    previous operator (and its cached weights) for the same SRFs.
+
+    Requires:
+
+    * srf - Spectra object or list of Spectra objects with value_units set
+            to "response".
+
+    Returns:
+
+    * SensorOperator
+
+    """
+    if isinstance(srf, SensorOperator):
+        return srf
+
+    key = _srf_key(srf)
+
+    with _operator_cache_lock:
+        if key in _operator_cache:
+            _operator_cache.move_to_end(key)
+            return _operator_cache[key]
+
+    operator = SensorOperator(srf)
+
+    with _operator_cache_lock:
+        operator = _operator_cache.setdefault(key, operator)
+        if len(_operator_cache) > MAX_CACHED_OPERATORS:
+            _operator_cache.popitem(last=False)
+
+    return operator
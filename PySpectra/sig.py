@@ -13,8 +13,136 @@
 import numpy
 import collections
 
+from . import spectra_collection
 from . import spectra_reader
 
+# Columns of data in sig files, after wavelength
+SIG_RADIANCE_CHANNELS = {"reference_radiance" : 1,
+                         "target_radiance" : 2}
+SIG_REFLECTANCE_COLUMN = 3
+
+# Methods for dealing with overlap between detectors
+OVERLAP_METHODS = ("drop", "keep_first", "keep_second", "blend")
+
+
+def get_overlap_weights(wavelengths, method="drop"):
+    """
+    Get indices and weights to merge the regions where detectors overlap.
+    These only depend on the wavelengths so can be calculated once and
+    applied to any number of spectra with the same detector layout.
+
+    A new detector starts wherever wavelengths decrease. At each join the
+    overlap is the region covered by both detectors, it is handled using
+    'method':
+
+    * drop - remove values from both detectors within the overlap.
+    * keep_first - keep values from the first detector, remove values from
+                   the second detector within the overlap.
+    * keep_second - keep values from the second detector, remove values from
+                    the first detector within the overlap.
+    * blend - use wavelengths from the second detector and a linear
+              cross-fade from the first detector (interpolated to these
+              wavelengths) to the second detector across the overlap.
+
+    Requires:
+
+    * wavelengths - numpy array of wavelengths
+    * method - method to use for overlap
+
+    Returns:
+
+    * indices - 3 x n_out numpy array of indices into wavelengths
+    * weights - 3 x n_out numpy array of weights. Merged values are the sum
+                of values at each index multiplied by weight.
+
+    """
+    if method not in OVERLAP_METHODS:
+        raise ValueError("Overlap method '{}' not recognised, must be one "
+                         "of: {}".format(method, ", ".join(OVERLAP_METHODS)))
+
+    wavelengths = numpy.asarray(wavelengths, dtype=numpy.float64)
+    n_wavelengths = wavelengths.size
+
+    keep = numpy.ones(n_wavelengths, dtype=bool)
+    indices = numpy.tile(numpy.arange(n_wavelengths), (3, 1))
+    weights = numpy.zeros((3, n_wavelengths))
+    weights[0] = 1
+
+    detector_starts = numpy.concatenate(([0],
+                                         numpy.flatnonzero(numpy.diff(wavelengths) < 0) + 1,
+                                         [n_wavelengths]))
+
+    for first_start, second_start, second_end in zip(detector_starts[:-2],
+                                                     detector_starts[1:-1],
+                                                     detector_starts[2:]):
+        first = numpy.arange(first_start, second_start)
+        second = numpy.arange(second_start, second_end)
+        overlap_start = wavelengths[second_start]
+        overlap_end = wavelengths[second_start - 1]
+
+        first_overlap = first[wavelengths[first] >= overlap_start]
+        second_overlap = second[wavelengths[second] <= overlap_end]
+
+        if method == "drop":
+            keep[first_overlap] = False
+            keep[second_overlap] = False
+        elif method == "keep_first":
+            keep[second_overlap] = False
+        elif method == "keep_second":
+            keep[first_overlap] = False
+        elif method == "blend":
+            keep[first_overlap] = False
+            overlap_wavelengths = wavelengths[second_overlap]
+            fade = ((overlap_wavelengths - overlap_start) /
+                    (overlap_end - overlap_start))
+
+            # Linear interpolation of first detector to wavelengths of second.
+            first_wavelengths = wavelengths[first]
+            upper = numpy.searchsorted(first_wavelengths, overlap_wavelengths)
+            upper = numpy.clip(upper, 1, first.size - 1)
+            lower = upper - 1
+            upper_weight = ((overlap_wavelengths - first_wavelengths[lower]) /
+                            (first_wavelengths[upper] - first_wavelengths[lower]))
+
+            weights[0, second_overlap] = fade
+            indices[1, second_overlap] = first[lower]
+            weights[1, second_overlap] = (1 - fade) * (1 - upper_weight)
+            indices[2, second_overlap] = first[upper]
+            weights[2, second_overlap] = (1 - fade) * upper_weight
+
+    return indices[:, keep], weights[:, keep]
+
+
+def merge_detector_overlap(wavelengths, values, method="drop"):
+    """
+    Merge the regions where detectors overlap for one or many spectra,
+    see 'get_overlap_weights' for the methods available.
+
+    Requires:
+
+    * wavelengths - numpy array of wavelengths (n_wavelengths)
+    * values - numpy array of values (n_wavelengths) or, for many spectra
+               with the same wavelengths, (n_spectra x n_wavelengths).
+    * method - method to use for overlap
+
+    Returns:
+
+    * wavelengths - numpy array of merged wavelengths
+    * values - numpy array of merged values
+
+    """
+    indices, weights = get_overlap_weights(wavelengths, method)
+    values = numpy.asarray(values)
+
+    merged_values = values[..., indices[0]] * weights[0].astype(values.dtype)
+    blended = numpy.flatnonzero(weights[0] != 1)
+    if blended.size > 0:
+        for term in (1, 2):
+            merged_values[..., blended] += (values[..., indices[term, blended]] *
+                                            weights[term, blended].astype(values.dtype))
+
+    return numpy.asarray(wavelengths)[indices[0]], merged_values
+
 
 class SigFormat(spectra_reader.SpectraReader):
     """
@@ -59,6 +187,9 @@ class SigFormat(spectra_reader.SpectraReader):
         """
         Reads HRDPA sig file into dictionary
 
+        Header lines (up to 'data=') are read line by line, the block of
+        numeric data after them is parsed in a single call.
+
         Requires:
 
         * filename - HRDPA file name, full path
@@ -70,7 +201,7 @@ class SigFormat(spectra_reader.SpectraReader):
         """
 
         sig_dict = collections.OrderedDict()
-        data_array = []
+        data_lines = []
 
         with open(filename, "r") as f:
             for line in f:
@@ -79,21 +210,101 @@ class SigFormat(spectra_reader.SpectraReader):
                     key = linesplit[0].strip()
                     value = linesplit[1].strip()
                     sig_dict[key] = value
+                    # Everything after 'data=' is data, read it in one go.
+                    if key == "data":
+                        break
                 elif line[0].isdigit():
-                    data_array.append(line[:-2].split("  "))
+                    data_lines.append(line)
+            data_lines.append(f.read())
+
+        data_text = "".join(data_lines)
 
-        data_array = numpy.asarray(data_array).astype(numpy.float32)
-        sig_dict["data"] = data_array
+        sig_dict["data"] = self.parse_sig_data(data_text)
 
         return sig_dict
 
-    def get_spectra(self, filename):
+    def parse_sig_data(self, data_text):
+        """
+        Parse the data block of a sig file, with one row per wavelength and
+        columns separated by whitespace.
+
+        Requires:
+
+        * data_text - string containing data
+
+        Returns:
+
+        * data_array - numpy array (rows x columns)
+
+        """
+        first_line = data_text.lstrip().split("\n", 1)[0]
+        n_columns = len(first_line.split())
+        if n_columns == 0:
+            return numpy.empty((0, 0), dtype=numpy.float32)
+
+        data_array = spectra_reader.parse_text_data(data_text, n_columns)
+
+        # If the data can't be parsed in one go (e.g., there are
+        # lines which aren't data) fall back to reading line by line.
+        if data_array is None:
+            data_array = [line.split() for line in data_text.splitlines()
+                          if line[:1].isdigit()]
+            data_array = numpy.asarray(data_array, dtype=numpy.float64)
+
+        return data_array.reshape((-1, n_columns)).astype(numpy.float32)
+
+    def remove_overlap(self, data):
+        """
+        Remove the overlap region at the last join between detectors, where
+        wavelengths decrease.
+
+        Values from the first detector with wavelengths greater than the
+        start of the second detector (and the value before them) are removed.
+
+        Requires:
+
+        * data - numpy array of sig data (rows x columns), wavelengths in
+                 the first column.
+
+        Returns:
+
+        * data - numpy array with overlap removed.
+
+        """
+        wavelengths = data[:, 0]
+
+        # Find overlap region
+        drops = numpy.flatnonzero(numpy.diff(wavelengths) < 0)
+
+        # If there isn't an overlap region then return all data
+        if drops.size == 0:
+            return data
+
+        point = drops[-1] + 1
+        points = numpy.flatnonzero(wavelengths[:point] > wavelengths[point])
+
+        keep = numpy.ones(wavelengths.size, dtype=bool)
+        keep[max(points[0] - 1, 0):points[-1] + 1] = False
+
+        return data[keep]
+
+    def get_spectra(self, filename, all_channels=False, overlap=None, **kwargs):
         """
         Extracts spectra from HRDPA sig file
 
         Requires:
 
         * filename - sig file
+        * all_channels - if True also return the reference and target radiance
+                         from the same read of the file. These are stored as
+                         numpy arrays, for the same wavelengths as the
+                         reflectance, in the 'additional_metadata' dictionary
+                         with the keys 'reference_radiance' and 'target_radiance'.
+        * overlap - method to use for overlap between detectors: 'drop',
+                    'keep_first', 'keep_second' or 'blend' (see
+                    'get_overlap_weights'). If not set (default) the overlap
+                    at the last join between detectors is removed using
+                    'remove_overlap'.
 
         Returns:
 
@@ -101,47 +312,91 @@ class SigFormat(spectra_reader.SpectraReader):
 
         """
 
+        spectra = spectra_reader.Spectra()
+
         # Get the ground truth data
         sig_dict = self.read_sig_to_dict(filename)
 
-        point = 0
+        if overlap is None:
+            data = self.remove_overlap(sig_dict["data"])
+        else:
+            wavelengths, channels = merge_detector_overlap(sig_dict["data"][:, 0],
+                                                           sig_dict["data"].T[1:],
+                                                           overlap)
+            data = numpy.column_stack((wavelengths, channels.T))
 
-        # Find overlap region
-        for x in range(len(sig_dict["data"].T[0]) - 1):
-            if sig_dict["data"].T[0][x + 1] < sig_dict["data"].T[0][x]:
-                point = x + 1
+        wavelengths = data[:, 0]
+        # Scale reflectance values between 0 - 1.
+        reflectance = data[:, SIG_REFLECTANCE_COLUMN] / 100.0
 
-        points = numpy.asarray(numpy.where(sig_dict["data"].T[0] > sig_dict["data"].T[0][point]))
+        lon = self.parse_sig_pos(sig_dict["longitude"], "longitude")
+        lat = self.parse_sig_pos(sig_dict["latitude"], "latitude")
 
-        # If there is an overlap region then remove it
-        if point > 0:
-            points = points[points < point]
+        spectra.file_name = filename
+        spectra.wavelengths = wavelengths
+        spectra.values = reflectance
+        spectra.pixel = None
+        spectra.line = None
+        spectra.latitude = lat
+        spectra.longitude = lon
+        spectra.wavelength_units = "nm"
+        spectra.value_units = "reflectance"
+        spectra.value_scaling = 1
 
-            wavelengths_reflectance = numpy.concatenate((sig_dict["data"].T[:, :points[0] - 1],
-                                                        sig_dict["data"].T[:, points[-1:] + 1:]),
-                                                        axis=1)
-        # If not then load all data
-        else:
-            wavelengths_reflectance = sig_dict["data"].T
+        if all_channels:
+            for channel, column in SIG_RADIANCE_CHANNELS.items():
+                spectra.additional_metadata[channel] = data[:, column]
 
-        wavelengths_reflectance = numpy.delete(wavelengths_reflectance, ([1, 2]), axis=0)
+        return spectra
 
-        wavelengths = wavelengths_reflectance[0]
-        # Scale reflectance values between 0 - 1.
-        reflectance = wavelengths_reflectance[1] / 100.0
+    def get_spectra_collection(self, filenames, overlap=None):
+        """
+        Extracts spectra from many HRDPA sig files with the same wavelengths
+        (detector layout). The overlap between detectors is merged for all
+        spectra in one operation.
 
-        lon = self.parse_sig_pos(sig_dict["longitude"], "longitude")
-        lat = self.parse_sig_pos(sig_dict["latitude"], "latitude")
+        Requires:
 
-        self.spectra.file_name = filename
-        self.spectra.wavelengths = wavelengths
-        self.spectra.values = reflectance
-        self.spectra.pixel = None
-        self.spectra.line = None
-        self.spectra.latitude = lat
-        self.spectra.longitude = lon
-        self.spectra.wavelength_units = "nm"
-        self.spectra.value_units = "reflectance"
-        self.spectra.value_scaling = 1
-
-        return self.spectra
+        * filenames - list of sig files
+        * overlap - method to use for overlap between detectors (see
+                    'get_spectra').
+
+        Returns:
+
+        * SpectraCollection object with a row for each file
+
+        """
+        sig_dicts = [self.read_sig_to_dict(filename) for filename in filenames]
+        if len(sig_dicts) == 0:
+            raise ValueError("Need at least one file to read")
+
+        wavelengths = sig_dicts[0]["data"][:, 0]
+        for filename, sig_dict in zip(filenames, sig_dicts):
+            if not numpy.array_equal(sig_dict["data"][:, 0], wavelengths):
+                raise ValueError("Wavelengths in {} are different to "
+                                 "{}".format(filename, filenames[0]))
+
+        # Scale reflectance values between 0 - 1.
+        reflectance = numpy.vstack([sig_dict["data"][:, SIG_REFLECTANCE_COLUMN]
+                                    for sig_dict in sig_dicts]) / 100.0
+
+        if overlap is None:
+            data = self.remove_overlap(numpy.column_stack((wavelengths,
+                                                           reflectance.T)))
+            wavelengths = data[:, 0]
+            reflectance = data[:, 1:].T
+        else:
+            wavelengths, reflectance = merge_detector_overlap(wavelengths,
+                                                              reflectance,
+                                                              overlap)
+
+        collection = spectra_collection.SpectraCollection(
+            wavelengths, reflectance,
+            wavelength_units="nm", value_units="reflectance",
+            file_name=list(filenames),
+            latitude=[self.parse_sig_pos(sig_dict["latitude"], "latitude")
+                      for sig_dict in sig_dicts],
+            longitude=[self.parse_sig_pos(sig_dict["longitude"], "longitude")
+                       for sig_dict in sig_dicts])
+
+        return collection
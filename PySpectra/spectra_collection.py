@@ -0,0 +1,327 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# This file has been created by Plymouth Marine Laboratory and
+# is licensed under the MIT Licence. A copy of this
+# licence is available to download with this file.
+#
+# Created: 2026-10-18
+
+"""
+Container for many spectra sharing the same wavelengths.
+"""
+import numpy
+
+from . import sensor_operator
+from .spectra_reader import Spectra
+
+# Per-spectrum attributes stored as arrays, with the numpy type used and
+# the value used when the attribute isn't available.
+COLUMNS = (("file_name", object, None),
+           ("name", object, None),
+           ("pixel", numpy.int64, -1),
+           ("line", numpy.int64, -1),
+           ("latitude", numpy.float64, numpy.nan),
+           ("longitude", numpy.float64, numpy.nan),
+           ("time", object, None),
+           ("integration_time", numpy.float64, numpy.nan),
+           ("n_scans_average", numpy.int64, 0))
+
+
+def interpolation_indices(new_wavelengths, wavelengths):
+    """
+    Get indices and weights to linearly interpolate values from 'wavelengths'
+    to 'new_wavelengths', matching numpy.interp. Wavelengths must be
+    increasing.
+
+    Values at new_wavelengths are then:
+
+    values[..., lower] * (1 - weight) + values[..., lower + 1] * weight
+
+    Requires:
+
+    * new_wavelengths - numpy array of wavelengths to interpolate to
+    * wavelengths - numpy array of current wavelengths
+
+    Returns:
+
+    * lower - index of wavelength below each new wavelength
+    * weight - weight given to the wavelength above
+
+    """
+    new_wavelengths = numpy.asarray(new_wavelengths, dtype=numpy.float64)
+    wavelengths = numpy.asarray(wavelengths, dtype=numpy.float64)
+
+    if wavelengths.size == 1:
+        return (numpy.zeros(new_wavelengths.shape, dtype=numpy.intp),
+                numpy.zeros(new_wavelengths.shape))
+
+    lower = numpy.searchsorted(wavelengths, new_wavelengths, side="right") - 1
+    lower = numpy.clip(lower, 0, wavelengths.size - 2)
+    weight = ((new_wavelengths - wavelengths[lower]) /
+              (wavelengths[lower + 1] - wavelengths[lower]))
+    # Outside the range of wavelengths use the first / last value
+    weight = numpy.clip(weight, 0, 1)
+
+    return lower, weight
+
+
+class SpectraCollection(object):
+    """
+    Class to store many spectra with the same wavelengths
+    and associated attributes
+
+    * wavelengths - Numpy array containing wavelengths (n_bands)
+    * values - 2D Numpy array containing values (n_spectra x n_bands)
+    * file_name - Numpy array with name of file each spectrum was extracted from
+    * name - Numpy array with name of each spectrum (None if not available)
+    * pixel - Numpy array of pixels (-1 if spectra not extracted from image)
+    * line - Numpy array of lines (-1 if spectra not extracted from image)
+    * latitude - Numpy array of latitudes (NaN if not available)
+    * longitude - Numpy array of longitudes (NaN if not available)
+    * time - Numpy array of acquisition times as datetime objects (None if not available)
+    * integration_time - Numpy array of integration times in seconds (NaN if not available)
+    * n_scans_average - Numpy array of number of scans averaged over (0 if not available)
+    * wavelength_units - units of wavelengths (e.g., 'nm' or 'um')
+    * value_units - type of values (typically reflectance)
+    * value_scaling - scaling applied to values
+
+    """
+    def __init__(self, wavelengths=None, values=None,
+                 wavelength_units="", value_units="", **kwargs):
+        self.wavelengths = wavelengths
+        if values is not None:
+            values = numpy.atleast_2d(values)
+        self.values = values
+        self.wavelength_units = wavelength_units
+        self.value_units = value_units
+        self.value_scaling = 1
+
+        n_spectra = 0 if values is None else values.shape[0]
+
+        for name, dtype, missing in COLUMNS:
+            column = kwargs.pop(name, None)
+            if column is None:
+                column = numpy.full(n_spectra, missing, dtype=dtype)
+            else:
+                column = numpy.asarray(column, dtype=dtype)
+                if column.shape != (n_spectra,):
+                    raise ValueError("Expected {} values for '{}', "
+                                     "got {}".format(n_spectra, name,
+                                                     column.shape))
+            setattr(self, name, column)
+
+        if len(kwargs) > 0:
+            raise TypeError("Unexpected keyword arguments: "
+                            "{}".format(", ".join(kwargs)))
+
+    @classmethod
+    def from_spectra(cls, spectra_list, wavelengths=None):
+        """
+        Create a collection from a list of Spectra objects.
+
+        Requires:
+
+        * spectra_list - list of Spectra objects
+        * wavelengths - wavelengths for the collection (optional). If provided
+                        spectra are resampled to these wavelengths, if not
+                        all spectra must have the same wavelengths.
+
+        Returns:
+
+        * SpectraCollection
+
+        """
+        spectra_list = list(spectra_list)
+        if len(spectra_list) == 0:
+            raise ValueError("Need at least one spectrum to create a collection")
+
+        first = spectra_list[0]
+        if wavelengths is None:
+            wavelengths = first.wavelengths
+            for s in spectra_list[1:]:
+                if not numpy.array_equal(s.wavelengths, wavelengths):
+                    raise ValueError("Spectra have different wavelengths, "
+                                     "provide 'wavelengths' to resample to")
+            values = numpy.vstack([s.values for s in spectra_list])
+        else:
+            values = numpy.vstack([numpy.interp(wavelengths, s.wavelengths,
+                                                s.values)
+                                   for s in spectra_list])
+
+        columns = {}
+        for name, dtype, missing in COLUMNS:
+            column = [getattr(s, name, None) for s in spectra_list]
+            columns[name] = [missing if v is None else v for v in column]
+
+        collection = cls(wavelengths, values,
+                         wavelength_units=first.wavelength_units,
+                         value_units=first.value_units, **columns)
+        collection.value_scaling = first.value_scaling
+
+        return collection
+
+    @classmethod
+    def concatenate(cls, collections):
+        """
+        Join collections with the same wavelengths into a single collection.
+
+        Requires:
+
+        * collections - list of SpectraCollection objects
+
+        Returns:
+
+        * SpectraCollection
+
+        """
+        collections = list(collections)
+        if len(collections) == 0:
+            raise ValueError("Need at least one collection to concatenate")
+
+        first = collections[0]
+        for collection in collections[1:]:
+            if not numpy.array_equal(collection.wavelengths, first.wavelengths):
+                raise ValueError("Collections have different wavelengths, "
+                                 "resample using 'resample_wavelengths' first")
+
+        columns = dict((name, numpy.concatenate([getattr(c, name)
+                                                 for c in collections]))
+                       for name, _, _ in COLUMNS)
+        collection = cls(first.wavelengths,
+                         numpy.vstack([c.values for c in collections]),
+                         wavelength_units=first.wavelength_units,
+                         value_units=first.value_units, **columns)
+        collection.value_scaling = first.value_scaling
+
+        return collection
+
+    def __len__(self):
+        if self.values is None:
+            return 0
+        return self.values.shape[0]
+
+    def __getitem__(self, index):
+        """
+        Get a single spectrum as a Spectra object if 'index' is an integer,
+        or a new SpectraCollection if 'index' is a slice, list or array.
+        """
+        if isinstance(index, (int, numpy.integer)):
+            return self._get_spectra(index)
+
+        columns = dict((name, getattr(self, name)[index])
+                       for name, _, _ in COLUMNS)
+        collection = SpectraCollection(self.wavelengths, self.values[index],
+                                       wavelength_units=self.wavelength_units,
+                                       value_units=self.value_units,
+                                       **columns)
+        collection.value_scaling = self.value_scaling
+        return collection
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._get_spectra(i)
+
+    def _get_spectra(self, index):
+        """
+        Get spectrum at 'index' as a Spectra object.
+        """
+        spectra = Spectra(wavelengths=self.wavelengths,
+                          values=self.values[index],
+                          wavelength_units=self.wavelength_units,
+                          value_units=self.value_units)
+        spectra.value_scaling = self.value_scaling
+
+        for name, dtype, missing in COLUMNS:
+            value = getattr(self, name)[index]
+            if dtype is numpy.float64:
+                value = None if numpy.isnan(value) else float(value)
+            elif dtype is numpy.int64:
+                value = None if value == missing else int(value)
+            setattr(spectra, name, value)
+
+        return spectra
+
+    def copy(self):
+        """
+        Get a copy of the collection, with copies of all arrays.
+        """
+        columns = dict((name, getattr(self, name).copy())
+                       for name, _, _ in COLUMNS)
+        collection = SpectraCollection(numpy.array(self.wavelengths),
+                                       numpy.array(self.values),
+                                       wavelength_units=self.wavelength_units,
+                                       value_units=self.value_units,
+                                       **columns)
+        collection.value_scaling = self.value_scaling
+        return collection
+
+    def to_spectra(self):
+        """
+        Get all spectra in the collection as a list of Spectra objects.
+        """
+        return list(self)
+
+    def plot(self, labels=None, **kwargs):
+        """Produces a basic plot of all spectra
+
+        Requires matplotlib to be installed
+
+        """
+        from matplotlib.pyplot import plot, xlabel, ylabel
+
+        if labels is None:
+            labels = self.file_name
+
+        lines = plot(self.wavelengths, self.values.T, **kwargs)
+        for plot_line, label in zip(lines, labels):
+            plot_line.set_label(label)
+        xlabel("Wavelength (%s)" % self.wavelength_units)
+        ylabel(self.value_units)
+
+    def resample_wavelengths(self, new_wavelengths):
+        """
+        Resample wavelengths of all spectra to match 'new_wavelengths'.
+
+        Replaces existing wavelengths with provided wavelengths and values with
+        those interpolated using new wavelengths.
+
+        Requires:
+
+        * new_wavelengths - numpy array containing new wavelengths
+
+        """
+        lower, weight = interpolation_indices(new_wavelengths, self.wavelengths)
+        upper = numpy.minimum(lower + 1, self.wavelengths.size - 1)
+
+        # Only use values with a non-zero weight, so missing values (NaN)
+        # next to a wavelength aren't spread to it, matching numpy.interp.
+        self.values = (numpy.where(weight < 1, self.values[:, lower] * (1 - weight), 0) +
+                       numpy.where(weight > 0, self.values[:, upper] * weight, 0))
+        self.wavelengths = new_wavelengths
+
+    def convolve(self, srf):
+        """Convolve all spectra with a Spectral Response Function.
+
+        Same as 'Spectra.convolve' but for every spectrum in the collection,
+        using a single matrix product.
+
+        Requires:
+
+        * srf - Spectral Response Function to convolve to. This should be either
+        a single Spectra object with the value_units attribute set to "response",
+        a list of such objects or a SensorOperator.
+
+        Returns:
+
+        * Numpy array with a value for each spectrum (single SRF) or a 2D array
+          of size n_spectra x n_bands (list of SRFs or SensorOperator).
+
+        """
+        operator = sensor_operator.get_sensor_operator(srf)
+        result = operator.apply(self.wavelengths, self.values)
+
+        if isinstance(srf, (list, sensor_operator.SensorOperator)):
+            return result
+        else:
+            return result[:, 0]
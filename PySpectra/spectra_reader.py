@@ -12,8 +12,7 @@ import datetime
 
 import numpy
 
-from scipy.interpolate import interp1d
-from scipy.integrate import trapz
+from . import sensor_operator
 
 # Set up a dictionary of time zone codes we use and offsets to UTC
 # Use this to replace time zone with an offset which can be parsed by datetime
@@ -22,12 +21,60 @@ TIME_ZONE_DICT = {"BST" : "+0100",
                   "GMT" : "+0000",
                   "IST" : "+0530"}
 
+
+def parse_text_data(data_text, n_columns=None):
+    """
+    Parse whitespace separated numbers, with a row on each line, into a
+    2D numpy array using a single conversion of all values.
+
+    Every non-empty line must have 'n_columns' values, so values are never
+    moved into the wrong row.
+
+    Requires:
+
+    * data_text - string containing data
+    * n_columns - number of columns (optional). If not provided the number
+                  of values on the first non-empty line is used.
+
+    Returns:
+
+    * numpy array (rows x columns), or None if the data can't be parsed
+      this way (e.g., values which aren't numbers or rows with a different
+      number of columns) so a slower parser should be used.
+
+    """
+    values = []
+    n_rows = 0
+    for line in data_text.splitlines():
+        line_values = line.split()
+        if not line_values:
+            continue
+        if n_columns is None:
+            n_columns = len(line_values)
+        if len(line_values) != n_columns:
+            return None
+        values.extend(line_values)
+        n_rows += 1
+
+    if n_columns is None:
+        n_columns = 0
+    if n_rows == 0 or n_columns == 0:
+        return numpy.empty((n_rows, n_columns))
+
+    try:
+        data = numpy.array(values, dtype=float)
+    except ValueError:
+        return None
+    return data.reshape((n_rows, n_columns))
+
+
 class Spectra(object):
     """
     Class to store spectra
     and associated attributes
 
     * file_name - Name of file spectra was extracted from
+    * name - Name of spectra within file (e.g., for spectral libraries)
     * wavelengths - Numpy array containing wavelengths
     * values - Numpy array containing value for each wavelength
     * pixel - Pixel (if spectra extracted from image)
@@ -45,6 +92,7 @@ class Spectra(object):
     def __init__(self, wavelengths=None, values=None,
                  wavelength_units="", value_units=""):
         self.file_name = None
+        self.name = None
         self.wavelengths = wavelengths
         self.values = values
         self.pixel = None
@@ -90,20 +138,6 @@ class Spectra(object):
 
         return time_diff.total_seconds()
 
-    def _convolve(self, srf):
-        """Actually does the convolution as specified in the 'convolve' function."""
-        if srf.value_units != "response":
-            raise ValueError('SRF must be a Spectra instance with value_units set to "response"')
-
-        # Interpolate to required wavelengths
-        f = interp1d(self.wavelengths, self.values)
-        at_srf_wavelengths = f(srf.wavelengths)
-
-        result = trapz(srf.values * at_srf_wavelengths,
-                       srf.wavelengths) / trapz(srf.values, srf.wavelengths)
-
-        return result
-
     def resample_wavelengths(self, new_wavelengths):
         """
         Resample wavelengths in spectral object to match 'new_wavelengths'.
@@ -134,10 +168,19 @@ class Spectra(object):
 
         * srf - Spectral Response Function to convolve to. This should be either
         a single Spectra object with the value_units attribute set to "response",
-        or a list of such objects.
+        a list of such objects or a SensorOperator.
+
+        Returns:
+
+        * Value for a single SRF, list of values for a list of SRFs or a numpy
+          array of values for a SensorOperator.
+
+        The weights used for the convolution are calculated once for each set
+        of SRFs and wavelengths and reused in subsequent calls.
 
         Pre-configured Spectra objects for the SRFs of various common sensors are
-        available in the `srf` module of this package.
+        available in the `srf` module of this package. For sensors described by
+        band centres and FWHM use `sensor_operator.SyntheticSensorOperator`.
 
         Example:
 
@@ -154,22 +197,26 @@ class Spectra(object):
         s.convolve(LANDSAT_OLI)
 
         """
-        if isinstance(srf, list):
-            result = [self._convolve(s) for s in srf]
-        else:
-            result = self._convolve(srf)
+        operator = sensor_operator.get_sensor_operator(srf)
+        result = operator.apply(self.wavelengths, self.values)
 
-        return result
+        if isinstance(srf, sensor_operator.SensorOperator):
+            return result
+        elif isinstance(srf, list):
+            return list(result)
+        else:
+            return result[0]
 
 
 class SpectraReader(object):
 
     """
     Abstract class for spectra
-    """
 
-    def __init__(self):
-        self.spectra = Spectra()
+    Readers don't store any state between calls, each call to 'get_spectra'
+    returns a new Spectra object, so a single reader can be reused and
+    shared between threads.
+    """
 
     def get_spectra(self, filename):
         pass
@@ -1,474 +1,276 @@
-from numpy import array
+"""
+Spectral Response Functions (SRFs) of sensors.
 
+SRFs are stored as CSV files in the 'srf_data' directory, with a column of
+wavelengths and a column of response for each band, and are only loaded
+when first requested:
+
+from PySpectra import srf
+print(srf.list_sensors())
+landsat = srf.get_sensor("LANDSAT_OLI")
+
+Sensors and bands are also available as attributes for compatibility,
+e.g., srf.LANDSAT_OLI and srf.LANDSAT_OLI_B1.
+
+Other SRFs can be added from a CSV file, an ENVI spectral library or a list
+of Spectra objects using 'register_sensor' and removed using
+'unregister_sensor'.
+"""
+import os
+import re
+import threading
+
+import numpy
+
+from . import ascii_format
 from .spectra_reader import Spectra
 
+SRF_DATA_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  "srf_data")
+
+# Sources for sensors added using 'register_sensor' (file names or lists of
+# Spectra objects) and sensors which have been loaded.
+_sources = {}
+_sensors = {}
+_lock = threading.Lock()
+
+
+def _get_units(column_name, default):
+    """
+    Get units from a column name such as 'wavelength (um)'.
+    """
+    match = re.search(r"\((.*)\)", column_name)
+    if match is None:
+        return default
+    return match.group(1).strip()
+
+
+def load_srf_csv(filename, wavelength_units="um"):
+    """
+    Load SRFs from a CSV file with a column of wavelengths and a column of
+    response for each band, with band names in the header. Lines starting
+    with '#' before the header are skipped. Empty values are used for
+    wavelengths outside a band.
+
+    For example:
+
+    wavelength (um),B1,B2
+    0.4,0.1,
+    0.41,1.0,0.2
+    0.42,0.2,1.0
+    0.43,,0.1
+
+    Requires:
+
+    * filename - CSV file
+    * wavelength_units - units of wavelengths if not given in the header
+                         (e.g., 'wavelength (nm)').
+
+    Returns:
+
+    * List of Spectra objects with value_units set to "response", one for
+      each band with name set to the band name.
+
+    """
+    n_header_lines = 0
+    with open(filename, "r") as f:
+        for line in f:
+            n_header_lines += 1
+            if not line.startswith("#"):
+                column_names = [name.strip() for name in line.split(",")]
+                break
+        else:
+            raise ValueError("No header found in {}".format(filename))
+
+    wavelength_units = _get_units(column_names[0], wavelength_units)
+    data = ascii_format.read_text_data(filename, delimiter=",",
+                                       skip_header=n_header_lines)
+
+    bands = []
+    for i, name in enumerate(column_names[1:], 1):
+        valid = ~numpy.isnan(data[:, i])
+        band = Spectra(wavelengths=data[valid, 0], values=data[valid, i],
+                       wavelength_units=wavelength_units,
+                       value_units="response")
+        band.name = name
+        bands.append(band)
+
+    return bands
+
+
+def load_srf_envi(filename):
+    """
+    Load SRFs from an ENVI spectral library with a spectrum for the
+    response of each band. Wavelengths where the response is 0 at the start
+    and end of each band are removed, so spectra only need to cover the
+    range of the band to be convolved.
+
+    Requires:
+
+    * filename - ENVI spectral library (.sli)
+
+    Returns:
+
+    * List of Spectra objects with value_units set to "response", one for
+      each band with name set to the spectra name.
+
+    """
+    from . import envi
+
+    collection = envi.ENVIFormat().get_all_spectra(filename)
+    bands = []
+    for name, values in zip(collection.name, collection.values):
+        non_zero = numpy.flatnonzero(values)
+        if non_zero.size == 0:
+            raise ValueError("Response for '{}' in {} is all "
+                             "zero".format(name, filename))
+        # Keep a zero either side of the response
+        start = max(non_zero[0] - 1, 0)
+        end = min(non_zero[-1] + 2, values.size)
+        band = Spectra(wavelengths=numpy.array(collection.wavelengths[start:end]),
+                       values=numpy.array(values[start:end]),
+                       wavelength_units=collection.wavelength_units,
+                       value_units="response")
+        band.name = name
+        bands.append(band)
+
+    return bands
+
+
+def register_sensor(name, srf, **kwargs):
+    """
+    Register SRFs for a sensor, so they can be loaded using 'get_sensor'.
+
+    Requires:
+
+    * name - name of sensor (e.g., 'MY_SENSOR'), case insensitive.
+    * srf - CSV file (see 'load_srf_csv'), ENVI spectral library (.sli) or
+            a list of Spectra objects with value_units set to "response".
+    * kwargs - keyword arguments for 'load_srf_csv' (e.g., wavelength_units)
+
+    Files are only read when the sensor is first requested.
+
+    """
+    if not isinstance(srf, str):
+        srf = list(srf)
+        for band in srf:
+            if band.value_units != "response":
+                raise ValueError('SRF must be a Spectra instance with '
+                                 'value_units set to "response"')
+    name = name.upper()
+    with _lock:
+        _sources[name] = (srf, kwargs)
+        _sensors.pop(name, None)
+
+
+def unregister_sensor(name):
+    """
+    Remove a sensor added using 'register_sensor'. Packaged sensors
+    can't be removed but are reloaded from file next time they are
+    requested.
+
+    Requires:
+
+    * name - name of sensor, case insensitive.
+
+    """
+    name = name.upper()
+    with _lock:
+        _sources.pop(name, None)
+        _sensors.pop(name, None)
+
+
+def _get_packaged_sensors():
+    """
+    Get dictionary of sensors in SRF_DATA_DIRECTORY, with the file for each.
+    """
+    sensors = {}
+    for file_name in os.listdir(SRF_DATA_DIRECTORY):
+        sensor, extension = os.path.splitext(file_name)
+        if extension.lower() == ".csv":
+            sensors[sensor.upper()] = os.path.join(SRF_DATA_DIRECTORY, file_name)
+    return sensors
+
+
+def list_sensors():
+    """
+    Get names of all sensors available, packaged with PySpectra or added
+    using 'register_sensor'.
+    """
+    with _lock:
+        registered = list(_sources)
+    return sorted(set(_get_packaged_sensors()) | set(registered))
+
+
+def get_sensor(name):
+    """
+    Get SRFs for a sensor. The SRFs are loaded the first time they are
+    requested and cached.
+
+    Requires:
+
+    * name - name of sensor (e.g., 'LANDSAT_OLI'), case insensitive. See
+             'list_sensors' for available sensors.
+
+    Returns:
+
+    * List of Spectra objects, one for each band.
+
+    """
+    name = name.upper()
+    with _lock:
+        if name in _sensors:
+            return list(_sensors[name])
+        source = _sources.get(name)
+
+    if source is None:
+        packaged = _get_packaged_sensors()
+        if name not in packaged:
+            raise KeyError("Sensor '{}' not found. Available sensors are: "
+                           "{}".format(name, ", ".join(list_sensors())))
+        source = (packaged[name], {})
+
+    srf, kwargs = source
+    if not isinstance(srf, str):
+        bands = srf
+    elif os.path.splitext(srf)[-1].lower() == ".sli":
+        bands = load_srf_envi(srf)
+    else:
+        bands = load_srf_csv(srf, **kwargs)
+
+    with _lock:
+        bands = _sensors.setdefault(name, bands)
+    return list(bands)
+
+
+def get_band(name, band):
+    """
+    Get the SRF for a single band of a sensor.
+
+    Requires:
+
+    * name - name of sensor (e.g., 'LANDSAT_OLI')
+    * band - name of band (e.g., 'B1')
+
+    Returns:
+
+    * Spectra object
+
+    """
+    for srf in get_sensor(name):
+        if srf.name == band:
+            return srf
+    raise KeyError("Band '{}' not found for sensor '{}'".format(band, name))
+
 
-# Landsat OLI
-# Taken from spreadsheet downloadable from http://landsat.gsfc.nasa.gov/?p=5779
-# Interpolated to 2.5nm intervals, as required by 6S
-
-LANDSAT_OLI_B1 = Spectra(wavelengths=array([0.427,  0.4295,  0.432,  0.4345,  0.437,  0.4395,  0.442,
-                                            0.4445,  0.447,  0.4495,  0.452,  0.4545,  0.457]),
-                         values=array([7.30000000e-05,   2.52450000e-03,   2.47670000e-02,
-                                       3.85985000e-01,   9.08749000e-01,   9.80591500e-01,
-                                       9.86713000e-01,   9.96568500e-01,   9.82780000e-01,
-                                       8.25707000e-01,   2.26412000e-01,   2.55700000e-02,
-                                       2.41400000e-03]),
-                         wavelength_units='um', value_units='response')
-
-LANDSAT_OLI_B2 = Spectra(wavelengths=array([0.436,  0.4385,  0.441,  0.4435,  0.446,  0.4485,  0.451,
-                                            0.4535,  0.456,  0.4585,  0.461,  0.4635,  0.466,  0.4685,
-                                            0.471,  0.4735,  0.476,  0.4785,  0.481,  0.4835,  0.486,
-                                            0.4885,  0.491,  0.4935,  0.496,  0.4985,  0.501,  0.5035,
-                                            0.506,  0.5085,  0.511,  0.5135,  0.516,  0.5185,  0.521,
-                                            0.5235,  0.526]),
-                         values=array([1.00000000e-05,   1.79000000e-04,   4.55000000e-04,
-                                       1.63350000e-03,   6.86900000e-03,   4.28880000e-02,
-                                       2.71370000e-01,   7.90740500e-01,   9.03034000e-01,
-                                       9.04677500e-01,   8.89667000e-01,   8.79232000e-01,
-                                       8.79688000e-01,   8.89796500e-01,   8.48533000e-01,
-                                       8.36270500e-01,   8.68497000e-01,   9.11461500e-01,
-                                       9.31726000e-01,   9.54896500e-01,   9.56424000e-01,
-                                       9.83834000e-01,   9.89469000e-01,   9.68066500e-01,
-                                       9.88729000e-01,   9.61057500e-01,   9.66125000e-01,
-                                       9.82077000e-01,   9.63135000e-01,   9.98249000e-01,
-                                       8.44893000e-01,   1.19533500e-01,   5.32800000e-03,
-                                       1.32850000e-03,   5.16000000e-04,   1.17000000e-04,
-                                       2.30000000e-05]),
-                         wavelength_units='um', value_units='response')
-
-LANDSAT_OLI_B3 = Spectra(wavelengths=array([0.512,  0.5145,  0.517,  0.5195,  0.522,  0.5245,  0.527,
-                                            0.5295,  0.532,  0.5345,  0.537,  0.5395,  0.542,  0.5445,
-                                            0.547,  0.5495,  0.552,  0.5545,  0.557,  0.5595,  0.562,
-                                            0.5645,  0.567,  0.5695,  0.572,  0.5745,  0.577,  0.5795,
-                                            0.582,  0.5845,  0.587,  0.5895,  0.592,  0.5945,  0.597,
-                                            0.5995,  0.602,  0.6045,  0.607,  0.6095]),
-                         values=array([-4.60000000e-05,   1.78500000e-04,   6.48000000e-04,
-                                       1.57400000e-03,   3.44600000e-03,   8.73250000e-03,
-                                       2.55130000e-02,   9.69975000e-02,   3.53885000e-01,
-                                       8.03215000e-01,   9.54627000e-01,   9.60271500e-01,
-                                       9.69873000e-01,   9.69833500e-01,   9.77001000e-01,
-                                       9.95392000e-01,   9.82642000e-01,   9.71423000e-01,
-                                       9.46245000e-01,   9.62786000e-01,   9.66447000e-01,
-                                       9.64176500e-01,   9.83397000e-01,   9.70875500e-01,
-                                       9.78208000e-01,   9.77182500e-01,   9.69181000e-01,
-                                       9.81277000e-01,   9.68886000e-01,   9.80432000e-01,
-                                       9.04478000e-01,   6.05139000e-01,   1.90467000e-01,
-                                       2.47350000e-02,   2.57400000e-03,   2.39500000e-04,
-                                       0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                       0.00000000e+00]),
-                         wavelength_units='um', value_units='response')
-
-LANDSAT_OLI_B4 = Spectra(wavelengths=array([0.625,  0.6275,  0.63,  0.6325,  0.635,  0.6375,  0.64,
-                                            0.6425,  0.645,  0.6475,  0.65,  0.6525,  0.655,  0.6575,
-                                            0.66,  0.6625,  0.665,  0.6675,  0.67,  0.6725,  0.675,
-                                            0.6775,  0.68,  0.6825,  0.685,  0.6875]),
-                         values=array([-3.42000000e-04,   1.37250000e-03,   7.19700000e-03,
-                                       4.86465000e-02,   2.99778000e-01,   8.34958000e-01,
-                                       9.50823000e-01,   9.57268000e-01,   9.84173000e-01,
-                                       9.83172500e-01,   9.59441000e-01,   9.54442500e-01,
-                                       9.81688000e-01,   9.88501500e-01,   9.76960000e-01,
-                                       9.88942000e-01,   9.80678000e-01,   9.66466000e-01,
-                                       9.66928000e-01,   7.29107000e-01,   1.23946000e-01,
-                                       1.25175000e-02,   1.40200000e-03,   0.00000000e+00,
-                                       0.00000000e+00,   0.00000000e+00]),
-                         wavelength_units='um', value_units='response')
-
-LANDSAT_OLI_B5 = Spectra(wavelengths=array([0.829,  0.8315,  0.834,  0.8365,  0.839,  0.8415,  0.844,
-                                            0.8465,  0.849,  0.8515,  0.854,  0.8565,  0.859,  0.8615,
-                                            0.864,  0.8665,  0.869,  0.8715,  0.874,  0.8765,  0.879,
-                                            0.8815,  0.884,  0.8865,  0.889,  0.8915,  0.894,  0.8965,
-                                            0.899]),
-                         values=array([0.00000000e+00,   7.50000000e-05,   3.14000000e-04,
-                                       8.52500000e-04,   2.10700000e-03,   5.90150000e-03,
-                                       1.73460000e-02,   6.62770000e-02,   2.49733000e-01,
-                                       6.63830000e-01,   9.60215000e-01,   9.76869500e-01,
-                                       1.00000000e+00,   9.78334000e-01,   9.57357000e-01,
-                                       9.50103000e-01,   9.48450000e-01,   9.53355500e-01,
-                                       9.69821000e-01,   8.39899500e-01,   4.48364000e-01,
-                                       1.37481000e-01,   3.45320000e-02,   1.00205000e-02,
-                                       2.94400000e-03,   9.67500000e-04,   2.41000000e-04,
-                                       1.55000000e-05,   0.00000000e+00]),
-                         wavelength_units='um', value_units='response')
-
-LANDSAT_OLI_B6 = Spectra(wavelengths=array([1.515,  1.5175,  1.52,  1.5225,  1.525,  1.5275,  1.53,
-                                            1.5325,  1.535,  1.5375,  1.54,  1.5425,  1.545,  1.5475,
-                                            1.55,  1.5525,  1.555,  1.5575,  1.56,  1.5625,  1.565,
-                                            1.5675,  1.57,  1.5725,  1.575,  1.5775,  1.58,  1.5825,
-                                            1.585,  1.5875,  1.59,  1.5925,  1.595,  1.5975,  1.6,
-                                            1.6025,  1.605,  1.6075,  1.61,  1.6125,  1.615,  1.6175,
-                                            1.62,  1.6225,  1.625,  1.6275,  1.63,  1.6325,  1.635,
-                                            1.6375,  1.64,  1.6425,  1.645,  1.6475,  1.65,  1.6525,
-                                            1.655,  1.6575,  1.66,  1.6625,  1.665,  1.6675,  1.67,
-                                            1.6725,  1.675,  1.6775,  1.68,  1.6825,  1.685,  1.6875,
-                                            1.69,  1.6925,  1.695]),
-                         values=array([0.00000000e+00,   2.00000000e-04,   4.66000000e-04,
-                                       8.45000000e-04,   1.36900000e-03,   2.01550000e-03,
-                                       2.88100000e-03,   4.02150000e-03,   5.52800000e-03,
-                                       7.88900000e-03,   1.09890000e-02,   1.52755000e-02,
-                                       2.18310000e-02,   3.25615000e-02,   4.78640000e-02,
-                                       7.09490000e-02,   1.01893000e-01,   1.50884500e-01,
-                                       2.20261000e-01,   3.10649000e-01,   4.21470000e-01,
-                                       5.52234000e-01,   6.76683000e-01,   7.71509000e-01,
-                                       8.54065000e-01,   8.95823500e-01,   9.13009000e-01,
-                                       9.25058000e-01,   9.26413000e-01,   9.23818000e-01,
-                                       9.22828000e-01,   9.22408500e-01,   9.26605000e-01,
-                                       9.43438000e-01,   9.46175000e-01,   9.47297500e-01,
-                                       9.52859000e-01,   9.51358500e-01,   9.59047000e-01,
-                                       9.59191500e-01,   9.61470000e-01,   9.60494000e-01,
-                                       9.64703000e-01,   9.69951500e-01,   9.76906000e-01,
-                                       9.81271500e-01,   9.88609000e-01,   9.99010500e-01,
-                                       9.99642000e-01,   9.89828000e-01,   9.67125000e-01,
-                                       9.26719000e-01,   8.40967000e-01,   7.23103000e-01,
-                                       5.73232000e-01,   4.22998000e-01,   2.91752000e-01,
-                                       1.95988000e-01,   1.28463000e-01,   8.28380000e-02,
-                                       5.27520000e-02,   3.45655000e-02,   2.25040000e-02,
-                                       1.47195000e-02,   9.58700000e-03,   6.39600000e-03,
-                                       4.25700000e-03,   2.79800000e-03,   1.78100000e-03,
-                                       1.14200000e-03,   6.77000000e-04,   3.55000000e-04,
-                                       1.12000000e-04]),
-                         wavelength_units='um', value_units='response')
-
-LANDSAT_OLI_B7 = Spectra(wavelengths=array([2.037,  2.0395,  2.042,  2.0445,  2.047,  2.0495,  2.052,
-                                            2.0545,  2.057,  2.0595,  2.062,  2.0645,  2.067,  2.0695,
-                                            2.072,  2.0745,  2.077,  2.0795,  2.082,  2.0845,  2.087,
-                                            2.0895,  2.092,  2.0945,  2.097,  2.0995,  2.102,  2.1045,
-                                            2.107,  2.1095,  2.112,  2.1145,  2.117,  2.1195,  2.122,
-                                            2.1245,  2.127,  2.1295,  2.132,  2.1345,  2.137,  2.1395,
-                                            2.142,  2.1445,  2.147,  2.1495,  2.152,  2.1545,  2.157,
-                                            2.1595,  2.162,  2.1645,  2.167,  2.1695,  2.172,  2.1745,
-                                            2.177,  2.1795,  2.182,  2.1845,  2.187,  2.1895,  2.192,
-                                            2.1945,  2.197,  2.1995,  2.202,  2.2045,  2.207,  2.2095,
-                                            2.212,  2.2145,  2.217,  2.2195,  2.222,  2.2245,  2.227,
-                                            2.2295,  2.232,  2.2345,  2.237,  2.2395,  2.242,  2.2445,
-                                            2.247,  2.2495,  2.252,  2.2545,  2.257,  2.2595,  2.262,
-                                            2.2645,  2.267,  2.2695,  2.272,  2.2745,  2.277,  2.2795,
-                                            2.282,  2.2845,  2.287,  2.2895,  2.292,  2.2945,  2.297,
-                                            2.2995,  2.302,  2.3045,  2.307,  2.3095,  2.312,  2.3145,
-                                            2.317,  2.3195,  2.322,  2.3245,  2.327,  2.3295,  2.332,
-                                            2.3345,  2.337,  2.3395,  2.342,  2.3445,  2.347,  2.3495,
-                                            2.352]),
-                         values=array([0.00000000e+00,   1.07000000e-04,   2.40000000e-04,
-                                       3.99000000e-04,   5.99000000e-04,   8.80500000e-04,
-                                       1.22200000e-03,   1.64550000e-03,   2.18700000e-03,
-                                       2.85300000e-03,   3.73300000e-03,   4.88200000e-03,
-                                       6.33700000e-03,   8.44950000e-03,   1.10050000e-02,
-                                       1.42985000e-02,   1.88990000e-02,   2.45090000e-02,
-                                       3.20710000e-02,   4.28190000e-02,   5.64290000e-02,
-                                       7.48955000e-02,   1.00640000e-01,   1.36480000e-01,
-                                       1.79714000e-01,   2.40483000e-01,   3.11347000e-01,
-                                       3.94832500e-01,   4.88816000e-01,   5.73971000e-01,
-                                       6.63067000e-01,   7.39406500e-01,   7.92667000e-01,
-                                       8.41172500e-01,   8.67845000e-01,   8.86269000e-01,
-                                       9.06527000e-01,   9.14538000e-01,   9.29693000e-01,
-                                       9.38975000e-01,   9.42952000e-01,   9.44181000e-01,
-                                       9.48776000e-01,   9.49521500e-01,   9.56635000e-01,
-                                       9.48258500e-01,   9.50874000e-01,   9.47049500e-01,
-                                       9.57717000e-01,   9.47095000e-01,   9.51641000e-01,
-                                       9.46800000e-01,   9.40311000e-01,   9.46466500e-01,
-                                       9.38737000e-01,   9.44439000e-01,   9.44482000e-01,
-                                       9.50472000e-01,   9.39939000e-01,   9.37156500e-01,
-                                       9.38955000e-01,   9.28123500e-01,   9.30508000e-01,
-                                       9.30946000e-01,   9.36472000e-01,   9.34327500e-01,
-                                       9.46217000e-01,   9.53826000e-01,   9.63135000e-01,
-                                       9.63944000e-01,   9.62905000e-01,   9.61607000e-01,
-                                       9.57814000e-01,   9.55657500e-01,   9.51706000e-01,
-                                       9.60275500e-01,   9.47696000e-01,   9.59807000e-01,
-                                       9.55750000e-01,   9.56607500e-01,   9.66786000e-01,
-                                       9.62823000e-01,   9.77637000e-01,   9.83457500e-01,
-                                       9.85056000e-01,   9.98627000e-01,   9.92469000e-01,
-                                       9.97947000e-01,   9.97261000e-01,   9.89437000e-01,
-                                       9.86037000e-01,   9.81280000e-01,   9.72794000e-01,
-                                       9.76369500e-01,   9.74409000e-01,   9.63698500e-01,
-                                       9.55095000e-01,   9.51391500e-01,   9.22405000e-01,
-                                       8.89264000e-01,   8.23876000e-01,   7.21272500e-01,
-                                       6.02539000e-01,   4.77695500e-01,   3.55569000e-01,
-                                       2.61452500e-01,   1.86151000e-01,   1.31725000e-01,
-                                       9.20290000e-02,   6.49895000e-02,   4.63320000e-02,
-                                       3.34235000e-02,   2.40000000e-02,   1.76250000e-02,
-                                       1.29300000e-02,   9.55700000e-03,   7.08800000e-03,
-                                       5.33100000e-03,   3.90300000e-03,   2.83800000e-03,
-                                       2.04700000e-03,   1.44950000e-03,   9.74000000e-04,
-                                       6.20000000e-04,   3.20000000e-04,   7.35000000e-05,
-                                       0.00000000e+00]),
-                         wavelength_units='um', value_units='response')
-
-LANDSAT_OLI_B8 = Spectra(wavelengths=array([0.488,  0.4905,  0.493,  0.4955,  0.498,  0.5005,  0.503,
-                                            0.5055,  0.508,  0.5105,  0.513,  0.5155,  0.518,  0.5205,
-                                            0.523,  0.5255,  0.528,  0.5305,  0.533,  0.5355,  0.538,
-                                            0.5405,  0.543,  0.5455,  0.548,  0.5505,  0.553,  0.5555,
-                                            0.558,  0.5605,  0.563,  0.5655,  0.568,  0.5705,  0.573,
-                                            0.5755,  0.578,  0.5805,  0.583,  0.5855,  0.588,  0.5905,
-                                            0.593,  0.5955,  0.598,  0.6005,  0.603,  0.6055,  0.608,
-                                            0.6105,  0.613,  0.6155,  0.618,  0.6205,  0.623,  0.6255,
-                                            0.628,  0.6305,  0.633,  0.6355,  0.638,  0.6405,  0.643,
-                                            0.6455,  0.648,  0.6505,  0.653,  0.6555,  0.658,  0.6605,
-                                            0.663,  0.6655,  0.668,  0.6705,  0.673,  0.6755,  0.678,
-                                            0.6805,  0.683,  0.6855,  0.688,  0.6905]),
-                         values=array([2.16000000e-04,   1.30000000e-03,   3.84100000e-03,
-                                       1.22590000e-02,   4.27230000e-02,   1.60137500e-01,
-                                       4.72496000e-01,   7.45412500e-01,   8.31881000e-01,
-                                       8.55321500e-01,   8.59640000e-01,   8.57696000e-01,
-                                       8.58455000e-01,   8.58301000e-01,   8.50183000e-01,
-                                       8.58223500e-01,   8.61508000e-01,   8.57683500e-01,
-                                       8.79249000e-01,   8.91710500e-01,   9.06294000e-01,
-                                       9.12867000e-01,   9.02939000e-01,   9.20739500e-01,
-                                       9.13020000e-01,   8.85650500e-01,   8.79443000e-01,
-                                       8.74179000e-01,   8.75361000e-01,   8.91665000e-01,
-                                       8.74097000e-01,   8.86888500e-01,   9.03528000e-01,
-                                       9.10950500e-01,   9.13190000e-01,   9.20178000e-01,
-                                       9.24431000e-01,   9.29809500e-01,   9.48863000e-01,
-                                       9.40543000e-01,   9.45674000e-01,   9.39380000e-01,
-                                       9.46659000e-01,   9.34044500e-01,   9.40838000e-01,
-                                       9.58039500e-01,   9.68241000e-01,   9.66480500e-01,
-                                       9.57232000e-01,   9.47675500e-01,   9.52465000e-01,
-                                       9.57481500e-01,   9.64158000e-01,   9.67366000e-01,
-                                       9.77026000e-01,   9.76029500e-01,   9.69583000e-01,
-                                       9.72807000e-01,   9.65780000e-01,   9.66738000e-01,
-                                       9.72067000e-01,   9.79346500e-01,   9.71123000e-01,
-                                       9.53377000e-01,   9.63851000e-01,   9.67101500e-01,
-                                       9.70613000e-01,   9.79974500e-01,   9.88302000e-01,
-                                       9.91753000e-01,   1.00000000e+00,   9.98476000e-01,
-                                       9.92555000e-01,   9.85811500e-01,   9.13945000e-01,
-                                       5.24376500e-01,   1.67313000e-01,   4.61755000e-02,
-                                       1.51780000e-02,   6.70950000e-03,   3.22000000e-03,
-                                       1.21200000e-03]),
-                         wavelength_units='um', value_units='response')
-
-LANDSAT_OLI_B9 = Spectra(wavelengths=array([1.34,  1.3425,  1.345,  1.3475,  1.35,  1.3525,  1.355,
-                                            1.3575,  1.36,  1.3625,  1.365,  1.3675,  1.37,  1.3725,
-                                            1.375,  1.3775,  1.38,  1.3825,  1.385,  1.3875,  1.39,
-                                            1.3925,  1.395,  1.3975,  1.4,  1.4025,  1.405]),
-                         values=array([0.00000000e+00,   2.57500000e-04,   6.47000000e-04,
-                                       1.27400000e-03,   2.31800000e-03,   4.70450000e-03,
-                                       1.11240000e-02,   3.45385000e-02,   1.15351000e-01,
-                                       3.86681500e-01,   7.72118000e-01,   9.00941500e-01,
-                                       9.31247000e-01,   9.91687000e-01,   1.00000000e+00,
-                                       9.77080500e-01,   8.71343000e-01,   6.54888000e-01,
-                                       2.97920000e-01,   8.96145000e-02,   2.60840000e-02,
-                                       8.30650000e-03,   2.78000000e-03,   1.11900000e-03,
-                                       2.20000000e-04,   0.00000000e+00,   0.00000000e+00]),
-                         wavelength_units='um', value_units='response')
-
-
-LANDSAT_OLI = [LANDSAT_OLI_B1,
-               LANDSAT_OLI_B2,
-               LANDSAT_OLI_B3,
-               LANDSAT_OLI_B4,
-               LANDSAT_OLI_B5,
-               LANDSAT_OLI_B6,
-               LANDSAT_OLI_B7,
-               LANDSAT_OLI_B8,
-               LANDSAT_OLI_B9]
-
-
-# =============================================================================
-# =============================================================================
-# =============================================================================
-# =============================================================================
-
-# RapidEye
-# Taken from http://blackbridge.com/rapideye/upload/Spectral_Response_Curves.pdf
-# Interpolated to 2.5nm intervals, as required by 6S
-
-RAPIDEYE_B1 = Spectra(wavelengths=array([0.42,  0.4225,  0.425,  0.4275,  0.43,  0.4325,  0.435,
-                                         0.4375,  0.44,  0.4425,  0.445,  0.4475,  0.45,  0.4525,
-                                         0.455,  0.4575,  0.46,  0.4625,  0.465,  0.4675,  0.47,
-                                         0.4725,  0.475,  0.4775,  0.48,  0.4825,  0.485,  0.4875,
-                                         0.49,  0.4925,  0.495,  0.4975,  0.5,  0.5025,  0.505,
-                                         0.5075,  0.51,  0.5125]),
-                      values=array([0.002,  0.,  0.,  0.0015,  0.,  0.,  0.001,
-                                    0.0095,  0.321,  0.725,  0.74,  0.759,  0.77,  0.781,
-                                    0.784,  0.7935,  0.796,  0.8005,  0.806,  0.804,  0.807,
-                                    0.817,  0.82,  0.8275,  0.84,  0.847,  0.862,  0.8765,
-                                    0.886,  0.9105,  0.928,  0.9415,  0.969,  0.9685,  1.,
-                                    0.9875,  0.437,  0.019]),
-                      wavelength_units='um', value_units='response')
-
-RAPIDEYE_B2 = Spectra(wavelengths=array([0.462,  0.4645,  0.467,  0.4695,  0.472,  0.4745,  0.477,
-                                         0.4795,  0.482,  0.4845,  0.487,  0.4895,  0.492,  0.4945,
-                                         0.497,  0.4995,  0.502,  0.5045,  0.507,  0.5095,  0.512,
-                                         0.5145,  0.517,  0.5195,  0.522,  0.5245,  0.527,  0.5295,
-                                         0.532,  0.5345,  0.537,  0.5395,  0.542,  0.5445,  0.547,
-                                         0.5495,  0.552,  0.5545,  0.557,  0.5595,  0.562,  0.5645,
-                                         0.567,  0.5695,  0.572,  0.5745,  0.577,  0.5795,  0.582,
-                                         0.5845,  0.587,  0.5895,  0.592,  0.5945]),
-                      values=array([0.002,  0.0025,  0.002,  0.021,  0.,  0.,  0.,
-                                    0.,  0.,  0.,  0.,  0.0145,  0.,  0.,
-                                    0.,  0.,  0.,  0.,  0.,  0.001,  0.002,
-                                    0.01,  0.054,  0.4055,  0.868,  0.866,  0.877,  0.872,
-                                    0.874,  0.8815,  0.882,  0.8805,  0.886,  0.8955,  0.899,
-                                    0.8995,  0.91,  0.922,  0.928,  0.9345,  0.946,  0.9525,
-                                    0.96,  0.972,  0.976,  0.975,  0.989,  0.9905,  0.984,
-                                    0.997,  0.97,  0.6535,  0.039,  0.004]),
-                      wavelength_units='um', value_units='response')
-
-RAPIDEYE_B3 = Spectra(wavelengths=array([0.486,  0.4885,  0.491,  0.4935,  0.496,  0.4985,  0.501,
-                                         0.5035,  0.506,  0.5085,  0.511,  0.5135,  0.516,  0.5185,
-                                         0.521,  0.5235,  0.526,  0.5285,  0.531,  0.5335,  0.536,
-                                         0.5385,  0.541,  0.5435,  0.546,  0.5485,  0.551,  0.5535,
-                                         0.556,  0.5585,  0.561,  0.5635,  0.566,  0.5685,  0.571,
-                                         0.5735,  0.576,  0.5785,  0.581,  0.5835,  0.586,  0.5885,
-                                         0.591,  0.5935,  0.596,  0.5985,  0.601,  0.6035,  0.606,
-                                         0.6085,  0.611,  0.6135,  0.616,  0.6185,  0.621,  0.6235,
-                                         0.626,  0.6285,  0.631,  0.6335,  0.636,  0.6385,  0.641,
-                                         0.6435,  0.646,  0.6485,  0.651,  0.6535,  0.656,  0.6585,
-                                         0.661,  0.6635,  0.666,  0.6685,  0.671,  0.6735,  0.676,
-                                         0.6785,  0.681,  0.6835,  0.686,  0.6885]),
-                      values=array([2.00000000e-03,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    1.00000000e-03,   5.00000000e-04,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   5.00000000e-04,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   5.00000000e-04,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    1.00000000e-03,   4.00000000e-03,   1.80000000e-02,
-                                    1.43000000e-01,   7.23000000e-01,   8.57500000e-01,
-                                    8.65000000e-01,   8.81500000e-01,   8.82000000e-01,
-                                    8.93000000e-01,   9.07000000e-01,   9.12500000e-01,
-                                    9.18000000e-01,   9.31000000e-01,   9.44000000e-01,
-                                    9.52500000e-01,   9.61000000e-01,   9.67000000e-01,
-                                    9.73000000e-01,   9.83000000e-01,   9.91000000e-01,
-                                    9.87000000e-01,   9.89000000e-01,   9.99000000e-01,
-                                    9.81000000e-01,   9.28500000e-01,   1.74000000e-01,
-                                    1.70000000e-02]),
-                      wavelength_units='um', value_units='response')
-
-RAPIDEYE_B4 = Spectra(wavelengths=array([0.5,  0.5025,  0.505,  0.5075,  0.51,  0.5125,  0.515,
-                                         0.5175,  0.52,  0.5225,  0.525,  0.5275,  0.53,  0.5325,
-                                         0.535,  0.5375,  0.54,  0.5425,  0.545,  0.5475,  0.55,
-                                         0.5525,  0.555,  0.5575,  0.56,  0.5625,  0.565,  0.5675,
-                                         0.57,  0.5725,  0.575,  0.5775,  0.58,  0.5825,  0.585,
-                                         0.5875,  0.59,  0.5925,  0.595,  0.5975,  0.6,  0.6025,
-                                         0.605,  0.6075,  0.61,  0.6125,  0.615,  0.6175,  0.62,
-                                         0.6225,  0.625,  0.6275,  0.63,  0.6325,  0.635,  0.6375,
-                                         0.64,  0.6425,  0.645,  0.6475,  0.65,  0.6525,  0.655,
-                                         0.6575,  0.66,  0.6625,  0.665,  0.6675,  0.67,  0.6725,
-                                         0.675,  0.6775,  0.68,  0.6825,  0.685,  0.6875,  0.69,
-                                         0.6925,  0.695,  0.6975,  0.7,  0.7025,  0.705,  0.7075,
-                                         0.71,  0.7125,  0.715,  0.7175,  0.72,  0.7225,  0.725,
-                                         0.7275,  0.73,  0.7325,  0.735,  0.7375]),
-                      values=array([2.70000000e-02,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   5.00000000e-04,
-                                    0.00000000e+00,   5.00000000e-04,   1.00000000e-03,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   5.00000000e-04,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   2.20000000e-02,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   5.00000000e-04,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   1.00000000e-03,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   1.00000000e-03,
-                                    2.00000000e-03,   5.50000000e-03,   2.10000000e-02,
-                                    1.08500000e-01,   4.91000000e-01,   9.49000000e-01,
-                                    9.98000000e-01,   9.99500000e-01,   9.98000000e-01,
-                                    9.91500000e-01,   9.87000000e-01,   9.85500000e-01,
-                                    9.82000000e-01,   9.74000000e-01,   9.66000000e-01,
-                                    9.64000000e-01,   9.61000000e-01,   9.45500000e-01,
-                                    9.39000000e-01,   8.98000000e-01,   4.25000000e-01,
-                                    9.40000000e-02,   2.00000000e-02,   5.50000000e-03]),
-                      wavelength_units='um', value_units='response')
-
-RAPIDEYE_B5 = Spectra(wavelengths=array([0.519,  0.5215,  0.524,  0.5265,  0.529,  0.5315,  0.534,
-                                         0.5365,  0.539,  0.5415,  0.544,  0.5465,  0.549,  0.5515,
-                                         0.554,  0.5565,  0.559,  0.5615,  0.564,  0.5665,  0.569,
-                                         0.5715,  0.574,  0.5765,  0.579,  0.5815,  0.584,  0.5865,
-                                         0.589,  0.5915,  0.594,  0.5965,  0.599,  0.6015,  0.604,
-                                         0.6065,  0.609,  0.6115,  0.614,  0.6165,  0.619,  0.6215,
-                                         0.624,  0.6265,  0.629,  0.6315,  0.634,  0.6365,  0.639,
-                                         0.6415,  0.644,  0.6465,  0.649,  0.6515,  0.654,  0.6565,
-                                         0.659,  0.6615,  0.664,  0.6665,  0.669,  0.6715,  0.674,
-                                         0.6765,  0.679,  0.6815,  0.684,  0.6865,  0.689,  0.6915,
-                                         0.694,  0.6965,  0.699,  0.7015,  0.704,  0.7065,  0.709,
-                                         0.7115,  0.714,  0.7165,  0.719,  0.7215,  0.724,  0.7265,
-                                         0.729,  0.7315,  0.734,  0.7365,  0.739,  0.7415,  0.744,
-                                         0.7465,  0.749,  0.7515,  0.754,  0.7565,  0.759,  0.7615,
-                                         0.764,  0.7665,  0.769,  0.7715,  0.774,  0.7765,  0.779,
-                                         0.7815,  0.784,  0.7865,  0.789,  0.7915,  0.794,  0.7965,
-                                         0.799,  0.8015,  0.804,  0.8065,  0.809,  0.8115,  0.814,
-                                         0.8165,  0.819,  0.8215,  0.824,  0.8265,  0.829,  0.8315,
-                                         0.834,  0.8365,  0.839,  0.8415,  0.844,  0.8465,  0.849,
-                                         0.8515,  0.854,  0.8565,  0.859,  0.8615,  0.864]),
-                      values=array([2.00000000e-03,   5.00000000e-04,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   1.00000000e-03,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   2.00000000e-03,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   1.00000000e-03,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   4.00000000e-03,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    1.00000000e-03,   2.00000000e-03,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   1.00000000e-03,   2.00000000e-03,
-                                    5.00000000e-04,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   5.00000000e-04,   2.20000000e-02,
-                                    5.00000000e-04,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   0.00000000e+00,   0.00000000e+00,
-                                    0.00000000e+00,   1.00000000e-03,   1.00000000e-03,
-                                    2.00000000e-03,   4.50000000e-03,   9.00000000e-03,
-                                    1.95000000e-02,   4.60000000e-02,   1.27500000e-01,
-                                    3.45000000e-01,   7.49000000e-01,   9.88000000e-01,
-                                    9.88000000e-01,   9.69000000e-01,   9.71500000e-01,
-                                    9.81000000e-01,   9.82000000e-01,   9.74000000e-01,
-                                    9.65000000e-01,   9.60000000e-01,   9.57500000e-01,
-                                    9.59000000e-01,   9.59000000e-01,   9.57000000e-01,
-                                    9.54500000e-01,   9.50000000e-01,   9.45000000e-01,
-                                    9.39000000e-01,   9.34000000e-01,   9.29000000e-01,
-                                    9.27000000e-01,   9.26000000e-01,   9.26000000e-01,
-                                    9.25000000e-01,   9.19500000e-01,   9.11000000e-01,
-                                    9.00000000e-01,   8.91000000e-01,   8.85500000e-01,
-                                    8.83000000e-01,   8.78000000e-01,   8.65000000e-01,
-                                    8.45500000e-01,   8.38000000e-01,   8.37000000e-01,
-                                    7.12000000e-01,   3.63000000e-01,   1.24000000e-01,
-                                    4.30000000e-02,   1.60000000e-02,   7.00000000e-03,
-                                    3.00000000e-03]),
-                      wavelength_units='um', value_units='response')
-
-RAPIDEYE = [RAPIDEYE_B1,
-            RAPIDEYE_B2,
-            RAPIDEYE_B3,
-            RAPIDEYE_B4,
-            RAPIDEYE_B5]
-
-# =============================================================================
-# =============================================================================
-# =============================================================================
-# =============================================================================
+def __getattr__(name):
+    # Allow sensors and bands to be used as attributes, e.g., LANDSAT_OLI
+    # or LANDSAT_OLI_B1.
+    if name.isupper():
+        if name in list_sensors():
+            return get_sensor(name)
+        match = re.match(r"^(.+)_(B\d+)$", name)
+        if match is not None and match.group(1) in list_sensors():
+            return get_band(match.group(1), match.group(2))
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__,
+                                                                   name))
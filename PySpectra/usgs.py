@@ -7,43 +7,62 @@
 #
 # Author: Robin Wilson
 # Created: 2015-11-16
-import sys
+import collections
+import io
+import os
+import re
 
 import numpy as np
 
-# Python 2/3 imports
-try:
-    import urllib2
-except ImportError:
-    if sys.version_info[0] >= 3:
-        import urllib.request as urllib2
-    else:
-        raise
-
-try:
-    from StringIO import StringIO
-except ImportError:
-    if sys.version_info[0] >= 3:
-        from io import StringIO
-    else:
-        raise
-
+from . import spectra_collection
 from . import spectra_reader
 
+# First line of each record in a USGS Spectral Library ASCII file
+USGS_RECORD_START = b"USGS Digital Spectral Library"
+
+# Line numbers (from 1) of the title and history for each record, data
+# start on the line after the history.
+USGS_TITLE_LINE = 15
+USGS_HISTORY_LINE = 16
+
+# Value used for deleted numbers
+USGS_DELETED_VALUE = -1.23e+34
+
+USGSRecord = collections.namedtuple("USGSRecord",
+                                    ["file_name", "offset", "data_offset",
+                                     "end", "n_rows", "title", "history",
+                                     "record"])
+
+
+def parse_data(data_text):
+    """
+    Parse columns of data from a USGS Spectral Library record into a
+    numpy array (rows x columns) using 'spectra_reader.parse_text_data'.
+    Deleted numbers are set to NaN.
+    """
+    data = spectra_reader.parse_text_data(data_text)
+    if data is None:
+        raise ValueError("Data aren't all numbers with the same number "
+                         "of columns")
+    data[data == USGS_DELETED_VALUE] = np.nan
+    return data
+
 
 class USGSFormat(spectra_reader.SpectraReader):
     """
     Class to read spectra from USGS Spectral Library format data
     """
 
-    def get_spectra(self, filename_or_url):
+    def get_spectra(self, filename_or_url, http_cache=None):
         """
         Extract spectra from a USGS Spectral Library format file
 
         Requires:
 
-        * filename_or_url - the filename or URL to the USGS Spectral Library
-        file to read
+        * filename_or_url - the filename or URL (http or https) to the USGS
+        Spectral Library file to read
+        * http_cache - fetch.HTTPCache to store files fetched from URLs in
+        (optional)
 
         Returns:
 
@@ -54,32 +73,249 @@ class USGSFormat(spectra_reader.SpectraReader):
         get_spectra("http://speclab.cr.usgs.gov/spectral.lib06/ds231/ASCII/V/russianolive.dw92-4.30728.asc")
 
         """
+        if filename_or_url.startswith(("http://", "https://")):
+            # Only import fetch (and http.client) when needed
+            from . import fetch
+            data = fetch.fetch(filename_or_url, cache=http_cache)
+            return self.parse_spectra(data.decode("latin-1"), filename_or_url)
 
-        if filename_or_url.startswith("""http://"""):
-            data = urllib2.urlopen(filename_or_url).read()
-            if sys.version_info[0] >= 3:
-                f = StringIO(data.decode())
-            else:
-                f = StringIO(data)
-        else:
-            f = open(filename_or_url, "r")
+        with open(filename_or_url, "r") as f:
+            return self.parse_spectra(f.read(), filename_or_url)
+
+    def get_spectra_from_urls(self, urls, http_cache=None,
+                              n_workers=None):
+        """
+        Extract spectra from many USGS Spectral Library URLs, fetching
+        up to 'n_workers' at once.
+
+        Requires:
+
+        * urls - list of URLs
+        * http_cache - fetch.HTTPCache to store files in (optional)
+        * n_workers - maximum number of files to fetch at once (optional,
+                      default is fetch.DEFAULT_N_WORKERS)
+
+        Returns:
+
+        * List of Spectra objects, in the same order as 'urls'
+
+        """
+        from . import fetch
+
+        if n_workers is None:
+            n_workers = fetch.DEFAULT_N_WORKERS
+        data = fetch.fetch_many(urls, cache=http_cache, n_workers=n_workers,
+                                raise_errors=True)
+        return [self.parse_spectra(file_data.decode("latin-1"), url)
+                for url, file_data in zip(urls, data)]
+
+    def parse_spectra(self, text, filename_or_url):
+        """
+        Parse the text of a USGS Spectral Library file.
+
+        Returns Spectra object.
+        """
+        spectra = spectra_reader.Spectra()
 
-        npdata = np.loadtxt(f, skiprows=16)
-        f.close()
-        npdata[npdata == -1.23e+34] = np.nan
+        f = io.StringIO(text)
+        for _ in range(USGS_HISTORY_LINE):
+            f.readline()
+        npdata = parse_data(f.read())
 
         wavelengths = npdata[:, 0]
         reflectance = npdata[:, 1]
 
-        self.spectra.file_name = filename_or_url
-        self.spectra.wavelengths = wavelengths
-        self.spectra.values = reflectance
-        self.spectra.pixel = None
-        self.spectra.line = None
-        self.spectra.latitude = None
-        self.spectra.longitude = None
-        self.spectra.wavelength_units = "um"
-        self.spectra.value_units = "reflectance"
-        self.spectra.value_scaling = 1
-
-        return self.spectra
+        spectra.file_name = filename_or_url
+        spectra.wavelengths = wavelengths
+        spectra.values = reflectance
+        spectra.pixel = None
+        spectra.line = None
+        spectra.latitude = None
+        spectra.longitude = None
+        spectra.wavelength_units = "um"
+        spectra.value_units = "reflectance"
+        spectra.value_scaling = 1
+
+        return spectra
+
+
+class USGSLibrary(object):
+    """
+    Index of all spectra in a USGS Spectral Library, as a directory of
+    ASCII files and / or ASCII archives with many records concatenated.
+
+    Files are scanned once when the library is created, recording the
+    byte offset, title and record number of each spectrum. Any subset of
+    spectra can then be read in bulk using 'get_collection'.
+
+    * records - list of USGSRecord for each spectrum, with the file name,
+                byte offsets of the start of the record, data and end of
+                the record, number of rows of data, title, history and
+                record number (None if not known).
+
+    Example:
+
+    library = USGSLibrary("splib06a/ASCII")
+    olive = library.get_collection(library.find("olive"))
+
+    """
+    def __init__(self, path, extension=".asc"):
+        self.records = []
+        if os.path.isdir(path):
+            file_names = []
+            for directory, _, names in os.walk(path):
+                file_names.extend(os.path.join(directory, name) for name in names
+                                  if name.lower().endswith(extension))
+            for file_name in sorted(file_names):
+                self.records.extend(self.index_file(file_name))
+        else:
+            self.records.extend(self.index_file(path))
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def titles(self):
+        return [record.title for record in self.records]
+
+    def index_file(self, filename):
+        """
+        Find all records in a USGS Spectral Library ASCII file.
+
+        Returns list of USGSRecord.
+        """
+        records = []
+        current = None
+        offset = 0
+
+        with open(filename, "rb") as f:
+            for line in f:
+                if line.startswith(USGS_RECORD_START):
+                    if current is not None:
+                        records.append(self._make_record(filename, offset,
+                                                         **current))
+                    current = {"offset": offset, "n_lines": 1,
+                               "data_offset": None, "n_rows": 0,
+                               "title": None, "history": None}
+                elif current is not None:
+                    current["n_lines"] += 1
+                    if current["n_lines"] == USGS_TITLE_LINE:
+                        current["title"] = line.decode("latin-1").strip()
+                    elif current["n_lines"] == USGS_HISTORY_LINE:
+                        current["history"] = line.decode("latin-1").strip()
+                        current["data_offset"] = offset + len(line)
+                    elif (current["n_lines"] > USGS_HISTORY_LINE and
+                          not line.isspace()):
+                        current["n_rows"] += 1
+                offset += len(line)
+
+        if current is not None:
+            records.append(self._make_record(filename, offset, **current))
+
+        # Files from the library are named by record number
+        # (e.g., russianolive.dw92-4.30728.asc).
+        if len(records) == 1:
+            match = re.search(r"(\d+)\D*$", os.path.basename(filename))
+            if match is not None:
+                records[0] = records[0]._replace(record=int(match.group(1)))
+
+        return [record for record in records if record.data_offset is not None]
+
+    def _make_record(self, filename, end, offset, n_lines, data_offset,
+                     n_rows, title, history):
+        # Get record number from history (e.g., 'copy of splib05a r 11813')
+        record = None
+        if history is not None:
+            match = re.search(r"\br\s*(\d+)", history)
+            if match is not None:
+                record = int(match.group(1))
+        return USGSRecord(filename, offset, data_offset, end, n_rows, title,
+                          history, record)
+
+    def find(self, pattern):
+        """
+        Find spectra with a title matching a regular expression
+        (case insensitive).
+
+        Returns list of indices of matching records.
+        """
+        regex = re.compile(pattern, re.IGNORECASE)
+        return [i for i, record in enumerate(self.records)
+                if record.title is not None and regex.search(record.title)]
+
+    def read_records(self, indices):
+        """
+        Read data for records into a single numpy array, opening each
+        file once and parsing all records together using 'parse_data'.
+
+        Returns list of numpy arrays (rows x columns) for each record.
+        """
+        indices = list(indices)
+        data_chunks = [None] * len(indices)
+
+        by_file = collections.OrderedDict()
+        for i, index in enumerate(indices):
+            by_file.setdefault(self.records[index].file_name, []).append(i)
+
+        for file_name, positions in by_file.items():
+            with open(file_name, "rb") as f:
+                for i in sorted(positions,
+                                key=lambda i: self.records[indices[i]].offset):
+                    record = self.records[indices[i]]
+                    f.seek(record.data_offset)
+                    data_chunks[i] = f.read(record.end - record.data_offset)
+
+        data = parse_data(b"\n".join(data_chunks).decode("latin-1"))
+        n_rows = [self.records[index].n_rows for index in indices]
+        return np.split(data, np.cumsum(n_rows)[:-1])
+
+    def get_spectra(self, index):
+        """
+        Get a single spectrum from the library.
+
+        Returns Spectra object.
+        """
+        return self.get_collection([index])[0]
+
+    def get_collection(self, indices=None, wavelengths=None):
+        """
+        Read spectra from the library into a SpectraCollection.
+
+        Requires:
+
+        * indices - list of indices of records (e.g., from 'find'). If not
+                    provided all spectra are read.
+        * wavelengths - wavelengths for the collection (optional). Required
+                        if spectra have different wavelengths, spectra are
+                        interpolated to these wavelengths.
+
+        Returns:
+
+        * SpectraCollection with titles as names.
+
+        """
+        if indices is None:
+            indices = range(len(self.records))
+        indices = list(indices)
+        if len(indices) == 0:
+            raise ValueError("Need at least one spectrum to create a collection")
+
+        record_data = self.read_records(indices)
+
+        if wavelengths is None:
+            wavelengths = record_data[0][:, 0]
+            for data in record_data[1:]:
+                if not np.array_equal(data[:, 0], wavelengths):
+                    raise ValueError("Spectra have different wavelengths, "
+                                     "provide 'wavelengths' to resample to")
+            values = np.vstack([data[:, 1] for data in record_data])
+        else:
+            values = np.vstack([np.interp(wavelengths, data[:, 0], data[:, 1])
+                                for data in record_data])
+
+        records = [self.records[index] for index in indices]
+        return spectra_collection.SpectraCollection(
+            wavelengths, values, wavelength_units="um",
+            value_units="reflectance",
+            file_name=[record.file_name for record in records],
+            name=[record.title for record in records])
@@ -17,4 +17,5 @@ setup(
   description = "A library for importing Spectra in a variety of formats",
   url = "https://arsf-dan.nerc.ac.uk/trac/",
   packages = ["PySpectra"],
+  package_data = {"PySpectra": ["srf_data/*.csv"]},
 )
@@ -0,0 +1,94 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+from PySpectra import extract_spectra_from_file
+from PySpectra import ascii_format
+
+
+class ASCIIFormatTests(unittest.TestCase):
+
+    def setUp(self):
+        self.out_directory = tempfile.mkdtemp()
+        self.wavelengths = np.arange(400, 410, dtype=float)
+        self.values = np.linspace(0.1, 0.5, self.wavelengths.size)
+
+    def tearDown(self):
+        shutil.rmtree(self.out_directory)
+
+    def write_file(self, name, lines):
+        out_file = os.path.join(self.out_directory, name)
+        with open(out_file, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        return out_file
+
+    def test_read_csv(self):
+        lines = ["wavelength,reflectance"]
+        lines.extend("{},{}".format(w, v) for w, v in zip(self.wavelengths,
+                                                          self.values))
+        csv_file = self.write_file("spectra.csv", lines)
+
+        s = extract_spectra_from_file(csv_file)
+        assert_allclose(s.wavelengths, self.wavelengths)
+        assert_allclose(s.values, self.values)
+
+        assert_allclose(ascii_format.read_text_data(csv_file, delimiter=",",
+                                                    skip_header=1),
+                        np.genfromtxt(csv_file, delimiter=",", skip_header=1))
+
+    def test_read_txt(self):
+        lines = ["# Spectra", "wavelength reflectance"]
+        lines.extend("{} {}".format(w, v * 100) for w, v in zip(self.wavelengths,
+                                                                self.values))
+        txt_file = self.write_file("spectra.txt", lines)
+
+        s = extract_spectra_from_file(txt_file, skip_header=2,
+                                      reflectance_scale=100)
+        assert_allclose(s.values, self.values)
+
+    def test_missing_values(self):
+        lines = ["wavelength,reflectance,other"]
+        lines.extend("{},{},".format(w, v) for w, v in zip(self.wavelengths,
+                                                           self.values))
+        lines[3] = "{},,".format(self.wavelengths[2])
+        csv_file = self.write_file("missing.csv", lines)
+
+        data = ascii_format.read_text_data(csv_file, delimiter=",",
+                                           skip_header=1)
+        self.assertEqual(data.shape, (self.wavelengths.size, 3))
+        self.assertTrue(np.isnan(data[2, 1]))
+        self.assertTrue(np.isnan(data[:, 2]).all())
+
+        # Only supported by genfromtxt
+        data = ascii_format.read_text_data(csv_file, delimiter=",",
+                                           skip_header=1, filling_values=-1)
+        self.assertEqual(data[2, 1], -1)
+
+    def test_get_all_spectra(self):
+        lines = ['"wavelength","a","b","c"']
+        lines.extend("{},{},{},{}".format(w, v, v * 2, v * 3)
+                     for w, v in zip(self.wavelengths, self.values))
+        csv_file = self.write_file("wide.csv", lines)
+
+        reader = ascii_format.ASCIIFormat()
+        collection = reader.get_all_spectra(csv_file, delimiter=",",
+                                            skip_header=1)
+        self.assertEqual(collection.values.shape, (3, self.wavelengths.size))
+        assert_allclose(collection.wavelengths, self.wavelengths)
+        assert_allclose(collection.values[2], self.values * 3)
+        self.assertEqual(list(collection.name), ["a", "b", "c"])
+        self.assertEqual(collection.file_name[0], csv_file)
+
+        collection = reader.get_all_spectra(csv_file, columns=["c", 1],
+                                            delimiter=",", skip_header=1)
+        self.assertEqual(list(collection.name), ["c", "a"])
+        assert_allclose(collection.values[0], self.values * 3)
+        assert_allclose(collection.values[1], self.values)
+
+        with self.assertRaises(KeyError):
+            reader.get_all_spectra(csv_file, columns=["d"], delimiter=",",
+                                   skip_header=1)
@@ -0,0 +1,69 @@
+import unittest
+import os
+
+from numpy.testing import assert_allclose
+
+from PySpectra import (extract_spectra_from_file, extract_spectra_from_files,
+                       iter_spectra)
+from PySpectra.batch import expand_paths
+
+TEST_INPUTS_DIRECTORY = os.path.join(os.path.dirname(__file__), 'inputs')
+
+ENVI_FILE = os.path.join(TEST_INPUTS_DIRECTORY, "atsc15_targets_avg_all_envi.sli")
+USGS_FILE = os.path.join(TEST_INPUTS_DIRECTORY, "russianolive.dw92-4.30728.asc")
+
+
+class BatchTests(unittest.TestCase):
+
+    def test_expand_directory(self):
+        file_list = expand_paths(TEST_INPUTS_DIRECTORY)
+        self.assertIn(ENVI_FILE, file_list)
+        # Header and unrecognised files are skipped
+        self.assertNotIn(ENVI_FILE + ".hdr", file_list)
+        self.assertNotIn(USGS_FILE, file_list)
+
+    def test_expand_glob(self):
+        file_list = expand_paths(os.path.join(TEST_INPUTS_DIRECTORY, "*.asc"))
+        self.assertEqual(file_list, [USGS_FILE])
+
+    def test_read_in_order(self):
+        paths = [ENVI_FILE, ENVI_FILE, ENVI_FILE]
+        expected = extract_spectra_from_file(ENVI_FILE, "envi", spectra_number=2)
+        for pool in ("thread", "process"):
+            results = extract_spectra_from_files(paths, "envi", n_workers=2,
+                                                 pool=pool, spectra_number=2)
+            self.assertEqual(len(results), 3)
+            for s in results:
+                assert_allclose(s.values, expected.values)
+
+    def test_errors_isolated(self):
+        paths = [USGS_FILE, os.path.join(TEST_INPUTS_DIRECTORY, "missing.asc"),
+                 USGS_FILE]
+        results = extract_spectra_from_files(paths, "usgs", n_workers=2,
+                                             pool="thread")
+        self.assertIsInstance(results[1], IOError)
+        assert_allclose(results[0].wavelengths, results[2].wavelengths)
+
+    def test_raise_errors(self):
+        paths = [os.path.join(TEST_INPUTS_DIRECTORY, "missing.asc")]
+        with self.assertRaises(IOError):
+            extract_spectra_from_files(paths, "usgs", raise_errors=True)
+
+    def test_iter_spectra(self):
+        paths = [ENVI_FILE] * 5
+        expected = extract_spectra_from_file(ENVI_FILE, "envi", spectra_number=3)
+        for n_workers in (0, 2):
+            results = iter_spectra(paths, "envi", n_workers=n_workers,
+                                   read_ahead=2, spectra_number=3)
+            self.assertNotIsInstance(results, list)
+            n_read = 0
+            for s in results:
+                assert_allclose(s.values, expected.values)
+                n_read += 1
+            self.assertEqual(n_read, 5)
+
+    def test_iter_spectra_close_early(self):
+        results = iter_spectra([USGS_FILE] * 10, "usgs", n_workers=2)
+        first = next(results)
+        results.close()
+        self.assertEqual(first.wavelength_units, "um")
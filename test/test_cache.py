@@ -0,0 +1,144 @@
+import unittest
+import os
+import pickle
+import shutil
+import tempfile
+
+from numpy.testing import assert_allclose
+
+from PySpectra import extract_spectra_from_file, extract_spectra_from_files
+from PySpectra import cache
+
+TEST_INPUTS_DIRECTORY = os.path.join(os.path.dirname(__file__), 'inputs')
+SIG_FILE = os.path.join(TEST_INPUTS_DIRECTORY, "wyken1_049.sig")
+ENVI_FILE = os.path.join(TEST_INPUTS_DIRECTORY, "atsc15_targets_avg_all_envi.sli")
+
+
+class DiskCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_directory)
+
+    def test_cache_hit(self):
+        disk_cache = cache.DiskCache(self.cache_directory)
+        s = extract_spectra_from_file(SIG_FILE, cache=disk_cache,
+                                      all_channels=True)
+        self.assertEqual((disk_cache.hits, disk_cache.misses), (0, 1))
+
+        cached = extract_spectra_from_file(SIG_FILE, cache=disk_cache,
+                                           all_channels=True)
+        self.assertEqual((disk_cache.hits, disk_cache.misses), (1, 1))
+        assert_allclose(cached.wavelengths, s.wavelengths)
+        assert_allclose(cached.values, s.values)
+        assert_allclose(cached.additional_metadata["target_radiance"],
+                        s.additional_metadata["target_radiance"])
+        self.assertEqual(cached.latitude, s.latitude)
+        self.assertEqual(cached.file_name, SIG_FILE)
+
+    def test_kwargs_in_key(self):
+        disk_cache = cache.DiskCache(self.cache_directory)
+        s1 = extract_spectra_from_file(ENVI_FILE, cache=disk_cache,
+                                       spectra_number=1)
+        s3 = extract_spectra_from_file(ENVI_FILE, cache=disk_cache,
+                                       spectra_number=3)
+        self.assertEqual(disk_cache.misses, 2)
+        self.assertEqual(s3.name, "White")
+        cached = extract_spectra_from_file(ENVI_FILE, cache=disk_cache,
+                                           spectra_number=1)
+        self.assertEqual(disk_cache.hits, 1)
+        assert_allclose(cached.values, s1.values)
+
+    def test_changed_file(self):
+        disk_cache = cache.DiskCache(self.cache_directory)
+        sig_file = os.path.join(self.cache_directory, "copy.sig")
+        shutil.copy(SIG_FILE, sig_file)
+        extract_spectra_from_file(sig_file, cache=disk_cache)
+        os.utime(sig_file, ns=(0, 0))
+        extract_spectra_from_file(sig_file, cache=disk_cache)
+        self.assertEqual(disk_cache.misses, 2)
+
+    def test_eviction(self):
+        disk_cache = cache.DiskCache(self.cache_directory)
+        extract_spectra_from_file(ENVI_FILE, cache=disk_cache, spectra_number=1)
+        entry_size = sum(os.path.getsize(os.path.join(self.cache_directory, f))
+                         for f in os.listdir(self.cache_directory))
+
+        # Only space for two spectra, the least recently used should be removed.
+        disk_cache = cache.DiskCache(self.cache_directory,
+                                     max_size=int(entry_size * 2.5))
+        extract_spectra_from_file(ENVI_FILE, cache=disk_cache, spectra_number=2)
+        for cache_file in os.listdir(self.cache_directory):
+            os.utime(os.path.join(self.cache_directory, cache_file), (0, 0))
+        extract_spectra_from_file(ENVI_FILE, cache=disk_cache, spectra_number=1)
+        extract_spectra_from_file(ENVI_FILE, cache=disk_cache, spectra_number=3)
+        self.assertEqual(len(os.listdir(self.cache_directory)), 2)
+
+        extract_spectra_from_file(ENVI_FILE, cache=disk_cache, spectra_number=1)
+        self.assertEqual(disk_cache.hits, 2)
+        extract_spectra_from_file(ENVI_FILE, cache=disk_cache, spectra_number=2)
+        self.assertEqual(disk_cache.misses, 3)
+
+
+class MemoryCacheTests(unittest.TestCase):
+
+    def test_cache_hit(self):
+        memory_cache = cache.MemoryCache()
+        s = extract_spectra_from_file(ENVI_FILE, cache=memory_cache)
+        # Spectra returned on first read can still be modified
+        s.values[0] = 0
+        cached = extract_spectra_from_file(ENVI_FILE, cache=memory_cache)
+        self.assertEqual((memory_cache.hits, memory_cache.misses), (1, 1))
+        self.assertIsNot(cached, s)
+        self.assertNotEqual(cached.values[0], 0)
+
+        # Arrays from the cache are read only
+        with self.assertRaises(ValueError):
+            cached.values[0] = 0
+        cached.file_name = "changed"
+        self.assertEqual(extract_spectra_from_file(ENVI_FILE,
+                                                   cache=memory_cache).file_name,
+                         ENVI_FILE)
+
+    def test_process_pool(self):
+        memory_cache = cache.MemoryCache(max_size=1024**2)
+        extract_spectra_from_file(ENVI_FILE, cache=memory_cache)
+
+        # Each process gets its own empty cache
+        copied = pickle.loads(pickle.dumps(memory_cache))
+        self.assertEqual(copied.max_size, 1024**2)
+        self.assertEqual((len(copied), copied.hits, copied.misses), (0, 0, 0))
+
+        spectra_list = extract_spectra_from_files([SIG_FILE, ENVI_FILE],
+                                                  n_workers=2, pool="process",
+                                                  raise_errors=True,
+                                                  cache=memory_cache)
+        self.assertEqual([s.file_name for s in spectra_list],
+                         [SIG_FILE, ENVI_FILE])
+
+    def test_changed_file(self):
+        memory_cache = cache.MemoryCache()
+        temp_directory = tempfile.mkdtemp()
+        try:
+            sig_file = os.path.join(temp_directory, "copy.sig")
+            shutil.copy(SIG_FILE, sig_file)
+            extract_spectra_from_file(sig_file, cache=memory_cache)
+            os.utime(sig_file, ns=(0, 0))
+            extract_spectra_from_file(sig_file, cache=memory_cache)
+            self.assertEqual(memory_cache.misses, 2)
+            self.assertEqual(len(memory_cache), 1)
+        finally:
+            shutil.rmtree(temp_directory)
+
+    def test_max_size(self):
+        s = extract_spectra_from_file(ENVI_FILE)
+        entry_size = s.wavelengths.nbytes + s.values.nbytes
+        memory_cache = cache.MemoryCache(max_size=entry_size * 2)
+        for spectra_number in (1, 2, 3, 1):
+            extract_spectra_from_file(ENVI_FILE, cache=memory_cache,
+                                      spectra_number=spectra_number)
+        self.assertEqual(len(memory_cache), 2)
+        self.assertEqual(memory_cache.misses, 4)
+        self.assertLessEqual(memory_cache.size, entry_size * 2)
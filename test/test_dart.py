@@ -0,0 +1,48 @@
+import unittest
+import os
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+from PySpectra import extract_spectra_from_file
+from PySpectra import dart
+
+TEST_INPUTS_DIRECTORY = os.path.join(os.path.dirname(__file__), 'inputs')
+DART_FILE = os.path.join(TEST_INPUTS_DIRECTORY, "dart_optical_properties.txt")
+
+
+class DARTTests(unittest.TestCase):
+
+    def test_read_dart(self):
+        s = extract_spectra_from_file(DART_FILE, "dart")
+        # Comment blocks, including data within them, should be skipped
+        assert_allclose(s.wavelengths, np.arange(400, 420, 2))
+        assert_allclose(s.values, np.arange(10, 20) / 100.)
+        self.assertEqual(s.value_units, "reflectance")
+
+    def test_all_columns(self):
+        s = dart.DARTFormat().get_spectra(DART_FILE)
+        for name in dart.DART_COLUMNS[2:]:
+            self.assertEqual(s.additional_metadata[name].shape, (10,))
+        assert_allclose(s.additional_metadata["refractive_index"][:2],
+                        [1.4, 1.41])
+        assert_allclose(s.additional_metadata["TDiffuse"][-1], 0.09)
+
+    def test_missing_columns(self):
+        data = dart.DARTFormat().parse_data(["400\t10\n", "402\t11\n"])
+        self.assertEqual(data.shape, (2, len(dart.DART_COLUMNS)))
+        assert_allclose(data[:, 1], [10, 11])
+        self.assertTrue(np.isnan(data[:, 2:]).all())
+
+        # Short rows are padded with NaN
+        data = dart.DARTFormat().parse_data(["400\t10\t1.4\n", "402\t11\n"])
+        assert_allclose(data[:, :3], [[400, 10, 1.4], [402, 11, np.nan]])
+        self.assertTrue(np.isnan(data[:, 3:]).all())
+
+        # Values aren't moved between rows when the total number matches
+        data = dart.DARTFormat().parse_data(["400\t10\t1.4\n", "402\t11\n",
+                                             "404\t12\t1.5\t0.3\n"])
+        assert_allclose(data[:, :4], [[400, 10, 1.4, np.nan],
+                                      [402, 11, np.nan, np.nan],
+                                      [404, 12, 1.5, 0.3]])
+        self.assertTrue(np.isnan(data[:, 4:]).all())
@@ -1,12 +1,38 @@
 import unittest
+import concurrent.futures
 import os
+import shutil
+import tempfile
 
 import numpy as np
 from numpy.testing import assert_allclose
 
 from PySpectra import extract_spectra_from_file
+from PySpectra import envi
 
 TEST_INPUTS_DIRECTORY = os.path.join(os.path.dirname(__file__), 'inputs')
+ENVI_FILE = os.path.join(TEST_INPUTS_DIRECTORY, "atsc15_targets_avg_all_envi.sli")
+
+
+def write_envi_copy(out_directory, byte_order=0, header_offset=0):
+    """
+    Write a copy of the test spectral library with a different byte order
+    and header offset, returns path to new file.
+    """
+    data = np.fromfile(ENVI_FILE, dtype="<f8")
+    out_file = os.path.join(out_directory, "envi_copy.sli")
+    with open(out_file, "wb") as f:
+        f.write(b"\0" * header_offset)
+        data.astype(">f8" if byte_order else "<f8").tofile(f)
+    with open(ENVI_FILE + ".hdr", "r") as f:
+        header_text = f.read()
+    header_text = header_text.replace("byte order = 0",
+                                      "byte order = {}".format(byte_order))
+    header_text = header_text.replace("header offset = 0",
+                                      "header offset = {}".format(header_offset))
+    with open(out_file + ".hdr", "w") as f:
+        f.write(header_text)
+    return out_file
 
 class ENVITests(unittest.TestCase):
 
@@ -365,3 +391,138 @@ class ENVITests(unittest.TestCase):
         assert_allclose(s.values, self.correct_values)
 
 
+
+    def test_read_memmap(self):
+        reader = envi.ENVIFormat()
+        for spectra_number in (1, 2, 3):
+            s_memmap = reader.get_spectra(ENVI_FILE, spectra_number)
+            s_read = envi.ENVIFormat().get_spectra(ENVI_FILE, spectra_number,
+                                                   use_memmap=False)
+            assert_allclose(s_memmap.values, s_read.values)
+            self.assertNotIsInstance(s_memmap.values, np.memmap)
+
+    def test_byte_order_header_offset(self):
+        out_directory = tempfile.mkdtemp()
+        try:
+            out_file = write_envi_copy(out_directory, byte_order=1,
+                                       header_offset=128)
+            for use_memmap in (True, False):
+                s = envi.ENVIFormat().get_spectra(out_file, 1,
+                                                  use_memmap=use_memmap)
+                assert_allclose(s.values, self.correct_values)
+        finally:
+            shutil.rmtree(out_directory)
+
+    def test_read_all_spectra(self):
+        reader = envi.ENVIFormat()
+        self.assertEqual(reader.get_spectra_names(ENVI_FILE),
+                         ["Black", "Grey", "White"])
+        collection = reader.get_all_spectra(ENVI_FILE)
+        self.assertEqual(len(collection), 3)
+        self.assertEqual(list(collection.name), ["Black", "Grey", "White"])
+        assert_allclose(collection.wavelengths, self.correct_wavelengths)
+        assert_allclose(collection.values[0], self.correct_values)
+        self.assertEqual(collection.wavelength_units, "nm")
+
+        for spectra in ([3, 1], ["White", "Black"], slice(None, None, -2)):
+            subset = reader.get_all_spectra(ENVI_FILE, spectra)
+            self.assertEqual(list(subset.name), ["White", "Black"])
+            assert_allclose(subset.values[1], self.correct_values)
+
+        with self.assertRaises(KeyError):
+            reader.get_all_spectra(ENVI_FILE, ["Green"])
+
+    def test_spectra_by_name(self):
+        s = envi.ENVIFormat().get_spectra(ENVI_FILE, "Black")
+        self.assertEqual(s.name, "Black")
+        assert_allclose(s.values, self.correct_values)
+        with self.assertRaises(KeyError):
+            envi.ENVIFormat().get_spectra(ENVI_FILE, "Green")
+
+    def test_header_cache(self):
+        out_directory = tempfile.mkdtemp()
+        try:
+            out_file = write_envi_copy(out_directory)
+            reader = envi.ENVIFormat()
+            header_entry = reader.load_header(out_file)
+            self.assertIs(envi.ENVIFormat().load_header(out_file), header_entry)
+            self.assertEqual(header_entry.name_index["White"], 2)
+
+            # Header returned from read_hdr_file can be changed without
+            # affecting the cache.
+            reader.read_hdr_file(out_file)["lines"] = "1"
+            self.assertEqual(reader.read_hdr_file(out_file)["lines"], "3")
+
+            # Changing the header should cause it to be read again
+            with open(out_file + ".hdr", "r") as f:
+                header_text = f.read()
+            with open(out_file + ".hdr", "w") as f:
+                f.write(header_text.replace("Black, Grey, White",
+                                            "Black1, Grey1, White1"))
+            os.utime(out_file + ".hdr", ns=(0, 0))
+            self.assertEqual(reader.get_spectra_names(out_file),
+                             ["Black1", "Grey1", "White1"])
+        finally:
+            shutil.rmtree(out_directory)
+
+    def test_image_spectra(self):
+        # Create small image with a different value for each
+        # band, line and sample.
+        bands, lines, samples = 4, 5, 6
+        image = (np.arange(bands)[:, None, None] * 100 +
+                 np.arange(lines)[None, :, None] * 10 +
+                 np.arange(samples)[None, None, :]).astype(np.float32)
+        pixels = np.array([0, 5, 2, 3])
+        lines_extract = np.array([4, 0, 2, 2])
+        expected = image[:, lines_extract, pixels].T
+
+        interleave_order = {"bsq": (0, 1, 2), "bil": (1, 0, 2),
+                            "bip": (1, 2, 0)}
+
+        out_directory = tempfile.mkdtemp()
+        try:
+            for interleave, order in interleave_order.items():
+                for byte_order in (0, 1):
+                    out_file = os.path.join(out_directory,
+                                            "image_{}_{}.bin".format(interleave, byte_order))
+                    with open(out_file, "wb") as f:
+                        f.write(b"\0" * 32)
+                        image.transpose(order).astype(">f4" if byte_order else "<f4").tofile(f)
+                    with open(os.path.join(out_directory, "image_{}_{}.hdr".format(interleave, byte_order)), "w") as f:
+                        f.write("ENVI\nsamples = {}\nlines = {}\nbands = {}\n"
+                                "header offset = 32\ndata type = 4\n"
+                                "interleave = {}\nbyte order = {}\n"
+                                "wavelength units = Nanometers\n"
+                                "wavelength = {{400, 500, 600, 700}}\n".format(
+                                    samples, lines, bands, interleave, byte_order))
+                    collection = envi.ENVIFormat().get_image_spectra(out_file, pixels,
+                                                                     lines_extract)
+                    assert_allclose(collection.values, expected)
+                    assert_allclose(collection.wavelengths, [400, 500, 600, 700])
+                    self.assertEqual(list(collection.pixel), list(pixels))
+                    self.assertEqual(collection[0].line, 4)
+
+                    # No locations gives an empty collection
+                    collection = envi.ENVIFormat().get_image_spectra(out_file, [], [])
+                    self.assertEqual(len(collection), 0)
+                    self.assertEqual(collection.values.shape, (0, bands))
+
+            with self.assertRaises(IndexError):
+                envi.ENVIFormat().get_image_spectra(out_file, [6], [0])
+        finally:
+            shutil.rmtree(out_directory)
+
+    def test_reader_reuse(self):
+        reader = envi.ENVIFormat()
+        s1 = reader.get_spectra(ENVI_FILE, 1)
+        s3 = reader.get_spectra(ENVI_FILE, 3)
+        self.assertIsNot(s1, s3)
+        assert_allclose(s1.values, self.correct_values)
+
+        # Share one reader between threads
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(reader.get_spectra, [ENVI_FILE] * 30,
+                                        [1, 2, 3] * 10))
+        for i, s in enumerate(results):
+            self.assertEqual(s.name, ["Black", "Grey", "White"][i % 3])
+        assert_allclose(results[0].values, self.correct_values)
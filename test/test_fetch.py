@@ -0,0 +1,149 @@
+import unittest
+import gc
+import os
+import shutil
+import tempfile
+import threading
+import warnings
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from numpy.testing import assert_allclose
+
+from PySpectra import extract_spectra_from_file
+from PySpectra import fetch
+from PySpectra import usgs
+
+TEST_INPUTS_DIRECTORY = os.path.join(os.path.dirname(__file__), 'inputs')
+USGS_FILE = os.path.join(TEST_INPUTS_DIRECTORY, "russianolive.dw92-4.30728.asc")
+
+
+class LibraryRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serve files from the test inputs directory with an ETag, keeping
+    connections open.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            server.connections.add(self.client_address)
+
+        if self.path.startswith("/redirect/"):
+            self.send_response(302)
+            self.send_header("Location", self.path[len("/redirect"):])
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        path = os.path.join(TEST_INPUTS_DIRECTORY, os.path.basename(self.path))
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return
+
+        etag = '"{}"'.format(os.path.getsize(path))
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        with open(path, "rb") as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FetchTests(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), LibraryRequestHandler)
+        self.server.daemon_threads = True
+        self.server.requests = []
+        self.server.connections = set()
+        self.server.lock = threading.Lock()
+        self.server_thread = threading.Thread(target=self.server.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+        self.base_url = "http://127.0.0.1:{}/".format(self.server.server_port)
+        self.url = self.base_url + os.path.basename(USGS_FILE)
+        self.cache_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.cache_directory)
+
+    def test_fetch(self):
+        with open(USGS_FILE, "rb") as f:
+            expected = f.read()
+        with fetch.ConnectionPool() as pool:
+            self.assertEqual(fetch.fetch(self.url, pool=pool), expected)
+            self.assertEqual(fetch.fetch(self.url, pool=pool), expected)
+        # Connection should be reused
+        self.assertEqual(len(self.server.connections), 1)
+
+        redirect_url = self.base_url + "redirect/" + os.path.basename(USGS_FILE)
+        self.assertEqual(fetch.fetch(redirect_url), expected)
+
+        with self.assertRaises(IOError):
+            fetch.fetch(self.base_url + "missing.asc")
+
+    def test_cache(self):
+        cache = fetch.HTTPCache(self.cache_directory)
+        data = fetch.fetch(self.url, cache=cache)
+        self.assertEqual(cache.get(self.url)["body"], data)
+        # Second request should be answered with 304 Not Modified
+        self.assertEqual(fetch.fetch(self.url, cache=cache), data)
+        self.assertEqual(len(self.server.requests), 2)
+
+        cache.clear()
+        self.assertIsNone(cache.get(self.url))
+
+    def test_fetch_many(self):
+        urls = [self.url] * 10 + [self.base_url + "missing.asc"]
+        data = fetch.fetch_many(urls, n_workers=3)
+        self.assertEqual(len(data), 11)
+        self.assertEqual(data[0], data[9])
+        self.assertIsInstance(data[10], IOError)
+        self.assertLessEqual(len(self.server.connections), 3)
+
+        with self.assertRaises(IOError):
+            fetch.fetch_many(urls, raise_errors=True)
+
+    def test_fetch_many_closes_connections(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", ResourceWarning)
+            fetch.fetch_many([self.url] * 6, n_workers=3)
+            gc.collect()
+        self.assertEqual([w for w in caught
+                          if issubclass(w.category, ResourceWarning)], [])
+
+    def test_fetch_many_pool(self):
+        with fetch.ConnectionPool() as pool:
+            fetch.fetch_many([self.url] * 6, n_workers=2, pool=pool)
+            fetch.fetch_many([self.url] * 6, n_workers=2, pool=pool)
+        # Connections should be reused between batches
+        self.assertEqual(len(self.server.requests), 12)
+        self.assertLessEqual(len(self.server.connections), 2)
+
+    def test_usgs_url(self):
+        expected = extract_spectra_from_file(USGS_FILE, "usgs")
+        cache = fetch.HTTPCache(self.cache_directory)
+        s = extract_spectra_from_file(self.url, "usgs", http_cache=cache)
+        assert_allclose(s.wavelengths, expected.wavelengths)
+        assert_allclose(s.values, expected.values)
+        self.assertEqual(s.file_name, self.url)
+
+        spectra_list = usgs.USGSFormat().get_spectra_from_urls([self.url] * 3,
+                                                               http_cache=cache)
+        self.assertEqual(len(spectra_list), 3)
+        assert_allclose(spectra_list[2].values, expected.values)
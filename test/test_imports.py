@@ -0,0 +1,72 @@
+import unittest
+import os
+import subprocess
+import sys
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules which are slow to import and shouldn't be loaded unless needed
+HEAVY_MODULES = ("numpy", "pandas", "scipy", "matplotlib", "http.client",
+                 "urllib.request", "concurrent.futures")
+
+# Maximum time for 'import PySpectra' in microseconds, as reported by
+# python -X importtime. Well above the expected time so only regressions
+# (e.g., a reader imported eagerly again) fail.
+IMPORT_TIME_BUDGET = 100000
+
+
+def run_python(code, *options):
+    """
+    Run Python code in a new interpreter, so modules imported by other
+    tests aren't already loaded.
+    """
+    return subprocess.run([sys.executable] + list(options) + ["-c", code],
+                          cwd=PACKAGE_DIRECTORY, check=True,
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                          universal_newlines=True)
+
+
+def get_imported(code, modules):
+    """
+    Get which of 'modules' are imported after running 'code'.
+    """
+    check = ("{}\nimport sys\n"
+             "print(','.join(m for m in {!r} if m in sys.modules))".format(code,
+                                                                          modules))
+    output = run_python(check).stdout.strip()
+    return [module for module in output.split(",") if module != ""]
+
+
+class ImportTests(unittest.TestCase):
+
+    def test_import_package(self):
+        imported = get_imported("import PySpectra",
+                                HEAVY_MODULES + ("PySpectra.sig", "PySpectra.envi",
+                                                 "PySpectra.usgs", "PySpectra.batch"))
+        self.assertEqual(imported, [])
+
+    def test_import_reader(self):
+        for reader in ("envi", "sig", "ascii_format", "ocean_optics", "usgs",
+                       "dart"):
+            imported = get_imported("from PySpectra import {}".format(reader),
+                                    HEAVY_MODULES[1:])
+            self.assertEqual(imported, [], reader)
+
+    def test_lazy_attributes(self):
+        imported = get_imported("import PySpectra\n"
+                                "PySpectra.envi.ENVIFormat\n"
+                                "PySpectra.extract_spectra_from_files",
+                                ("PySpectra.envi", "PySpectra.batch",
+                                 "PySpectra.sig"))
+        self.assertEqual(imported, ["PySpectra.envi", "PySpectra.batch"])
+
+    def test_import_time(self):
+        output = run_python("import PySpectra", "-X", "importtime").stderr
+        for line in output.splitlines():
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip() == "PySpectra":
+                cumulative = int(fields[1])
+                break
+        else:
+            self.fail("Import time for PySpectra not found")
+        self.assertLess(cumulative, IMPORT_TIME_BUDGET)
@@ -0,0 +1,177 @@
+import unittest
+import datetime
+import shutil
+import tempfile
+import os
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+from PySpectra import extract_spectra_from_file
+from PySpectra import ocean_optics
+
+TEST_INPUTS_DIRECTORY = os.path.join(os.path.dirname(__file__), 'inputs')
+STS_FILE = os.path.join(TEST_INPUTS_DIRECTORY, "ocean_optics_sts.txt")
+OCEANVIEW_FILE = os.path.join(TEST_INPUTS_DIRECTORY, "ocean_optics_oceanview.txt")
+OCEANVIEW_COLUMNS_FILE = os.path.join(TEST_INPUTS_DIRECTORY,
+                                      "ocean_optics_oceanview_columns.txt")
+OCEANVIEW_BLOCKS_FILE = os.path.join(TEST_INPUTS_DIRECTORY,
+                                     "ocean_optics_oceanview_blocks.txt")
+
+
+class OceanOpticsTests(unittest.TestCase):
+
+    correct_wavelengths = np.array([338.2, 370.55, 402.91, 435.26, 467.61, 499.97,
+                                    532.32, 564.67, 597.03, 629.38, 661.73, 694.09,
+                                    726.44, 758.79, 791.15, 823.5])
+
+    correct_values = np.array([4336.18, 6762.6, 1000.91, 3418.66, 2174.05, 1738.71,
+                               2490.08, np.nan, 4174.14, 5310.53, 4353.56, 6481.76,
+                               2635.62, 8024.94, 1219.1, 6363.74])
+
+    def test_read_sts_file(self):
+        s = extract_spectra_from_file(STS_FILE, "oceanoptics")
+        assert_allclose(s.wavelengths, self.correct_wavelengths)
+        assert_allclose(s.values, self.correct_values)
+        self.assertEqual(s.time, datetime.datetime(2019, 2, 11, 12, 34, 56))
+        self.assertEqual(s.integration_time, 0.1)
+        self.assertEqual(s.n_scans_average, 3)
+        self.assertEqual(s.skip_header, 6)
+        self.assertEqual(s.additional_metadata["Serial number"].strip(), "S01234")
+
+    def test_read_oceanview_file(self):
+        s = extract_spectra_from_file(OCEANVIEW_FILE, "oceanoptics")
+        assert_allclose(s.wavelengths, self.correct_wavelengths)
+        assert_allclose(s.values, self.correct_values)
+        self.assertEqual(s.time.utcoffset(), datetime.timedelta(0))
+        self.assertEqual(s.time.hour, 12)
+
+    def test_date_from_timestamp(self):
+        s = ocean_optics.OceanOpticsSTSFormat().get_spectra(STS_FILE,
+                                                            date_from_timestamp=True)
+        self.assertEqual(s.time.tzinfo, datetime.timezone.utc)
+
+    def test_read_metadata(self):
+        reader = ocean_optics.OceanOpticsSTSFormat()
+        self.assertEqual(reader.read_metadata(OCEANVIEW_FILE).skip_header, 14)
+        self.assertEqual(reader.read_metadata(STS_FILE).skip_header, 6)
+
+    def test_parse_data(self):
+        reader = ocean_optics.OceanOpticsSTSFormat()
+        assert_allclose(reader.parse_data("1\t2\n3\t4\n"), [[1, 2], [3, 4]])
+
+        # A row which isn't numbers mustn't drop the rows after it
+        data = reader.parse_data("1\t2\nx\ty\n5\t6\n")
+        assert_allclose(data, [[1, 2], [np.nan, np.nan], [5, 6]])
+
+    def test_get_all_spectra_single(self):
+        reader = ocean_optics.OceanOpticsSTSFormat()
+        for filename in (STS_FILE, OCEANVIEW_FILE):
+            collection = reader.get_all_spectra(filename)
+            s = reader.get_spectra(filename)
+            self.assertEqual(len(collection), 1)
+            assert_allclose(collection.wavelengths, s.wavelengths)
+            assert_allclose(collection.values[0], s.values)
+            self.assertEqual(collection.time[0], s.time)
+            self.assertIsNone(collection.name[0])
+
+    def test_get_all_spectra_columns(self):
+        reader = ocean_optics.OceanOpticsSTSFormat()
+        collection = reader.get_all_spectra(OCEANVIEW_COLUMNS_FILE)
+        self.assertEqual(collection.values.shape, (3, 4))
+        assert_allclose(collection.values[:, 0], [100, 200, 300])
+        self.assertTrue(np.isnan(collection.values[2, 1]))
+        self.assertEqual(list(collection.time),
+                         [datetime.datetime(2019, 2, 11, 12, 34 + i, 56)
+                          for i in range(3)])
+        self.assertEqual(collection.name[0], "2019-02-11 12:34:56.000")
+        assert_allclose(collection.integration_time, [0.1, 0.1, 0.1])
+        assert_allclose(collection.n_scans_average, [2, 2, 2])
+
+    def test_get_all_spectra_blocks(self):
+        reader = ocean_optics.OceanOpticsSTSFormat()
+        collection = reader.get_all_spectra(OCEANVIEW_BLOCKS_FILE)
+        self.assertEqual(collection.values.shape, (2, 4))
+        assert_allclose(collection.values[1], collection.values[0] * 2)
+        self.assertEqual([t.minute for t in collection.time], [34, 35])
+        assert_allclose(collection.integration_time, [0.1, 0.2])
+
+        # Both layouts can be combined into one time series
+        time_series = reader.get_time_series([OCEANVIEW_COLUMNS_FILE,
+                                              OCEANVIEW_BLOCKS_FILE])
+        self.assertEqual(len(time_series), 5)
+
+
+class OceanOpticsTimeSeriesTests(unittest.TestCase):
+
+    def setUp(self):
+        self.out_directory = tempfile.mkdtemp()
+        with open(STS_FILE, "r") as f:
+            self.sts_text = f.read()
+
+    def tearDown(self):
+        shutil.rmtree(self.out_directory)
+
+    def write_file(self, name, time, integration_time, scale):
+        """
+        Write a copy of the test STS file with a different time, integration
+        time and values scaled by 'scale'.
+        """
+        lines = []
+        for line in self.sts_text.splitlines():
+            if line.startswith("Date"):
+                line = "Date: {}".format(time.strftime("%a %b %d %H:%M:%S %Y"))
+            elif line.startswith("Integration time"):
+                line = "Integration time: {}".format(integration_time)
+            elif line[0].isdigit():
+                wavelength, dn = line.split("\t")
+                dn = float(dn)
+                if dn < ocean_optics.OCEAN_OPTICS_SATURATION_VALUE:
+                    dn = dn * scale
+                line = "{}\t{}".format(wavelength, dn)
+            lines.append(line)
+        out_file = os.path.join(self.out_directory, name)
+        with open(out_file, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        return out_file
+
+    def test_time_series(self):
+        start = datetime.datetime(2019, 2, 11, 12, 0, 0)
+        minute = datetime.timedelta(minutes=1)
+        reader = ocean_optics.OceanOpticsSTSFormat()
+
+        # Written out of order, should be sorted by time.
+        target_files = [self.write_file("target_{}.txt".format(i),
+                                        start + i * minute, 100000 * (i + 1),
+                                        0.1 * (i + 1))
+                        for i in (2, 0, 1)]
+        reference_files = [self.write_file("reference_{}.txt".format(i),
+                                           start + i * 2 * minute, 100000, 0.5)
+                           for i in (0, 1)]
+
+        target = reader.get_time_series(target_files)
+        reference = reader.get_time_series(reference_files)
+        self.assertEqual(target.values.shape, (3, 16))
+        self.assertEqual(list(target.time), [start, start + minute,
+                                             start + 2 * minute])
+        assert_allclose(target.integration_time, [0.1, 0.2, 0.3])
+        assert_allclose(target.n_scans_average, [3, 3, 3])
+
+        self.assertEqual(list(ocean_optics.match_nearest_time(target.time,
+                                                              reference.time)),
+                         [0, 0, 1])
+
+        normalised = ocean_optics.normalise_integration_time(target)
+        # Values were scaled in proportion to integration time so should match.
+        assert_allclose(normalised.values[0], normalised.values[2])
+
+        reflectance = ocean_optics.divide_by_reference(
+            normalised, ocean_optics.normalise_integration_time(reference))
+        self.assertEqual(reflectance.value_units, "reflectance")
+        assert_allclose(reflectance.values[0][:2], [0.2, 0.2])
+
+        dark_subtracted = ocean_optics.subtract_dark(target, target[:1])
+        assert_allclose(dark_subtracted.values[0][:2], [0, 0], atol=1e-10)
+
+        with self.assertRaises(ValueError):
+            ocean_optics.subtract_dark(target, target[:0])
@@ -0,0 +1,136 @@
+import unittest
+import os
+
+import numpy as np
+from numpy.testing import assert_allclose
+from scipy.interpolate import interp1d
+
+from PySpectra import extract_spectra_from_file
+from PySpectra.sensor_operator import (SensorOperator, SyntheticSensorOperator,
+                                       get_sensor_operator)
+from PySpectra.spectra_collection import SpectraCollection
+from PySpectra.spectra_reader import Spectra
+from PySpectra.srf import LANDSAT_OLI, LANDSAT_OLI_B3, RAPIDEYE
+
+TEST_INPUTS_DIRECTORY = os.path.join(os.path.dirname(__file__), 'inputs')
+
+
+def reference_convolve(spectra, srf):
+    """Convolve using interpolation and trapezoidal integration directly."""
+    at_srf_wavelengths = interp1d(spectra.wavelengths, spectra.values)(srf.wavelengths)
+    return (np.trapz(srf.values * at_srf_wavelengths, srf.wavelengths) /
+            np.trapz(srf.values, srf.wavelengths))
+
+
+class SensorOperatorTests(unittest.TestCase):
+
+    def setUp(self):
+        self.usgs = extract_spectra_from_file(os.path.join(TEST_INPUTS_DIRECTORY,
+                                                           "russianolive.dw92-4.30728.asc"),
+                                              "usgs")
+        # ENVI spectra are in nm and have overlapping detectors so wavelengths
+        # aren't increasing.
+        self.envi = extract_spectra_from_file(os.path.join(TEST_INPUTS_DIRECTORY,
+                                                           "atsc15_targets_avg_all_envi.sli"),
+                                              "envi", spectra_number=2)
+        self.envi.wavelengths = self.envi.wavelengths / 1000.0
+
+    def test_convolve_matches_reference(self):
+        for s in (self.usgs, self.envi):
+            for srf in RAPIDEYE:
+                assert_allclose(s.convolve(srf), reference_convolve(s, srf))
+
+    def test_convolve_nan(self):
+        # Band 1 falls in a region of NaNs, others should be unaffected.
+        result = self.usgs.convolve(LANDSAT_OLI)
+        expected = [reference_convolve(self.usgs, srf) for srf in LANDSAT_OLI]
+        assert_allclose(result, expected)
+
+    def test_convolve_many(self):
+        operator = SensorOperator(RAPIDEYE)
+        values = np.vstack([self.envi.values, self.envi.values * 2])
+        result = operator.apply(self.envi.wavelengths, values)
+        self.assertEqual(result.shape, (2, 5))
+        assert_allclose(result[1], result[0] * 2)
+        assert_allclose(result[0], self.envi.convolve(RAPIDEYE))
+
+    def test_weights_cached(self):
+        operator = get_sensor_operator(RAPIDEYE)
+        self.assertIs(get_sensor_operator(list(RAPIDEYE)), operator)
+        weights, _ = operator.get_weights(self.envi.wavelengths)
+        self.assertIs(operator.get_weights(self.envi.wavelengths.copy())[0],
+                      weights)
+        assert_allclose(weights.sum(axis=1), 1)
+
+    def test_out_of_range(self):
+        srf = Spectra(wavelengths=np.array([2.9, 3.0, 3.1]),
+                      values=np.array([0.5, 1.0, 0.5]),
+                      wavelength_units='um', value_units='response')
+        with self.assertRaises(ValueError):
+            self.envi.convolve(srf)
+
+    def test_not_response(self):
+        with self.assertRaises(ValueError):
+            SensorOperator([LANDSAT_OLI_B3, self.envi])
+
+
+class SyntheticSensorOperatorTests(unittest.TestCase):
+
+    def setUp(self):
+        self.wavelengths = np.arange(0.4, 1.0, 0.001)
+        self.centres = np.arange(0.45, 0.95, 0.0025)
+        self.fwhm = np.full(self.centres.shape, 0.01)
+        self.spectra = Spectra(wavelengths=self.wavelengths,
+                               values=np.sin(self.wavelengths * 20) + 2)
+
+    def test_matches_sampled_srf(self):
+        operator = SyntheticSensorOperator(self.centres, self.fwhm)
+        self.assertEqual(operator.n_bands, 200)
+        srf = operator.to_spectra(self.wavelengths)
+        assert_allclose(self.spectra.convolve(operator),
+                        SensorOperator(srf).apply(self.wavelengths,
+                                                  self.spectra.values))
+
+        trapezoid = SyntheticSensorOperator(self.centres, self.fwhm,
+                                            shape="trapezoid")
+        assert_allclose(self.spectra.convolve(trapezoid),
+                        SensorOperator(trapezoid.to_spectra(self.wavelengths)).apply(
+                            self.wavelengths, self.spectra.values))
+
+    def test_trapezoid(self):
+        operator = SyntheticSensorOperator([0.5], [0.02], shape="trapezoid",
+                                           edge_width=0.01)
+        response = operator.get_response(np.array([0.485, 0.49, 0.5, 0.515]))
+        assert_allclose(response, [[0, 0.5, 1, 0]])
+
+        # Symmetric band of a linear spectrum gives value at centre
+        assert_allclose(operator.apply(self.wavelengths, self.wavelengths), [0.5])
+
+    def test_collection(self):
+        operator = SyntheticSensorOperator(self.centres, self.fwhm)
+        collection = SpectraCollection(self.wavelengths,
+                                       np.vstack([self.spectra.values,
+                                                  self.spectra.values * 2]))
+        result = collection.convolve(operator)
+        self.assertEqual(result.shape, (2, 200))
+        assert_allclose(result[1], result[0] * 2)
+
+    def test_nan(self):
+        operator = SyntheticSensorOperator([0.5, 0.8], [0.01, 0.01])
+        values = self.spectra.values.copy()
+        values[self.wavelengths > 0.7] = np.nan
+        result = operator.apply(self.wavelengths, values)
+        self.assertFalse(np.isnan(result[0]))
+        self.assertTrue(np.isnan(result[1]))
+
+    def test_narrow_band(self):
+        wavelengths = np.array([0.4, 0.5, 0.6])
+        operator = SyntheticSensorOperator([0.525], [0.001], shape="trapezoid")
+        assert_allclose(operator.apply(wavelengths, wavelengths * 2), [1.05])
+
+    def test_out_of_range(self):
+        operator = SyntheticSensorOperator([0.99], [0.02])
+        with self.assertRaises(ValueError):
+            self.spectra.convolve(operator)
+        with self.assertRaises(ValueError):
+            SyntheticSensorOperator([0.5], [0.01], shape="box")
@@ -5,6 +5,8 @@ import numpy as np
 from numpy.testing import assert_allclose
 
 from PySpectra import extract_spectra_from_file
+from PySpectra import sig
+from PySpectra import spectra_reader
 
 TEST_INPUTS_DIRECTORY = os.path.join(os.path.dirname(__file__), 'inputs')
 
@@ -396,3 +398,75 @@ class USGSTests(unittest.TestCase):
         assert_allclose(s.wavelengths, self.correct_wavelengths)
         assert_allclose(s.values, self.correct_values)
 
+
+    def test_read_sig_to_dict(self):
+        sig_dict = sig.SigFormat().read_sig_to_dict(os.path.join(TEST_INPUTS_DIRECTORY,
+                                                                 "wyken1_049.sig"))
+        self.assertEqual(sig_dict["name"], "wyken1_049.sig")
+        self.assertEqual(sig_dict["data"].shape, (1024, 4))
+        assert_allclose(sig_dict["data"][0], [339.6, 15032.78, 398.86, 2.65],
+                        rtol=1e-6)
+
+    def test_parse_sig_data(self):
+        reader = sig.SigFormat()
+        data = reader.parse_sig_data("1 2 3 4\n5 6 7 8\n9 10 11 12\n")
+        assert_allclose(data, np.arange(1, 13).reshape((3, 4)))
+
+        # Lines which aren't data are skipped without dropping the rows after them
+        data = reader.parse_sig_data("1 2 3 4\n5 6 7 8\nabc def ghi jkl\n"
+                                     "9 10 11 12\n")
+        assert_allclose(data, np.arange(1, 13).reshape((3, 4)))
+
+    def test_parse_text_data(self):
+        data = spectra_reader.parse_text_data("1 2 3\n\n4 5 6\n")
+        assert_allclose(data, [[1, 2, 3], [4, 5, 6]])
+        # Rows with different numbers of values aren't parsed, even if the
+        # total number of values matches
+        self.assertIsNone(spectra_reader.parse_text_data("1 2 3\n4 5\n6 7 8 9\n", 3))
+        self.assertIsNone(spectra_reader.parse_text_data("1 2\n3 x\n"))
+
+    def test_read_all_channels(self):
+        s = extract_spectra_from_file(os.path.join(TEST_INPUTS_DIRECTORY,
+                                                   "wyken1_049.sig"),
+                                      "sig", all_channels=True)
+        assert_allclose(s.values, self.correct_values)
+        reference = s.additional_metadata["reference_radiance"]
+        target = s.additional_metadata["target_radiance"]
+        self.assertEqual(reference.shape, s.wavelengths.shape)
+        assert_allclose(reference[:2], [15032.78, 18067.22])
+        assert_allclose(target[:2], [398.86, 479.72])
+
+    def test_overlap_methods(self):
+        wavelengths = np.array([1., 2., 3., 4., 5., 3.5, 4.5, 5.5, 6.5])
+        values = np.array([1., 1., 1., 1., 1., 2., 2., 2., 2.])
+
+        expected = {"drop": [1., 2., 3., 5.5, 6.5],
+                    "keep_first": [1., 2., 3., 4., 5., 5.5, 6.5],
+                    "keep_second": [1., 2., 3., 3.5, 4.5, 5.5, 6.5]}
+        for method, expected_wavelengths in expected.items():
+            merged_wavelengths, _ = sig.merge_detector_overlap(wavelengths, values,
+                                                               method)
+            assert_allclose(merged_wavelengths, expected_wavelengths)
+
+        merged_wavelengths, merged_values = sig.merge_detector_overlap(
+            wavelengths, np.vstack((values, values * 2)), "blend")
+        assert_allclose(merged_wavelengths, [1., 2., 3., 3.5, 4.5, 5.5, 6.5])
+        assert_allclose(merged_values[0], [1., 1., 1., 1., 1.66666667, 2., 2.])
+        assert_allclose(merged_values[1], merged_values[0] * 2)
+
+        with self.assertRaises(ValueError):
+            sig.merge_detector_overlap(wavelengths, values, "average")
+
+    def test_spectra_collection(self):
+        sig_file = os.path.join(TEST_INPUTS_DIRECTORY, "wyken1_049.sig")
+        collection = sig.SigFormat().get_spectra_collection([sig_file, sig_file])
+        assert_allclose(collection.wavelengths, self.correct_wavelengths)
+        assert_allclose(collection.values[1], self.correct_values)
+
+        for method in sig.OVERLAP_METHODS:
+            collection = sig.SigFormat().get_spectra_collection([sig_file, sig_file],
+                                                                overlap=method)
+            s = sig.SigFormat().get_spectra(sig_file, overlap=method)
+            assert_allclose(collection.wavelengths, s.wavelengths)
+            assert_allclose(collection.values[0], s.values, rtol=1e-6)
+            self.assertTrue((np.diff(s.wavelengths) > 0).all())
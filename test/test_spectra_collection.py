@@ -0,0 +1,85 @@
+import unittest
+import os
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+from PySpectra import extract_spectra_from_file
+from PySpectra.spectra_collection import SpectraCollection
+from PySpectra.spectra_reader import Spectra
+from PySpectra.srf import LANDSAT_OLI, LANDSAT_OLI_B2
+
+TEST_INPUTS_DIRECTORY = os.path.join(os.path.dirname(__file__), 'inputs')
+ENVI_FILE = os.path.join(TEST_INPUTS_DIRECTORY, "atsc15_targets_avg_all_envi.sli")
+
+
+class SpectraCollectionTests(unittest.TestCase):
+
+    def setUp(self):
+        self.spectra_list = [extract_spectra_from_file(ENVI_FILE, "envi",
+                                                       spectra_number=i)
+                             for i in (1, 2, 3)]
+        # Convert to um so Landsat SRF can be used and keep only the first
+        # detector, so wavelengths are increasing.
+        for s in self.spectra_list:
+            s.wavelengths = s.wavelengths[:512] / 1000.0
+            s.values = s.values[:512]
+        self.collection = SpectraCollection.from_spectra(self.spectra_list)
+
+    def test_from_spectra(self):
+        self.assertEqual(len(self.collection), 3)
+        self.assertEqual(self.collection.values.shape,
+                         (3, self.spectra_list[0].wavelengths.size))
+        self.assertEqual(self.collection.file_name[0], ENVI_FILE)
+        self.assertTrue(np.isnan(self.collection.latitude).all())
+
+    def test_different_wavelengths(self):
+        other = Spectra(np.array([0.4, 0.5, 0.6]), np.array([1., 2., 3.]))
+        with self.assertRaises(ValueError):
+            SpectraCollection.from_spectra([self.spectra_list[0], other])
+
+        collection = SpectraCollection.from_spectra(
+            [self.spectra_list[0], other], wavelengths=np.array([0.45, 0.55]))
+        assert_allclose(collection.values[1], [1.5, 2.5])
+
+    def test_get_item(self):
+        s = self.collection[1]
+        assert_allclose(s.values, self.spectra_list[1].values)
+        self.assertIsNone(s.pixel)
+        self.assertIsNone(s.latitude)
+
+        subset = self.collection[1:]
+        self.assertEqual(len(subset), 2)
+        assert_allclose(subset.values[1], self.spectra_list[2].values)
+
+    def test_resample_wavelengths(self):
+        new_wavelengths = np.arange(0.3, 1.0, 0.01)
+        self.collection.resample_wavelengths(new_wavelengths)
+        for s, values in zip(self.spectra_list, self.collection.values):
+            assert_allclose(values, np.interp(new_wavelengths, s.wavelengths,
+                                              s.values))
+
+        # Missing values only affect wavelengths next to them
+        wavelengths = np.array([0.0, 1.0, 2.0, 3.0])
+        values = np.array([1.0, 2.0, np.nan, 4.0])
+        collection = SpectraCollection(wavelengths, values[np.newaxis])
+        new_wavelengths = np.array([-1.0, 0.5, 1.0, 2.5, 3.0, 4.0])
+        collection.resample_wavelengths(new_wavelengths)
+        assert_allclose(collection.values[0],
+                        np.interp(new_wavelengths, wavelengths, values))
+
+    def test_convolve(self):
+        expected = np.array([s.convolve(LANDSAT_OLI[:5])
+                             for s in self.spectra_list])
+        assert_allclose(self.collection.convolve(LANDSAT_OLI[:5]), expected)
+
+        expected = np.array([s.convolve(LANDSAT_OLI_B2)
+                             for s in self.spectra_list])
+        assert_allclose(self.collection.convolve(LANDSAT_OLI_B2), expected)
+
+    def test_concatenate(self):
+        collection = SpectraCollection.concatenate([self.collection,
+                                                    self.collection[:1]])
+        self.assertEqual(len(collection), 4)
+        assert_allclose(collection.values[3], self.collection.values[0])
+        self.assertEqual(collection.file_name[3], ENVI_FILE)
@@ -0,0 +1,94 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+from PySpectra import srf
+from PySpectra.spectra_reader import Spectra
+
+TEST_INPUTS_DIRECTORY = os.path.join(os.path.dirname(__file__), 'inputs')
+ENVI_FILE = os.path.join(TEST_INPUTS_DIRECTORY, "atsc15_targets_avg_all_envi.sli")
+
+# Sensors registered by tests, removed after each test
+TEST_SENSORS = ("TEST_CSV_SENSOR", "TEST_ENVI_SENSOR", "TEST_LIST_SENSOR",
+                "TEST_BAD_SENSOR")
+
+
+class SRFTests(unittest.TestCase):
+
+    def setUp(self):
+        self.out_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.out_directory)
+        for name in TEST_SENSORS:
+            srf.unregister_sensor(name)
+
+    def test_packaged_sensors(self):
+        self.assertIn("LANDSAT_OLI", srf.list_sensors())
+        self.assertIn("RAPIDEYE", srf.list_sensors())
+
+        landsat = srf.get_sensor("landsat_oli")
+        self.assertEqual(len(landsat), 9)
+        self.assertEqual(landsat[0].value_units, "response")
+        self.assertEqual(landsat[0].wavelength_units, "um")
+        assert_allclose(landsat[0].wavelengths[:2], [0.427, 0.4295])
+        # Bands are only loaded once
+        self.assertIs(srf.get_sensor("LANDSAT_OLI")[2], landsat[2])
+        self.assertIs(srf.LANDSAT_OLI_B3, landsat[2])
+        self.assertEqual(len(srf.RAPIDEYE), 5)
+
+        with self.assertRaises(KeyError):
+            srf.get_sensor("NOT_A_SENSOR")
+        with self.assertRaises(AttributeError):
+            srf.NOT_A_SENSOR_B1
+
+    def test_register_csv(self):
+        csv_file = os.path.join(self.out_directory, "test_sensor.csv")
+        with open(csv_file, "w") as f:
+            f.write("# Test sensor\n"
+                    "wavelength (nm),blue,green\n"
+                    "400,0.1,\n"
+                    "410,1.0,0.2\n"
+                    "420,0.2,1.0\n"
+                    "430,,0.1\n")
+        srf.register_sensor("test_csv_sensor", csv_file)
+        self.assertIn("TEST_CSV_SENSOR", srf.list_sensors())
+
+        bands = srf.get_sensor("TEST_CSV_SENSOR")
+        self.assertEqual([band.name for band in bands], ["blue", "green"])
+        self.assertEqual(bands[1].wavelength_units, "nm")
+        assert_allclose(bands[1].wavelengths, [410, 420, 430])
+        assert_allclose(bands[1].values, [0.2, 1.0, 0.1])
+        self.assertIs(srf.get_band("TEST_CSV_SENSOR", "blue"), bands[0])
+
+    def test_register_envi(self):
+        srf.register_sensor("TEST_ENVI_SENSOR", ENVI_FILE)
+        bands = srf.get_sensor("TEST_ENVI_SENSOR")
+        self.assertEqual(bands[0].value_units, "response")
+        self.assertIsNotNone(bands[0].name)
+
+    def test_register_spectra(self):
+        band = Spectra(wavelengths=np.array([0.5, 0.6, 0.7]),
+                       values=np.array([0.0, 1.0, 0.0]),
+                       wavelength_units="um", value_units="response")
+        srf.register_sensor("TEST_LIST_SENSOR", [band])
+        self.assertIs(srf.get_sensor("TEST_LIST_SENSOR")[0], band)
+
+        band.value_units = "reflectance"
+        with self.assertRaises(ValueError):
+            srf.register_sensor("TEST_BAD_SENSOR", [band])
+
+    def test_unregister(self):
+        band = Spectra(wavelengths=np.array([0.5, 0.6, 0.7]),
+                       values=np.array([0.0, 1.0, 0.0]),
+                       wavelength_units="um", value_units="response")
+        srf.register_sensor("TEST_LIST_SENSOR", [band])
+        srf.get_sensor("TEST_LIST_SENSOR")
+        srf.unregister_sensor("test_list_sensor")
+        self.assertNotIn("TEST_LIST_SENSOR", srf.list_sensors())
+        with self.assertRaises(KeyError):
+            srf.get_sensor("TEST_LIST_SENSOR")
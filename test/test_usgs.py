@@ -1,12 +1,16 @@
 import unittest
 import os
+import shutil
+import tempfile
 
 import numpy as np
 from numpy.testing import assert_allclose
 
 from PySpectra import extract_spectra_from_file
+from PySpectra import usgs
 
 TEST_INPUTS_DIRECTORY = os.path.join(os.path.dirname(__file__), 'inputs')
+USGS_FILE = os.path.join(TEST_INPUTS_DIRECTORY, "russianolive.dw92-4.30728.asc")
 
 
 class USGSTests(unittest.TestCase):
@@ -173,3 +177,73 @@ class USGSTests(unittest.TestCase):
 
         assert_allclose(s.wavelengths, self.correct_wavelengths)
         assert_allclose(s.values, self.correct_values)
+
+
+class USGSLibraryTests(unittest.TestCase):
+
+    def setUp(self):
+        self.out_directory = tempfile.mkdtemp()
+        with open(USGS_FILE, "r") as f:
+            self.lines = f.read().splitlines()
+
+    def tearDown(self):
+        shutil.rmtree(self.out_directory)
+
+    def make_record(self, title, record, scale=1.0, n_rows=None):
+        """
+        Make a copy of the test record with a new title, record number
+        and values scaled by 'scale'.
+        """
+        lines = self.lines[:14] + [title, "copy of splib05a r {}".format(record)]
+        for line in self.lines[16:n_rows and 16 + n_rows]:
+            wavelength, value, sd = line.split()
+            if float(value) != usgs.USGS_DELETED_VALUE:
+                value = "{:f}".format(float(value) * scale)
+            lines.append("  {}  {}  {}".format(wavelength, value, sd))
+        return "\n".join(lines) + "\n"
+
+    def test_directory(self):
+        sub_directory = os.path.join(self.out_directory, "V")
+        os.mkdir(sub_directory)
+        shutil.copy(USGS_FILE, sub_directory)
+        with open(os.path.join(sub_directory, "doubled.12345.asc"), "w") as f:
+            f.write(self.make_record("Doubled olive", 1, scale=2))
+
+        library = usgs.USGSLibrary(self.out_directory)
+        self.assertEqual(len(library), 2)
+        self.assertEqual([r.record for r in library.records], [12345, 30728])
+        self.assertEqual(library.find("russian"), [1])
+
+        collection = library.get_collection()
+        s = extract_spectra_from_file(USGS_FILE, "usgs")
+        assert_allclose(collection.wavelengths, s.wavelengths)
+        assert_allclose(collection.values[1], s.values)
+        assert_allclose(collection.values[0], s.values * 2, atol=1e-6)
+        self.assertEqual(collection.name[1], "Russian_Olive DW92-4         W1R1Ba AREF")
+
+        s = library.get_spectra(1)
+        assert_allclose(s.values, USGSTests.correct_values)
+
+    def test_archive(self):
+        archive = os.path.join(self.out_directory, "archive.asc")
+        with open(archive, "w") as f:
+            f.write(self.make_record("First", 101))
+            f.write(self.make_record("Second", 102, scale=0.5))
+            f.write(self.make_record("Short", 103, n_rows=100))
+
+        library = usgs.USGSLibrary(archive)
+        self.assertEqual(library.titles, ["First", "Second", "Short"])
+        self.assertEqual([r.record for r in library.records], [101, 102, 103])
+        self.assertEqual(library.records[2].n_rows, 100)
+
+        collection = library.get_collection([1, 0])
+        assert_allclose(collection.values[0], collection.values[1] * 0.5,
+                        atol=1e-6)
+
+        # Different wavelengths need resampling
+        with self.assertRaises(ValueError):
+            library.get_collection()
+        wavelengths = np.array([0.45, 0.5])
+        collection = library.get_collection(wavelengths=wavelengths)
+        self.assertEqual(collection.values.shape, (3, 2))
+        assert_allclose(collection.values[2], collection.values[0])